@@ -3,6 +3,8 @@ import atexit
 from routing import view_handler
 from src.backend.database_creation.installation import Installation
 from src.backend.database_interation.database import Database
+from src.backend.database_interation.async_db import AsyncDatabase
+from src.backend.database_interation.report_scheduler import ReportScheduler
 from pathlib import Path
 import time
 
@@ -33,6 +35,8 @@ def main(page: ft.Page):
 
     # Initialize core classes
     db_instance = Database.get_instance(installer)
+    report_scheduler = ReportScheduler(db_instance)  # Generates due weekly/monthly/yearly reports in the background
+    async_db = AsyncDatabase(db_instance)  # Runs page queries off the UI event loop
 
 
     """ UI SETUP   """
@@ -44,7 +48,7 @@ def main(page: ft.Page):
     page.window.center()  # Move window to center
     page.window.prevent_close = True  # Prevent immediate close
 
-    views = view_handler(page, db_instance)
+    views = view_handler(page, db_instance, async_db)
 
     def route_change(e):
         page.views.clear()
@@ -59,6 +63,10 @@ def main(page: ft.Page):
         if e.data == "close":  
             print("Closing app and cleaning up...")
 
+            # Stop generating reports before the connections close
+            report_scheduler.stop()
+            async_db.shutdown()
+
             # Close database properly
             if db_instance.check_connection():
                 db_instance.close_db()  # Ensure DB is properly closed
@@ -80,4 +88,7 @@ def main(page: ft.Page):
     # TODO: Change back to "/login"
     page.go("/login") 
 
+    # Start after the first route is shown; catch-up work never delays the first paint
+    report_scheduler.start()
+
 ft.app(target=main)
@@ -1,61 +1,95 @@
 # Normal Python library imports
+import importlib
 import flet as ft
 
 # Colors
 from src.ui.components.colors import Colors
 
-# Login
-from src.ui.pages_scenes.login import Login
-
-# Sign up/account set up pages
-from src.ui.pages_scenes.sign_up import SignUp
-from src.ui.pages_scenes.security_questions import SecurityQuestions
-from src.ui.pages_scenes.create_budget import CreateBudget
-from src.ui.pages_scenes.add_budget_accounts import AddBudgetAccounts
-
-# Forgot password/reset passwor pages
-from src.ui.pages_scenes.username_verification import UsernameVerification
-from src.ui.pages_scenes.forgot_password_questions import ForgotPasswordQuestions
-from src.ui.pages_scenes.reset_password_success import ResetPasswordSuccess
-from src.ui.pages_scenes.reset_password import ResetPassword
-
-# Main pages
-from src.ui.pages_scenes.dashboard import Dashboard
-from src.ui.pages_scenes.accounts import Accounts
-from src.ui.pages_scenes.transactions import Transactions
-from src.ui.pages_scenes.history import History
-from src.ui.pages_scenes.reports import Reports
-from src.ui.pages_scenes.accounts_popup import MakeEdits
-
-
 # user data class
 from src.backend.database_interation.user_data import UserData # <------LOOK HERE
 from src.backend.database_interation.trans_class import TransClass
 from src.backend.database_interation.vendor_funcs import Vendor
+from src.backend.database_interation.report_store import ReportStore
+from src.backend.database_interation.async_db import AsyncDatabase
 
 # components
 from src.ui.components.navigation_rail import NavRail
 
 
-def view_handler(page: ft.Page, db_instance):
-    user_data = UserData(db_instance) 
-    colors = Colors() 
-    nav_rail = NavRail(page, user_data) 
-    vend_funcs = Vendor(db_instance)
-    trans_funcs = TransClass(user_data)
-
-    return {
-        "/login": Login(page, user_data, colors),
-        "/sign_up": SignUp(page, user_data, colors),
-        "/security_questions": SecurityQuestions(page, user_data, colors), 
-        "/create_budget": CreateBudget(page, user_data, colors),  
-        "/dashboard": Dashboard(page, user_data, nav_rail, colors),
-        "/username_verification": UsernameVerification(page, user_data, colors), 
-        "/forgot_password_questions": ForgotPasswordQuestions(page, user_data, colors), 
-        "/reset_password": ResetPassword(page, user_data, colors),
-        "/reset_password_success": ResetPasswordSuccess(page, colors),
-        "/add_budget_accounts": AddBudgetAccounts(page, user_data, colors),
-        "/accounts": Accounts(page, user_data, nav_rail, colors),
-        "/transactions": Transactions(page, user_data, nav_rail, colors, trans_funcs, vend_funcs),
-        "/history": History(page, user_data, nav_rail, colors),
-    }
+# Route -> (page module, page class, the shared objects passed to the page after `page`, in order).
+# Page modules are only imported when their route is first visited, so the login screen does not
+# wait for every page (and what they import) to load.
+ROUTES = {
+    # Login
+    "/login": ("src.ui.pages_scenes.login", "Login", ("user_data", "colors", "async_db")),
+
+    # Sign up/account set up pages
+    "/sign_up": ("src.ui.pages_scenes.sign_up", "SignUp", ("user_data", "colors", "async_db")),
+    "/security_questions": ("src.ui.pages_scenes.security_questions", "SecurityQuestions", ("user_data", "colors", "async_db")),
+    "/create_budget": ("src.ui.pages_scenes.create_budget", "CreateBudget", ("user_data", "colors")),
+    "/add_budget_accounts": ("src.ui.pages_scenes.add_budget_accounts", "AddBudgetAccounts", ("user_data", "colors")),
+
+    # Forgot password/reset passwor pages
+    "/username_verification": ("src.ui.pages_scenes.username_verification", "UsernameVerification", ("user_data", "colors")),
+    "/forgot_password_questions": ("src.ui.pages_scenes.forgot_password_questions", "ForgotPasswordQuestions", ("user_data", "colors", "async_db")),
+    "/reset_password": ("src.ui.pages_scenes.reset_password", "ResetPassword", ("user_data", "colors", "async_db")),
+    "/reset_password_success": ("src.ui.pages_scenes.reset_password_success", "ResetPasswordSuccess", ("colors",)),
+
+    # Main pages
+    "/dashboard": ("src.ui.pages_scenes.dashboard", "Dashboard", ("user_data", "nav_rail", "colors", "async_db")),
+    "/accounts": ("src.ui.pages_scenes.accounts", "Accounts", ("user_data", "nav_rail", "colors", "trans_funcs", "report_store", "async_db")),
+    "/transactions": ("src.ui.pages_scenes.transactions", "Transactions", ("user_data", "nav_rail", "colors", "trans_funcs", "vend_funcs", "async_db")),
+    "/history": ("src.ui.pages_scenes.history", "History", ("user_data", "nav_rail", "colors", "report_store")),
+}
+
+
+class LazyViews:
+    """
+    The application's views, looked up by route like a dict. Each view is built the first time its
+    route is visited and kept for every later visit, so a page keeps its state between visits exactly
+    as when every view was built at startup.
+
+    Attributes:
+        page (ft.Page): The page every view is built for.
+        shared (dict): The objects views share (user_data, colors, nav_rail, ...), by the names used in ROUTES.
+        views (dict): The views built so far, by route.
+    """
+
+    def __init__(self, page, shared):
+        self.page = page
+        self.shared = shared
+        self.views = {}
+
+    def get(self, route, default=None):
+        """Return the view for route, building it on first use, or default for unknown routes."""
+        if route not in ROUTES:
+            return default
+        view = self.views.get(route)
+        if view is None:
+            module_name, class_name, arguments = ROUTES[route]
+            view_class = getattr(importlib.import_module(module_name), class_name)
+            view = self.views[route] = view_class(self.page, *(self.shared[name] for name in arguments))
+        return view
+
+    def __getitem__(self, route):
+        view = self.get(route)
+        if view is None:
+            raise KeyError(route)
+        return view
+
+    def __contains__(self, route):
+        return route in ROUTES
+
+
+def view_handler(page: ft.Page, db_instance, async_db=None):
+    user_data = UserData(db_instance)
+
+    return LazyViews(page, {
+        "user_data": user_data,
+        "colors": Colors(),
+        "nav_rail": NavRail(page, user_data),
+        "vend_funcs": Vendor(db_instance),
+        "trans_funcs": TransClass(user_data),
+        "report_store": ReportStore(db_instance),
+        "async_db": async_db or AsyncDatabase(db_instance),
+    })
@@ -0,0 +1,78 @@
+"""
+Raw database keys for SQLCipher.
+
+`PRAGMA key='passphrase'` makes SQLCipher stretch the passphrase with PBKDF2 (256,000 rounds by
+default) on every connection, which costs a few hundred milliseconds per open. SQLCipher also
+accepts the 256-bit encryption key itself as `PRAGMA key="x'<64 hex digits>'"` and then skips the
+key derivation.
+
+SQLCipher 4 derives that key as PBKDF2-HMAC-SHA512(passphrase, salt, kdf_iter, 32 bytes), where the
+salt is the first 16 bytes of the database file. So the raw key can be derived once from the
+passphrase in the keyring and opens the same file: no rekey, and the passphrase keeps working.
+
+Key cache policies, stored as "key_cache" in settings.json:
+- "keyring": derive the raw key once and keep it in the keyring next to the passphrase, so every
+  later connection, in any process, opens with the raw key.
+- "memory": derive the raw key once per process; the writer and every reader connection reuse it.
+- "off": pass the passphrase on every open, as BudgetWise did before.
+"""
+import hashlib
+import re
+from pathlib import Path
+
+KEY_CACHE_POLICIES = ("keyring", "memory", "off")
+DEFAULT_KEY_CACHE = "keyring"
+
+# The keyring entry holding the derived raw key, next to "db_password"
+RAW_KEY_USERNAME = "db_key"
+
+# SQLCipher 4 defaults, used when the cipher settings do not override them
+DEFAULT_KDF_ITER = 256000
+SALT_SIZE = 16
+
+RAW_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def read_salt(db_path):
+    """
+    Return the 16-byte salt SQLCipher stores at the start of the database file, or None if the file
+    is missing or too short to have one yet.
+    """
+    try:
+        with open(Path(db_path), "rb") as f:
+            salt = f.read(SALT_SIZE)
+    except OSError:
+        return None
+    return salt if len(salt) == SALT_SIZE else None
+
+
+def derive_raw_key(passphrase, salt, cipher_settings=None):
+    """
+    Derive the encryption key SQLCipher computes from passphrase for a file with this salt.
+
+    Arguments:
+        passphrase (str): The database password from the keyring.
+        salt (bytes): The file's salt (see read_salt).
+        cipher_settings (dict, optional): The creation-time cipher settings; only kdf_iter affects the key.
+
+    Returns:
+        str: The key as 64 lowercase hex digits.
+    """
+    iterations = int((cipher_settings or {}).get("kdf_iter", DEFAULT_KDF_ITER))
+    return hashlib.pbkdf2_hmac("sha512", passphrase.encode("utf-8"), salt, iterations, 32).hex()
+
+
+def is_raw_key(key):
+    """Return True if key looks like a raw key from derive_raw_key (64 lowercase hex digits)."""
+    return bool(key) and RAW_KEY_PATTERN.match(key) is not None
+
+
+def apply_key(conn, passphrase, raw_key=None):
+    """
+    Unlock a new connection: with raw_key if given (no key derivation), otherwise with the passphrase.
+    Must be the first statement on the connection, before apply_cipher_settings.
+    """
+    if raw_key is not None:
+        conn.execute(f"PRAGMA key = \"x'{raw_key}'\"")
+    else:
+        conn.execute(f"PRAGMA key='{passphrase}'")
@@ -0,0 +1,70 @@
+"""
+Argon2 cost profiles for hashing passwords and security answers.
+
+A profile is chosen at install time and stored as "hashing_profile" in settings.json. It only
+decides how new hashes are made: every Argon2 hash records its own parameters, so hashes made with
+another profile still verify, and UserData rehashes them with the current profile the next time
+the user proves they know the secret (see UserData.verify_password).
+
+Times are for one hash on a single desktop core; run test_database/benchmark_password_hashing.py
+to measure them on another machine, or calibrate_time_cost to fit a profile to a time budget.
+"""
+import os
+import time
+
+from argon2 import PasswordHasher
+
+HASHING_PROFILES = {
+    # OWASP's minimum for Argon2id: 19 MiB, 2 passes, 1 lane. About 55 ms, for slow machines.
+    "light": {"time_cost": 2, "memory_cost": 19456, "parallelism": 1},
+    # RFC 9106's low-memory recommendation and argon2-cffi's defaults, which every hash made before
+    # profiles existed uses: 64 MiB, 3 passes, 4 lanes. About 280 ms.
+    "standard": {"time_cost": 3, "memory_cost": 65536, "parallelism": 4},
+    # Twice the memory and one more pass. About 750 ms.
+    "strong": {"time_cost": 4, "memory_cost": 131072, "parallelism": 4},
+}
+
+DEFAULT_HASHING_PROFILE = "standard"
+
+# The most memory, in KiB, that Argon2 hashes computed at the same time may use together (256 MiB):
+# three standard hashes or two strong ones.
+HASHING_MEMORY_BUDGET = 262144
+
+
+def get_hashing_profile(name):
+    """Return the named profile, falling back to the default profile for unknown names."""
+    if name not in HASHING_PROFILES:
+        print(f"Unknown hashing profile '{name}', using '{DEFAULT_HASHING_PROFILE}'.")
+        name = DEFAULT_HASHING_PROFILE
+    return HASHING_PROFILES[name]
+
+
+def make_password_hasher(name=None):
+    """Return a PasswordHasher using the named profile (default: DEFAULT_HASHING_PROFILE)."""
+    return PasswordHasher(**get_hashing_profile(name or DEFAULT_HASHING_PROFILE))
+
+
+def concurrent_hash_limit(hasher, memory_budget=HASHING_MEMORY_BUDGET):
+    """
+    How many hashes with this PasswordHasher may run at once: as many as fit in memory_budget KiB,
+    but no more than there are CPUs and never fewer than one.
+    """
+    return max(1, min(os.cpu_count() or 1, memory_budget // hasher.memory_cost))
+
+
+def calibrate_time_cost(memory_cost, parallelism, target_seconds, max_time_cost=32):
+    """
+    Find the smallest time_cost at which one hash with this memory_cost and parallelism takes at
+    least target_seconds on this machine.
+
+    Returns:
+        tuple: (time_cost, seconds one hash took with it)
+    """
+    for time_cost in range(1, max_time_cost + 1):
+        hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+        began = time.perf_counter()
+        hasher.hash("calibration")
+        elapsed = time.perf_counter() - began
+        if elapsed >= target_seconds:
+            break
+    return time_cost, elapsed
@@ -1,9 +1,32 @@
 import os
+import json
 import platform
 import keyring
 import keyring.errors
 import sqlcipher3
 import secrets
+from src.backend.database_creation.performance_profiles import (
+    DEFAULT_CIPHER_SETTINGS,
+    DEFAULT_PROFILE,
+    apply_cipher_settings,
+    apply_profile,
+    get_profile,
+)
+from src.backend.database_creation.cipher_keys import (
+    DEFAULT_KEY_CACHE,
+    KEY_CACHE_POLICIES,
+    RAW_KEY_USERNAME,
+    derive_raw_key,
+    read_salt,
+)
+from src.backend.database_creation.hashing_profiles import DEFAULT_HASHING_PROFILE, HASHING_PROFILES
+from src.backend.database_creation.migrations import (
+    ACCOUNT_MONTH_TOTALS_SCHEMA,
+    ACCOUNT_MONTH_TOTALS_SELECT,
+    insert_account_month_totals,
+    run_migrations,
+)
+
 
 class Installation:
     """
@@ -15,10 +38,16 @@ class Installation:
     - Retrieves and securely stores the database password
     - Creates the necessary tables in the database
 
+    - Stores application settings such as the database performance profile and the password hashing profile
+    - Caches the raw database key derived from the password, so connections skip key derivation
+
     Attributes:
         db_filename (str): The name of the database file (default: "BudgetWise.db").
         app_folder_name (str): The name of the folder where the database will be stored (default: "BudgetWise").
+        settings_filename (str): The name of the settings file stored next to the database.
     """
+    settings_filename = "settings.json"
+
     def __init__(self, db_filename="BudgetWise.db", app_folder_name="BudgetWise"):
         """
         Initializes the Installation class with the database filename and application folder name.
@@ -75,13 +104,125 @@ class Installation:
         """
         return secrets.token_hex(32)  # Generate a secure random password as a hexadecimal string
 
-    def create_encrypted_database(self, db_path=None):
+    def load_settings(self):
+        """
+        Loads the application settings from settings.json in the app folder.
+
+        Databases created before settings existed have no file; they get the default profile
+        and SQLCipher's default cipher settings, which is how they were encrypted.
+
+        Returns:
+            dict: {"performance_profile": str, "cipher": dict, "key_cache": str, "hashing_profile": str}
+        """
+        settings = {
+            "performance_profile": DEFAULT_PROFILE,
+            "cipher": dict(DEFAULT_CIPHER_SETTINGS),
+            "key_cache": DEFAULT_KEY_CACHE,
+            "hashing_profile": DEFAULT_HASHING_PROFILE,
+        }
+        settings_path = os.path.join(self.get_app_folder(), self.settings_filename)
+        try:
+            with open(settings_path, "r", encoding="utf-8") as f:
+                settings.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print("Error reading settings, using defaults:", e)
+        return settings
+
+    def save_settings(self, settings):
+        """
+        Writes the application settings to settings.json in the app folder.
+
+        Arguments:
+            settings (dict): The settings returned by load_settings, with any changes applied.
+        """
+        settings_path = os.path.join(self.get_app_folder(), self.settings_filename)
+        with open(settings_path, "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=4)
+
+    def set_performance_profile(self, profile):
+        """
+        Selects the performance profile used the next time the database is opened.
+        Only the connection pragmas change; the cipher settings chosen at creation are kept.
+
+        Arguments:
+            profile (str): One of the names in PERFORMANCE_PROFILES.
+        """
+        get_profile(profile)  # Reject unknown names before saving them
+        settings = self.load_settings()
+        settings["performance_profile"] = profile
+        self.save_settings(settings)
+
+    def set_hashing_profile(self, profile):
+        """
+        Selects the Argon2 profile new password and security answer hashes are made with, from the next
+        time the application starts. Existing hashes are upgraded as their users log in.
+
+        Arguments:
+            profile (str): One of the names in HASHING_PROFILES.
+
+        Raises:
+            ValueError: If the profile is unknown.
+        """
+        if profile not in HASHING_PROFILES:
+            raise ValueError(f"Unknown hashing profile: {profile}")
+        settings = self.load_settings()
+        settings["hashing_profile"] = profile
+        self.save_settings(settings)
+
+    def set_key_cache(self, policy):
+        """
+        Selects how the raw database key is cached from the next time the database is opened
+        (see cipher_keys). Any policy other than "keyring" removes the key cached in the keyring.
+
+        Arguments:
+            policy (str): One of KEY_CACHE_POLICIES.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in KEY_CACHE_POLICIES:
+            raise ValueError(f"Unknown key cache policy: {policy}")
+        settings = self.load_settings()
+        settings["key_cache"] = policy
+        self.save_settings(settings)
+        if policy != "keyring":
+            try:
+                keyring.delete_password(self.app_folder_name, RAW_KEY_USERNAME)
+            except keyring.errors.KeyringError:
+                pass  # Nothing was cached
+
+    def cache_raw_key(self, db_path, password, settings):
+        """
+        Derives the raw key for the database once and stores it in the keyring, so later
+        connections open it without key derivation.
+
+        Arguments:
+            db_path (str): The path of the encrypted database.
+            password (str): The database password it was created with.
+            settings (dict): The settings it was created with (the cipher settings affect the key).
+        """
+        salt = read_salt(db_path)
+        if salt is None:
+            return
+        try:
+            keyring.set_password(self.app_folder_name, RAW_KEY_USERNAME, derive_raw_key(password, salt, settings["cipher"]))
+        except keyring.errors.KeyringError:
+            print("Warning: Failed to cache the database key; it will be derived when the database is opened.")
+
+    def create_encrypted_database(self, db_path=None, profile=None, hashing_profile=None):
         """
         Creates the encrypted database if it doesn't exist, retrieves the database password,
         and sets up the necessary tables.
 
+        The profile's cipher settings are fixed at this point and saved to settings.json,
+        because every later connection has to repeat them to decrypt the file.
+
         Arguments:
             db_path (str, optional): The file path to the database. If None, the path is derived from the OS.
+            profile (str, optional): The performance profile to create the database with (default: the saved or default profile).
+            hashing_profile (str, optional): The Argon2 profile for password hashes (default: the saved or default profile).
         
         Raises:
             Exception: If there is an error while creating the database or setting up tables.
@@ -114,10 +255,17 @@ class Installation:
         # If the database does not exist, create it
         if not os.path.exists(db_path):
             try:
+                settings = self.load_settings()
+                settings["performance_profile"] = profile or settings["performance_profile"]
+                settings["cipher"] = dict(get_profile(settings["performance_profile"])["cipher"])
+                settings["hashing_profile"] = hashing_profile or settings["hashing_profile"]
+
                 # Connect to the database using sqlcipher3
-                conn = sqlcipher3.connect(db_path)
+                conn = sqlcipher3.connect(str(db_path))
                 conn.execute(f"PRAGMA key='{password}'")  # Set the encryption key for the database
+                apply_cipher_settings(conn, settings["cipher"])  # Must follow the key, before any other statement
                 conn.execute("PRAGMA foreign_keys = 1")  # Enable foreign key constraints
+                apply_profile(conn, settings["performance_profile"])
 
                 # Create the tables in the database
                 self.create_tables(conn)
@@ -125,6 +273,9 @@ class Installation:
                 # Commit changes and close the connection
                 conn.commit()
                 conn.close()
+                self.save_settings(settings)
+                if settings["key_cache"] == "keyring":
+                    self.cache_raw_key(db_path, password, settings)
                 print(f"Encrypted database created at: {db_path}")
             except Exception as e:
                 print("Error creating database:", e)  # Handle any exceptions that occur during database creation
@@ -133,144 +284,86 @@ class Installation:
 
     def create_tables(self, conn):
         """
-        Creates the necessary tables in the database, if they don't already exist.
+        Creates the necessary tables in the database, if they don't already exist, by running every
+        pending schema migration (see migrations.run_migrations).
         
         Arguments:
             conn (sqlite3.Connection): The database connection object.
         
         Raises:
             Exception: If there is an error while creating the tables.
-        """
-        cursor = conn.cursor()  # Create a cursor to execute SQL commands
-
-        # SQL script to create the necessary tables
-        sql_script = """
-        CREATE TABLE IF NOT EXISTS users (
-            user_id INTEGER PRIMARY KEY,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            alerts_enabled INTEGER DEFAULT 1,
-            default_chart INTEGER DEFAULT 0,
-            weekly_reports INTEGER DEFAULT 0,
-            monthly_reports INTEGER DEFAULT 0,
-            yearly_reports INTEGER DEFAULT 0,
-            security_question1 TEXT NOT NULL,
-            security_question2 TEXT NOT NULL,
-            security_question3 TEXT NOT NULL,
-            security_question1_answer TEXT NOT NULL,  
-            security_question2_answer TEXT NOT NULL,  
-            security_question3_answer TEXT NOT NULL   
-        );
-
-        CREATE TABLE IF NOT EXISTS budgets (
-            budget_id INTEGER PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
-            budget_name TEXT NOT NULL,
-            total_budgeted_amount REAL DEFAULT 0.0,
-            leftover_amount REAL DEFAULT 0.0,
-            start_date DATETIME NOT NULL,
-            end_date DATETIME NOT NULL
-        );
-
-        CREATE TABLE IF NOT EXISTS budget_accounts (
-            budget_accounts_id INTEGER PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
-            budget_id INTEGER NOT NULL REFERENCES budgets(budget_id) ON DELETE CASCADE,
-            account_name TEXT NOT NULL,
-            total_allocated_amount REAL DEFAULT 0.0,
-            current_amount REAL DEFAULT 0.0,
-            savings_goal REAL DEFAULT 0.0,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            notes TEXT
-        );
-
-        CREATE TABLE IF NOT EXISTS vendors (
-            vendor_id INTEGER PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
-            vendor_name TEXT NOT NULL
-        );
-
-        CREATE TABLE IF NOT EXISTS alerts (
-            alert_id INTEGER PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
-            budget_accounts_id INTEGER NOT NULL REFERENCES budget_accounts(budget_accounts_id) ON DELETE CASCADE,
-            alert_type INTEGER DEFAULT 0,
-            threshhold_amount REAL DEFAULT 0.0,
-            frequency INTEGER DEFAULT 1,
-            status INTEGER DEFAULT 1,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            active_from DATETIME,
-            active_until DATETIME
-        );
-
-        CREATE TABLE IF NOT EXISTS reports (
-            report_id INTEGER PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
-            report_type INTEGER DEFAULT 0,
-            report_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            report_data BLOB
-        );
-
-        CREATE TABLE IF NOT EXISTS transactions (
-            transaction_id INTEGER PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
-            budget_accounts_id INTEGER NOT NULL REFERENCES budget_accounts(budget_accounts_id) ON DELETE CASCADE,
-            vendor_id INTEGER REFERENCES vendors(vendor_id) ON DELETE CASCADE,
-            amount REAL DEFAULT 0.0,
-            transaction_date DATETIME NOT NULL,
-            description TEXT,
-            recurring INTEGER DEFAULT 0,
-            status INTEGER DEFAULT 0
-        );
-
-        -- Indexes for optimization
-        CREATE INDEX idx_users_username ON users(username);
-        CREATE INDEX idx_budgets_user ON budgets(user_id);
-        CREATE INDEX idx_budget_accounts_user ON budget_accounts(user_id);
-        CREATE INDEX idx_budget_accounts_budget ON budget_accounts(budget_id);
-        CREATE INDEX idx_transactions_user ON transactions(user_id);
-        CREATE INDEX idx_transactions_budget_account ON transactions(budget_accounts_id);
-        CREATE INDEX idx_transactions_vendor ON transactions(vendor_id);
-
-        -- Trigger to update `updated_at` on modification
-        CREATE TRIGGER update_budget_accounts_timestamp
-        AFTER UPDATE ON budget_accounts
-        FOR EACH ROW
-        BEGIN
-            UPDATE budget_accounts SET updated_at = CURRENT_TIMESTAMP WHERE budget_accounts_id = OLD.budget_accounts_id;
-        END;
-
-        CREATE TRIGGER update_alerts_timestamp
-        AFTER UPDATE ON alerts
-        FOR EACH ROW
-        BEGIN
-            UPDATE alerts SET updated_at = CURRENT_TIMESTAMP WHERE alert_id = OLD.alert_id;
-        END;
-
-        CREATE TRIGGER update_reports_timestamp
-        AFTER UPDATE ON reports
-        FOR EACH ROW
-        BEGIN
-            UPDATE reports SET updated_at = CURRENT_TIMESTAMP WHERE report_id = OLD.report_id;
-        END;
-
-        CREATE TRIGGER update_vendors_timestamp
-        AFTER UPDATE ON vendors
-        FOR EACH ROW
-        BEGIN
-            UPDATE vendors SET updated_at = CURRENT_TIMESTAMP WHERE vendor_id = OLD.vendor_id;
-        END;
-
         """
         try:
-            # Execute the SQL script to create all tables
-            cursor.executescript(sql_script)
-            conn.commit()  # Commit the changes to the database
+            run_migrations(conn, progress=None)
             print("All tables created successfully!")  
         except Exception as e:
             # Handle errors during table creation
             print("Error creating tables:", e)
+
+    def rebuild_account_month_totals(self, conn):
+        """
+        Creates the account_month_totals table and its triggers if they are missing, then
+        recomputes every row from the transactions with a readable date.
+
+        Use this to bring databases created before the summary table existed up to date,
+        or to repair totals that fail verify_account_month_totals.
+
+        Arguments:
+            conn (sqlite3.Connection): The database connection object.
+
+        Returns:
+            int: The number of (account, month) rows written.
+        """
+        cursor = conn.cursor()
+        try:
+            cursor.executescript(ACCOUNT_MONTH_TOTALS_SCHEMA)
+            cursor.execute("BEGIN")
+            cursor.execute("DELETE FROM account_month_totals")
+            rows = insert_account_month_totals(cursor).rowcount
+            conn.commit()
+            print(f"Rebuilt {rows} account month totals.")
+            return rows
+        except Exception as e:
+            conn.rollback()
+            print("Error rebuilding account month totals:", e)
+            raise
+        finally:
+            cursor.close()
+
+    def verify_account_month_totals(self, conn):
+        """
+        Compares account_month_totals against totals recomputed from the transactions table, with the
+        same query the migrations fill it with. Amounts are integer cents, so they must match exactly.
+
+        Arguments:
+            conn (sqlite3.Connection): The database connection object.
+
+        Returns:
+            list: (budget_accounts_id, month, stored_total, actual_total) for every mismatching row.
+                  An empty list means the summary table is correct.
+        """
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"""
+                WITH actual AS ({ACCOUNT_MONTH_TOTALS_SELECT.format(condition="")}),
+                joined AS (
+                    SELECT a.budget_accounts_id, a.month, s.total_amount AS stored, a.total_amount AS actual,
+                           s.transaction_count AS stored_count, a.transaction_count AS actual_count
+                    FROM actual a
+                    LEFT JOIN account_month_totals s
+                        ON s.budget_accounts_id = a.budget_accounts_id AND s.month = a.month
+                    UNION ALL
+                    SELECT s.budget_accounts_id, s.month, s.total_amount, NULL, s.transaction_count, NULL
+                    FROM account_month_totals s
+                    LEFT JOIN actual a ON a.budget_accounts_id = s.budget_accounts_id AND a.month = s.month
+                    WHERE a.budget_accounts_id IS NULL
+                )
+                SELECT budget_accounts_id, month, stored, actual
+                FROM joined
+                WHERE stored IS NULL OR actual IS NULL
+                   OR stored_count != actual_count
+                   OR stored != actual
+            """)
+            return cursor.fetchall()
         finally:
-            cursor.close()  # Ensure the cursor is closed after execution
+            cursor.close()
@@ -0,0 +1,433 @@
+import re
+import time
+
+from src.backend.database_interation.dates import to_iso_date
+from src.backend.database_interation.report_summary import migrate_report_summaries
+
+# Tables, indexes and triggers of the first versioned schema. Databases created before schema versions
+# existed already hold most of it, so every statement is idempotent and only adds what they are missing.
+BASE_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            alerts_enabled INTEGER DEFAULT 1,
+            default_chart INTEGER DEFAULT 0,
+            weekly_reports INTEGER DEFAULT 0,
+            monthly_reports INTEGER DEFAULT 0,
+            yearly_reports INTEGER DEFAULT 0,
+            security_question1 TEXT NOT NULL,
+            security_question2 TEXT NOT NULL,
+            security_question3 TEXT NOT NULL,
+            security_question1_answer TEXT NOT NULL,  
+            security_question2_answer TEXT NOT NULL,  
+            security_question3_answer TEXT NOT NULL   
+        );
+
+        CREATE TABLE IF NOT EXISTS budgets (
+            budget_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            budget_name TEXT NOT NULL,
+            total_budgeted_amount REAL DEFAULT 0.0,
+            leftover_amount REAL DEFAULT 0.0,
+            start_date DATETIME NOT NULL,
+            end_date DATETIME NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS budget_accounts (
+            budget_accounts_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            budget_id INTEGER NOT NULL REFERENCES budgets(budget_id) ON DELETE CASCADE,
+            account_name TEXT NOT NULL,
+            total_allocated_amount REAL DEFAULT 0.0,
+            current_amount REAL DEFAULT 0.0,
+            savings_goal REAL DEFAULT 0.0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            notes TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS vendors (
+            vendor_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            vendor_name TEXT NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS alerts (
+            alert_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            budget_accounts_id INTEGER NOT NULL REFERENCES budget_accounts(budget_accounts_id) ON DELETE CASCADE,
+            alert_type INTEGER DEFAULT 0,
+            threshhold_amount REAL DEFAULT 0.0,
+            frequency INTEGER DEFAULT 1,
+            status INTEGER DEFAULT 1,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            active_from DATETIME,
+            active_until DATETIME
+        );
+
+        CREATE TABLE IF NOT EXISTS reports (
+            report_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            report_type INTEGER DEFAULT 0,
+            report_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            report_data BLOB,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS transactions (
+            transaction_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            budget_accounts_id INTEGER NOT NULL REFERENCES budget_accounts(budget_accounts_id) ON DELETE CASCADE,
+            vendor_id INTEGER REFERENCES vendors(vendor_id) ON DELETE CASCADE,
+            amount REAL DEFAULT 0.0,
+            transaction_date DATETIME NOT NULL,
+            description TEXT,
+            recurring INTEGER DEFAULT 0,
+            status INTEGER DEFAULT 0
+        );
+
+        -- Indexes for optimization
+        CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+        CREATE INDEX IF NOT EXISTS idx_budgets_user ON budgets(user_id);
+        CREATE INDEX IF NOT EXISTS idx_budget_accounts_user ON budget_accounts(user_id);
+        CREATE INDEX IF NOT EXISTS idx_budget_accounts_budget ON budget_accounts(budget_id);
+        CREATE INDEX IF NOT EXISTS idx_transactions_user ON transactions(user_id);
+        CREATE INDEX IF NOT EXISTS idx_transactions_budget_account ON transactions(budget_accounts_id);
+        CREATE INDEX IF NOT EXISTS idx_transactions_vendor ON transactions(vendor_id);
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions(user_id, transaction_date, transaction_id);
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_account_date ON transactions(user_id, budget_accounts_id, transaction_date);
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_vendor_date ON transactions(user_id, vendor_id, transaction_date);
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_recurring_date ON transactions(user_id, recurring, transaction_date);
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_amount ON transactions(user_id, amount);
+
+        -- Trigger to update `updated_at` on modification
+        CREATE TRIGGER IF NOT EXISTS update_budget_accounts_timestamp
+        AFTER UPDATE ON budget_accounts
+        FOR EACH ROW
+        BEGIN
+            UPDATE budget_accounts SET updated_at = CURRENT_TIMESTAMP WHERE budget_accounts_id = OLD.budget_accounts_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS update_alerts_timestamp
+        AFTER UPDATE ON alerts
+        FOR EACH ROW
+        BEGIN
+            UPDATE alerts SET updated_at = CURRENT_TIMESTAMP WHERE alert_id = OLD.alert_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS update_reports_timestamp
+        AFTER UPDATE ON reports
+        FOR EACH ROW
+        BEGIN
+            UPDATE reports SET updated_at = CURRENT_TIMESTAMP WHERE report_id = OLD.report_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS update_vendors_timestamp
+        AFTER UPDATE ON vendors
+        FOR EACH ROW
+        BEGIN
+            UPDATE vendors SET updated_at = CURRENT_TIMESTAMP WHERE vendor_id = OLD.vendor_id;
+        END;
+"""
+
+# Per-account, per-month spend totals kept current by triggers on `transactions`.
+# `month` is the "YYYY-MM" prefix of transaction_date. Only transactions dated "YYYY-MM-DD" are counted:
+# any other value (a datetime until migration 6 rewrites it, or a date it cannot read) would make up a
+# month key of its own. Every statement is idempotent so the same script can be applied to databases
+# created before the table existed.
+ACCOUNT_MONTH_TOTALS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS account_month_totals (
+            budget_accounts_id INTEGER NOT NULL REFERENCES budget_accounts(budget_accounts_id) ON DELETE CASCADE,
+            user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            month TEXT NOT NULL,
+            total_amount REAL DEFAULT 0.0,
+            transaction_count INTEGER DEFAULT 0,
+            PRIMARY KEY (budget_accounts_id, month)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_account_month_totals_user_month ON account_month_totals(user_id, month);
+
+        CREATE TRIGGER IF NOT EXISTS account_month_totals_insert
+        AFTER INSERT ON transactions
+        FOR EACH ROW WHEN NEW.transaction_date IS date(NEW.transaction_date)
+        BEGIN
+            INSERT INTO account_month_totals (budget_accounts_id, user_id, month, total_amount, transaction_count)
+            VALUES (NEW.budget_accounts_id, NEW.user_id, substr(NEW.transaction_date, 1, 7), NEW.amount, 1)
+            ON CONFLICT (budget_accounts_id, month) DO UPDATE
+            SET total_amount = total_amount + excluded.total_amount,
+                transaction_count = transaction_count + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS account_month_totals_delete
+        AFTER DELETE ON transactions
+        FOR EACH ROW WHEN OLD.transaction_date IS date(OLD.transaction_date)
+        BEGIN
+            UPDATE account_month_totals
+            SET total_amount = total_amount - OLD.amount,
+                transaction_count = transaction_count - 1
+            WHERE budget_accounts_id = OLD.budget_accounts_id AND month = substr(OLD.transaction_date, 1, 7);
+            DELETE FROM account_month_totals
+            WHERE budget_accounts_id = OLD.budget_accounts_id AND month = substr(OLD.transaction_date, 1, 7)
+            AND transaction_count <= 0;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS account_month_totals_update
+        AFTER UPDATE OF budget_accounts_id, user_id, amount, transaction_date ON transactions
+        FOR EACH ROW
+        BEGIN
+            UPDATE account_month_totals
+            SET total_amount = total_amount - OLD.amount,
+                transaction_count = transaction_count - 1
+            WHERE budget_accounts_id = OLD.budget_accounts_id AND month = substr(OLD.transaction_date, 1, 7)
+            AND OLD.transaction_date IS date(OLD.transaction_date);
+            DELETE FROM account_month_totals
+            WHERE budget_accounts_id = OLD.budget_accounts_id AND month = substr(OLD.transaction_date, 1, 7)
+            AND transaction_count <= 0;
+            INSERT INTO account_month_totals (budget_accounts_id, user_id, month, total_amount, transaction_count)
+            SELECT NEW.budget_accounts_id, NEW.user_id, substr(NEW.transaction_date, 1, 7), NEW.amount, 1
+            WHERE NEW.transaction_date IS date(NEW.transaction_date)
+            ON CONFLICT (budget_accounts_id, month) DO UPDATE
+            SET total_amount = total_amount + excluded.total_amount,
+                transaction_count = transaction_count + 1;
+        END;
+"""
+
+# The rows of account_month_totals, computed from the transactions. The one definition of what the
+# triggers above keep current: migrations fill the table with it, and Installation rebuilds and
+# verifies the table against it. {condition} narrows the transactions further, e.g. to a batch of accounts.
+ACCOUNT_MONTH_TOTALS_SELECT = """
+            SELECT budget_accounts_id, user_id, substr(transaction_date, 1, 7) AS month,
+                   SUM(amount) AS total_amount, COUNT(*) AS transaction_count
+            FROM transactions
+            WHERE transaction_date IS date(transaction_date) {condition}
+            GROUP BY budget_accounts_id, substr(transaction_date, 1, 7)
+"""
+
+
+def insert_account_month_totals(conn, condition="", parameters=()):
+    """Add the account_month_totals rows computed from the dated transactions, narrowed by condition ("AND ...")."""
+    return conn.execute(
+        "INSERT INTO account_month_totals (budget_accounts_id, user_id, month, total_amount, transaction_count)"
+        + ACCOUNT_MONTH_TOTALS_SELECT.format(condition=condition),
+        parameters,
+    )
+
+
+def _create_base_schema(conn, progress):
+    conn.executescript(BASE_SCHEMA)
+
+
+def _add_account_month_totals(conn, progress, batch_size=50):
+    """Create account_month_totals and compute it from the transactions, a batch of accounts per commit."""
+    conn.executescript(ACCOUNT_MONTH_TOTALS_SCHEMA)
+    account_ids = [row[0] for row in conn.execute("SELECT budget_accounts_id FROM budget_accounts ORDER BY budget_accounts_id")]
+    conn.execute("DELETE FROM account_month_totals")
+    for start in range(0, len(account_ids), batch_size):
+        batch = account_ids[start:start + batch_size]
+        insert_account_month_totals(conn, f"AND budget_accounts_id IN ({', '.join('?' * len(batch))})", batch)
+        conn.commit()
+        progress(start + len(batch), len(account_ids))
+    conn.commit()
+
+
+def _add_report_summaries(conn, progress):
+    migrate_report_summaries(conn, progress=progress)
+
+
+def _add_vendors_updated_at(conn, progress):
+    """Give vendors the updated_at column its UPDATE trigger writes to, so vendors can be updated."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(vendors)")}
+    if "updated_at" not in columns:
+        # ADD COLUMN only accepts constant defaults, so existing rows keep NULL until they are next updated
+        conn.execute("ALTER TABLE vendors ADD COLUMN updated_at DATETIME")
+        conn.commit()
+
+
+# Money columns stored as REAL dollars before migration 5, now INTEGER cents (see money.Money)
+MONEY_COLUMNS = (
+    ("budgets", ("total_budgeted_amount", "leftover_amount")),
+    ("budget_accounts", ("total_allocated_amount", "current_amount", "savings_goal")),
+    ("alerts", ("threshhold_amount",)),
+    ("transactions", ("amount",)),
+    ("account_month_totals", ("total_amount",)),
+)
+
+
+def _store_money_as_cents(conn, progress):
+    """
+    Rebuild every table in MONEY_COLUMNS with its money columns declared INTEGER and holding cents.
+
+    SQLite cannot change a column's type in place, and a REAL column turns the integers written to it
+    back into floats, so each table is copied into a new one built from its own CREATE statement with
+    the types swapped. Triggers are dropped first and recreated afterwards from the schema scripts.
+    Tables that already store cents are skipped, so an interrupted run simply picks up where it stopped.
+    Account month totals are recomputed from the transactions afterwards.
+    """
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys = OFF")  # Only takes effect outside a transaction
+    try:
+        conn.execute("BEGIN")
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+            conn.execute(f"DROP TRIGGER {name}")
+        for done, (table, columns) in enumerate(MONEY_COLUMNS, start=1):
+            _retype_to_cents(conn, table, columns)
+            progress(done, len(MONEY_COLUMNS))
+        # The month totals are derived data: recompute them from the converted transactions rather than
+        # trust a scaled copy, in case they were written by a different version than the transactions
+        conn.execute("DELETE FROM account_month_totals")
+        insert_account_month_totals(conn)
+        problems = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if problems:
+            raise ValueError(f"foreign key check failed after converting amounts: {problems[:5]}")
+        conn.commit()
+    finally:
+        conn.execute("PRAGMA foreign_keys = 1")
+    conn.executescript(BASE_SCHEMA + ACCOUNT_MONTH_TOTALS_SCHEMA)  # Recreates the dropped triggers and indexes
+
+
+def _retype_to_cents(conn, table, columns):
+    create_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()[0]
+    column_types = {row[1]: row[2].upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+    if all(column_types.get(column) != "REAL" for column in columns):
+        return
+    for column in columns:
+        create_sql, replaced = re.subn(rf"(\b{column}\s+)REAL(\s+DEFAULT\s+0\.0\b)?", r"\1INTEGER DEFAULT 0", create_sql, count=1)
+        if not replaced:
+            raise ValueError(f"cannot find REAL column {table}.{column}")
+    create_sql = re.sub(rf"^CREATE TABLE (IF NOT EXISTS )?\"?{table}\"?", f"CREATE TABLE {table}_cents", create_sql)
+    names = list(column_types)
+    select = ", ".join(f"CAST(ROUND({name} * 100) AS INTEGER)" if name in columns else name for name in names)
+    conn.execute(create_sql)
+    conn.execute(f"INSERT INTO {table}_cents ({', '.join(names)}) SELECT {select} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_cents RENAME TO {table}")
+
+
+# transaction_date holds "YYYY-MM-DD" only, from migration 6 on (see dates.to_iso_date). The triggers reject
+# any other format, since text in another format would sort out of place and escape every date-range query.
+# The (user_id, transaction_date, transaction_id) index gains the account and amount, so date-range totals
+# and the scheduled-spend query are answered from the index alone; it still serves keyset pagination.
+TRANSACTION_DATE_SCHEMA = """
+        CREATE TRIGGER IF NOT EXISTS transactions_date_insert
+        BEFORE INSERT ON transactions
+        FOR EACH ROW WHEN NEW.transaction_date IS NOT date(NEW.transaction_date)
+        BEGIN
+            SELECT RAISE(ABORT, 'transaction_date must be YYYY-MM-DD');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS transactions_date_update
+        BEFORE UPDATE OF transaction_date ON transactions
+        FOR EACH ROW WHEN NEW.transaction_date IS NOT date(NEW.transaction_date)
+        BEGIN
+            SELECT RAISE(ABORT, 'transaction_date must be YYYY-MM-DD');
+        END;
+
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_date_amount
+            ON transactions(user_id, transaction_date, transaction_id, budget_accounts_id, amount);
+        DROP INDEX IF EXISTS idx_transactions_user_date;
+"""
+
+
+def _store_iso_dates(conn, progress, batch_size=5000):
+    """
+    Rewrite every transaction_date that is not already "YYYY-MM-DD" (datetimes, US-style dates), a batch
+    per commit, then add TRANSACTION_DATE_SCHEMA. The account month totals follow through their triggers.
+
+    Dates that cannot be read are left as they are and reported. The account month totals never counted
+    them, so they only show on the Transactions page until they are given a valid date.
+    """
+    rows = conn.execute(
+        "SELECT transaction_id, transaction_date FROM transactions WHERE transaction_date IS NOT date(transaction_date)"
+    ).fetchall()
+    updates, unreadable = [], []
+    for transaction_id, transaction_date in rows:
+        try:
+            updates.append((to_iso_date(transaction_date), transaction_id))
+        except ValueError:
+            unreadable.append(transaction_id)
+    for start in range(0, len(updates), batch_size):
+        batch = updates[start:start + batch_size]
+        conn.executemany("UPDATE transactions SET transaction_date = ? WHERE transaction_id = ?", batch)
+        conn.commit()
+        progress(start + len(batch), len(updates))
+    if unreadable:
+        print(f"Warning: {len(unreadable)} transactions have unreadable dates and were left unchanged "
+              f"(transaction IDs {', '.join(map(str, unreadable[:10]))}{'...' if len(unreadable) > 10 else ''}). "
+              "They are listed on the Transactions page, where editing one gives it a date. Until then the "
+              "Dashboard, the Accounts page (month spend, account totals and transaction lists) and new reports "
+              "leave them out.")
+    conn.executescript(TRANSACTION_DATE_SCHEMA)
+
+
+# Ordered schema upgrades: (version, description, step). A database at version N has run every step
+# up to and including N; PRAGMA user_version holds N. Steps are only ever appended, never edited once
+# released. A step that backfills data commits in batches so it never holds the write lock for long,
+# and must be safe to run again: an interrupted step is rerun from the start on the next launch.
+MIGRATIONS = (
+    (1, "Create tables, indexes and triggers", _create_base_schema),
+    (2, "Compute account month totals", _add_account_month_totals),
+    (3, "Summarise reports", _add_report_summaries),
+    (4, "Add vendors.updated_at", _add_vendors_updated_at),
+    (5, "Store amounts as integer cents", _store_money_as_cents),
+    (6, "Store transaction dates as YYYY-MM-DD", _store_iso_dates),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in the database header (0 for databases that predate versioning)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def print_progress(version, description, done, total):
+    """Default progress reporter of run_migrations."""
+    print(f"Migration {version}/{SCHEMA_VERSION} ({description}): {done}/{total}")
+
+
+def run_migrations(conn, progress=print_progress, target=SCHEMA_VERSION):
+    """
+    Bring the database schema up to target (SCHEMA_VERSION) by running every pending step in order.
+
+    When the database is up to date this reads PRAGMA user_version and returns, so it is cheap enough
+    to call every time the database is opened.
+
+    Arguments:
+        conn (sqlcipher3.Connection): The writer connection to the database.
+        progress (callable, optional): progress(version, description, done, total), called as long
+            steps finish each batch. None reports nothing.
+        target (int): The version to stop at. Older versions are only useful to tools and benchmarks.
+
+    Returns:
+        int: The number of steps run.
+
+    Raises:
+        Exception: If a step fails. The version is left at the last completed step, so the failed
+            step is retried the next time the database is opened.
+    """
+    current = get_schema_version(conn)
+    if current >= target:
+        if current > SCHEMA_VERSION:
+            print(f"Warning: database schema version {current} is newer than this version of BudgetWise ({SCHEMA_VERSION}).")
+        return 0
+
+    steps_run = 0
+    for version, description, step in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        began = time.perf_counter()
+        report = (lambda done, total, v=version, d=description: progress(v, d, done, total)) if progress else (lambda done, total: None)
+        try:
+            step(conn, report)
+            conn.commit()
+            conn.execute(f"PRAGMA user_version = {version}")
+        except Exception as e:
+            conn.rollback()
+            print(f"Error running migration {version} ({description}):", e)
+            raise
+        steps_run += 1
+        print(f"Migrated database schema to version {version} ({description}) in {time.perf_counter() - began:.2f}s.")
+    return steps_run
@@ -0,0 +1,94 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncFacade:
+    """
+    Asyncio-facing view of a backend object (UserData, TransClass, Vendor, ReportStore, ...).
+
+    Every method of the wrapped object is available as a coroutine function with the same arguments:
+    `await facade.get_transaction_page(...)` runs TransClass.get_transaction_page on the database
+    executor and returns its result, so the Flet event loop keeps drawing while the query runs.
+    Attributes that are not callable are read straight from the wrapped object.
+    """
+
+    def __init__(self, target, async_db):
+        self._target = target
+        self._async_db = async_db
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self._async_db.run(attribute, *args, **kwargs)
+
+        return call
+
+
+class AsyncDatabase:
+    """
+    Runs database work for the UI on a small thread pool and hands back awaitables.
+
+    Flet handlers that query SQLCipher directly hold up the window until the query returns. A page
+    instead shows a placeholder, awaits its data through this class and fills the placeholder in:
+
+        rows = await self.async_db.wrap(self.trans_funcs).get_transaction_page(user_id, 50)
+        total = await self.async_db.run(self.get_total_budget)   # any blocking page loader
+
+    Each executor thread reads through its own Database.reader() connection. Every backend write
+    runs inside Database.transaction(), which takes the writer lock for the whole block, so writes
+    from executor threads and the UI thread never share a transaction, and several reads can run
+    side by side.
+
+    Attributes:
+        db (Database): The connection pool the work runs against.
+        executor (ThreadPoolExecutor): The threads the work runs on.
+    """
+
+    def __init__(self, db, max_workers=3):
+        """
+        Arguments:
+            db (Database): The connection pool the work runs against.
+            max_workers (int): Threads in the pool; each keeps one reader connection open.
+        """
+        self.db = db
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="BudgetWiseDB")
+
+    def wrap(self, target):
+        """Return an AsyncFacade over target whose methods run on this executor."""
+        return AsyncFacade(target, self)
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the executor and return its result (or raise its exception)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def fetchall(self, query, params=()):
+        """Run a read-only query on a reader connection and return every row."""
+        return await self.run(self._fetch, query, params, all_rows=True)
+
+    async def fetchone(self, query, params=()):
+        """Run a read-only query on a reader connection and return the first row, or None."""
+        return await self.run(self._fetch, query, params, all_rows=False)
+
+    async def execute(self, query, params=()):
+        """Run one write statement in its own transaction. Returns (rowcount, lastrowid)."""
+        return await self.run(self._execute, query, params)
+
+    def _fetch(self, query, params, all_rows):
+        with self.db.reader() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall() if all_rows else cursor.fetchone()
+
+    def _execute(self, query, params):
+        with self.db.transaction() as cursor:
+            cursor.execute(query, params)
+            return cursor.rowcount, cursor.lastrowid
+
+    def shutdown(self):
+        """Wait for running work to finish and stop the threads. Call before closing the database."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
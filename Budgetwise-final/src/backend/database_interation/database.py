@@ -1,7 +1,20 @@
 import sqlcipher3
 import keyring
+import keyring.errors
 import threading
+from contextlib import contextmanager
 from pathlib import Path
+from src.backend.database_creation.performance_profiles import apply_cipher_settings, apply_profile
+from src.backend.database_creation.cipher_keys import (
+    DEFAULT_KEY_CACHE,
+    KEY_CACHE_POLICIES,
+    RAW_KEY_USERNAME,
+    apply_key,
+    derive_raw_key,
+    is_raw_key,
+    read_salt,
+)
+from src.backend.database_creation.migrations import run_migrations
 
 class Database:
     """
@@ -9,16 +22,34 @@ class Database:
     of the connection (Singleton pattern). It is responsible for:
     - Opening the database connection.
     - Ensuring the database is properly unlocked using the stored password.
-    - Providing access to a database cursor for querying.
+    - Handing out short-lived cursors for querying.
     - Committing changes to the database and closing the connection.
+
+    Connections are pooled:
+    - A single writer connection handles every write. Writes only run inside transaction(), which
+      holds a lock for the whole block and commits it once, so writes from different threads never
+      share a transaction.
+    - Each thread that calls reader() gets its own read connection, so background jobs can read
+      while the UI thread writes. Only the thread inside a transaction() block reads through the
+      writer, so it sees its own uncommitted changes and no other thread does.
+
+    Every connection is unlocked with the raw key derived from the keyring password when the
+    key_cache setting allows it (see cipher_keys), so opening a connection skips SQLCipher's
+    key derivation.
     
     Attributes:
         _instance (Database, optional): A singleton instance of the Database class.
         _lock (threading.Lock): A lock to prevent race conditions while accessing the singleton instance.
         installer (Installation): An instance of the Installation class to get app-specific details like the database path.
         db_filename (str): The filename of the database to connect to (default is "BudgetWise.db").
-        __conn (sqlcipher3.Connection, optional): The database connection object.
-        __cursor (sqlcipher3.Cursor, optional): The database cursor used for querying.
+        db_path (Path, optional): The resolved path of the database file.
+        settings (dict, optional): The performance profile, cipher settings and key cache policy applied to every connection.
+        __conn (sqlcipher3.Connection, optional): The writer connection.
+        _write_lock (threading.RLock): Serializes transaction() blocks on the writer connection.
+        _write_depth (int): How many transaction() blocks are open; commit_db() waits for the outermost.
+        _write_owner (int, optional): The ident of the thread inside transaction(), or None.
+        _local (threading.local): Holds each thread's reader connection.
+        _readers (list): Every open reader connection, so close_db can close them all.
         _initialized (bool): Flag indicating whether the class has been initialized.
     """
     _instance = None  # Singleton instance
@@ -39,8 +70,17 @@ class Database:
 
         self.installer = installer  # Store the installer object
         self.db_filename = db_filename  # Store the database filename
+        self.db_path = None  # Resolved when the database is opened
+        self.settings = None
+        self.__password = None
+        self.__raw_key = None  # Derived from the password, see _resolve_raw_key
         self.__conn = None  # Initialize the connection attribute as None
-        self.__cursor = None  # Initialize the cursor attribute as None
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._write_owner = None
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
         self._initialized = True  # Mark the class as initialized
         self.open_db()  # Open the database connection during initialization
 
@@ -65,12 +105,14 @@ class Database:
     
     def open_db(self):
         """
-        Opens a connection to the encrypted database. If the connection is already open, it returns early.
+        Opens the writer connection to the encrypted database. If the connection is already open, it returns early.
+        Reader connections are opened lazily, one per thread, by reader().
 
         This method:
         - Checks if the database exists at the expected path.
-        - Retrieves the database password from the keyring.
-        - Initializes the SQLCipher connection with the password and opens a cursor.
+        - Retrieves the database password from the keyring, and the raw key cached for it.
+        - Initializes the SQLCipher writer connection with the raw key, or the password.
+        - Upgrades the schema of databases created by older versions (see migrations.run_migrations).
         
         Raises:
             FileNotFoundError: If the database file does not exist.
@@ -80,7 +122,31 @@ class Database:
         if self.__conn is not None:
             print("Database connection already established.")
             return  # Prevent reopening the connection if it's already open
-        
+
+        self.db_path, self.__password = self._resolve_credentials()
+        self.settings = self._resolve_settings()
+        self.__raw_key = self._resolve_raw_key()
+
+        try:
+            self.__conn = self._connect()
+            run_migrations(self.__conn)
+            print("Database opened successfully.")
+        except sqlcipher3.DatabaseError as e:
+            # Handle any errors that occur when opening the database
+            print(f"SQLCipher Error: {e}")
+            raise
+
+    def _resolve_credentials(self):
+        """
+        Returns the database path and password used for every pooled connection.
+
+        Returns:
+            tuple: (Path, str)
+
+        Raises:
+            FileNotFoundError: If the database file does not exist.
+            Exception: If the database password is not found in the keyring.
+        """
         # Build the database path using Pathlib for platform-independent path handling
         app_folder = Path(self.installer.get_app_folder())  # Get the app's folder path
         db_path = app_folder / self.db_filename  # Construct the full database file path
@@ -93,62 +159,246 @@ class Database:
         password = keyring.get_password(self.installer.app_folder_name, "db_password")
         if password is None:
             raise Exception("Database password not found. Please run the setup.")
+        return db_path, password
+
+    def _resolve_settings(self):
+        """
+        Returns the performance profile and cipher settings saved by the installer.
+
+        Returns:
+            dict: {"performance_profile": str, "cipher": dict, "key_cache": str}
+        """
+        return self.installer.load_settings()
+
+    def _resolve_raw_key(self):
+        """
+        Returns the raw key every connection is unlocked with, following the key_cache setting:
+        "keyring" reads the key cached in the keyring and derives and caches it if it is missing,
+        "memory" derives it for this process only, and "off" returns None so the password is used.
 
+        Returns:
+            str or None: The raw key as 64 hex digits, or None to unlock with the password.
+        """
+        policy = self.settings.get("key_cache", DEFAULT_KEY_CACHE)
+        if policy not in KEY_CACHE_POLICIES:
+            print(f"Unknown key cache policy '{policy}', using '{DEFAULT_KEY_CACHE}'.")
+            policy = DEFAULT_KEY_CACHE
+        if policy == "off":
+            return None
+
+        if policy == "keyring":
+            raw_key = self._load_cached_key()
+            if is_raw_key(raw_key):
+                return raw_key
+
+        salt = read_salt(self.db_path)
+        if salt is None:
+            return None
+        raw_key = derive_raw_key(self.__password, salt, self.settings["cipher"])
+        if policy == "keyring":
+            self._store_cached_key(raw_key)
+        return raw_key
+
+    def _load_cached_key(self):
+        """Returns the raw key cached in the keyring, or None."""
         try:
-            # Attempt to establish a connection to the database using SQLCipher
-            self.__conn = sqlcipher3.connect(str(db_path), check_same_thread=False)
-            self.__conn.execute(f"PRAGMA key='{password}'")  # Set the encryption key for SQLCipher
-            self.__conn.execute("PRAGMA foreign_keys = 1")  # Enable foreign key support
-            self.__cursor = self.__conn.cursor()  # Initialize the cursor for database queries
-            print("Database opened successfully.")
-        except sqlcipher3.DatabaseError as e:
-            # Handle any errors that occur when opening the database
-            print(f"SQLCipher Error: {e}")
-            raise
+            return keyring.get_password(self.installer.app_folder_name, RAW_KEY_USERNAME)
+        except keyring.errors.KeyringError as e:
+            print("Could not read the cached database key:", e)
+            return None
+
+    def _store_cached_key(self, raw_key):
+        """Caches the raw key in the keyring; connections still open with it if that fails."""
+        try:
+            keyring.set_password(self.installer.app_folder_name, RAW_KEY_USERNAME, raw_key)
+        except keyring.errors.KeyringError as e:
+            print("Could not cache the database key:", e)
+
+    def _forget_cached_key(self):
+        """Removes a cached raw key that no longer opens the database."""
+        try:
+            keyring.delete_password(self.installer.app_folder_name, RAW_KEY_USERNAME)
+        except keyring.errors.KeyringError:
+            pass
+
+    def _connect(self, read_only=False):
+        """
+        Opens one SQLCipher connection to the database and unlocks it.
+
+        If the raw key does not open the file (the database was replaced after the key was cached),
+        the cached key is dropped and the connection is unlocked with the password instead.
+
+        Arguments:
+            read_only (bool): If True, the connection rejects writes (used for reader connections).
+
+        Returns:
+            sqlcipher3.Connection: The unlocked connection.
+        """
+        conn = sqlcipher3.connect(str(self.db_path), check_same_thread=False)
+        raw_key = self.__raw_key
+        apply_key(conn, self.__password, raw_key)  # Set the encryption key for SQLCipher
+        apply_cipher_settings(conn, self.settings["cipher"])  # Must follow the key, before any other statement
+        if raw_key is not None:
+            try:
+                conn.execute("SELECT count(*) FROM sqlite_master").fetchone()  # Fails if the key is wrong
+            except sqlcipher3.DatabaseError:
+                conn.close()
+                print("Cached database key rejected, unlocking with the password.")
+                self.__raw_key = None
+                self._forget_cached_key()
+                return self._connect(read_only)
+        conn.execute("PRAGMA foreign_keys = 1")  # Enable foreign key support
+        apply_profile(conn, self.settings["performance_profile"], read_only=read_only)
+        if read_only:
+            conn.execute("PRAGMA query_only = 1")
+        return conn
 
     def cursor(self):
         """
-        Returns the database cursor for querying the database.
+        Returns a new cursor on the writer connection, for the thread inside a transaction() block.
+        Each caller gets its own cursor, so one execute() never replaces another pending result set.
+
+        Use transaction() to write and reader() to read; a writer cursor handed out outside a block
+        would let its statements join another thread's transaction.
 
         Returns:
-            sqlcipher3.Cursor: The database cursor.
+            sqlcipher3.Cursor: A database cursor.
 
         Raises:
-            Exception: If the cursor is not initialized (i.e., the database connection was not opened).
+            Exception: If the database connection was not opened, or the calling thread is not inside transaction().
         """
-        if self.__cursor is None:
+        if self.__conn is None:
             raise Exception("Cursor is not initialized. Ensure the Database connection is opened first.")
-        return self.__cursor  # Return the cursor for executing queries
+        if not self._holds_write_lock():
+            raise Exception("The writer connection is only available inside Database.transaction(); use reader() to read.")
+        return self.__conn.cursor()  # Return a fresh cursor for executing queries
+
+    def _holds_write_lock(self):
+        """Returns True if the calling thread is inside a transaction() block."""
+        return self._write_owner == threading.get_ident()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs a block of writes on the writer connection as one unit of work. Yields a cursor,
+        commits once when the outermost block exits and rolls back if it raises.
+
+        Blocks may be nested: an inner block runs inside a savepoint, so its failure only undoes
+        its own statements when the caller catches the error. commit_db() does nothing inside
+        a block, so backend methods that commit on their own can be grouped under one commit.
+        The lock serializes writers across threads.
+
+        Usage:
+            with db.transaction() as cursor:
+                cursor.execute(...)
+        """
+        with self._write_lock:
+            if self._write_depth == 0:
+                self._write_owner = threading.get_ident()
+            cursor = self.__conn.cursor()
+            savepoint = f"sp_{self._write_depth}" if self._write_depth else None
+            if savepoint:
+                cursor.execute(f"SAVEPOINT {savepoint}")
+            else:
+                cursor.execute("BEGIN")  # Fails loudly if a write ever left a transaction open outside a block
+            self._write_depth += 1
+            try:
+                yield cursor
+            except BaseException:
+                if savepoint:
+                    cursor.execute(f"ROLLBACK TO {savepoint}")
+                    cursor.execute(f"RELEASE {savepoint}")
+                else:
+                    self.__conn.rollback()
+                raise
+            else:
+                if savepoint:
+                    cursor.execute(f"RELEASE {savepoint}")
+                else:
+                    self.__conn.commit()
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    self._write_owner = None
+                cursor.close()
+
+    @contextmanager
+    def reader(self):
+        """
+        Yields a cursor on the calling thread's reader connection, opening it on first use.
+
+        Inside a transaction() block the cursor comes from the writer instead, so the block sees
+        its own pending writes. Other threads keep reading committed data from their own connection.
+
+        Usage:
+            with db.reader() as cursor:
+                cursor.execute(...)
+        """
+        if self.__conn is None:
+            raise Exception("Database connection not established. Ensure the Database connection is opened first.")
+        if self._holds_write_lock():
+            cursor = self.__conn.cursor()
+        else:
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._connect(read_only=True)
+                self._local.conn = conn
+                with self._readers_lock:
+                    self._readers.append(conn)
+            cursor = conn.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    def close_reader(self):
+        """
+        Closes the calling thread's reader connection, if it has one. Long-lived worker threads call
+        this when they finish, so their connection does not stay open until close_db.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._readers_lock:
+            if conn in self._readers:
+                self._readers.remove(conn)
+        conn.close()
 
     def commit_db(self):
         """
         Commits any changes made to the database using the current connection.
 
         This method is used to save changes (e.g., inserts, updates, deletes) to the database.
+        Inside a transaction() block it does nothing; the block commits when it exits.
 
         Raises:
             Exception: If the database connection is not open.
         """
         if self.__conn:
-            self.__conn.commit()  # Commit changes to the database
+            with self._write_lock:
+                if self._write_depth == 0:
+                    self.__conn.commit()  # Commit changes to the database
         else:
             raise Exception("Database connection not established. Cannot commit changes.")
 
     def close_db(self):
         """
-        Closes the database connection and cursor, cleaning up resources.
-
-        This method ensures that the connection is properly closed and the cursor is discarded.
+        Closes the writer connection and every reader connection, cleaning up resources.
 
         Uses a lock to prevent race conditions when closing the connection.
         """
-        with self._lock:  # Ensure thread-safety when closing the connection
+        with self._lock, self._write_lock:  # Ensure thread-safety, and wait for a running transaction() block
             if self.__conn is not None:
                 # Commit any outstanding changes before closing the connection
                 self.__conn.commit()
                 self.__conn.close()  # Close the connection
                 self.__conn = None  # Reset the connection attribute
-                self.__cursor = None  # Reset the cursor attribute
+                with self._readers_lock:
+                    for conn in self._readers:
+                        conn.close()
+                    self._readers.clear()
+                self._local = threading.local()  # Threads reopen their reader on next use
                 print("Database connection closed.")
             else:
                 print("Database connection already closed.")  # Inform if the connection was already closed
@@ -0,0 +1,43 @@
+from datetime import date, datetime
+
+# Formats found in transaction_date before dates were normalised by migration 6, tried after ISO-8601
+LEGACY_DATE_FORMATS = ("%Y/%m/%d", "%m/%d/%Y", "%m-%d-%Y", "%B %d, %Y")
+
+
+def to_iso_date(value):
+    """
+    Return value as the canonical "YYYY-MM-DD" string that transaction_date stores.
+
+    "YYYY-MM-DD" sorts in date order, so the transaction_date indexes answer range queries and
+    "YYYY-MM" prefixes (substr(transaction_date, 1, 7)) name a month; pages compare these strings
+    instead of parsing them.
+
+    Arguments:
+        value (date, datetime or str): e.g. date(2025, 4, 14), "2025-04-14 13:22:32" or "04/14/2025".
+            A time part is dropped.
+
+    Raises:
+        ValueError: If value is not a recognisable date.
+    """
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid date: {value!r}")
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value).date().isoformat()
+    except ValueError:
+        pass
+    for fmt in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value!r}")
+
+
+def iso_today():
+    """Today's local date as "YYYY-MM-DD", to compare against transaction_date."""
+    return date.today().isoformat()
@@ -0,0 +1,124 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+_CENT = Decimal("0.01")
+
+
+class Money(int):
+    """
+    An amount of money held as a whole number of cents, the way amounts are stored in the database.
+
+    Money is an int, so amounts add up exactly in Python and SQLite can SUM them without rounding
+    drift. Adding or subtracting Money or an int number of cents gives Money, and so does multiplying
+    by an int or floor-dividing by one. Dividing Money by Money gives the float ratio (use it for
+    percentages). Float operands are rejected with TypeError rather than mixed in as cents: convert
+    dollars with Money.from_dollars first. (A float on the left, as in 0.25 + money, is handled by float
+    itself and cannot be caught here.)
+
+    Amounts print and format as dollars, so existing formatting keeps working:
+    str(Money(123456)) is "1234.56" and f"${Money(123456):,.2f}" is "$1,234.56".
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dollars(cls, value):
+        """
+        Convert a dollar amount to Money, rounding half a cent away from zero.
+
+        Arguments:
+            value (str, float, int or Decimal): e.g. "1,234.56", "$12", 12.5 or Money (returned as is).
+
+        Raises:
+            ValueError: If value is not a number.
+        """
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, str):
+            value = value.strip().replace(",", "").replace("$", "")
+        try:
+            dollars = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+            return cls(int((dollars.quantize(_CENT, rounding=ROUND_HALF_UP) * 100).to_integral_value()))
+        except (InvalidOperation, TypeError, ValueError):
+            raise ValueError(f"Invalid amount: {value!r}") from None
+
+    @property
+    def dollars(self):
+        """The amount in dollars as a float, for charts."""
+        return int(self) / 100
+
+    def __str__(self):
+        return format(self, ".2f")
+
+    def __repr__(self):
+        return f"Money({int(self)})"
+
+    def __format__(self, format_spec):
+        return format(Decimal(int(self)).scaleb(-2), format_spec or ".2f")
+
+    def __add__(self, other):
+        return Money(int(self) + _cents_operand(other, "+")) if isinstance(other, int) else _reject(other, "+")
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Money(int(self) - _cents_operand(other, "-")) if isinstance(other, int) else _reject(other, "-")
+
+    def __rsub__(self, other):
+        return Money(_cents_operand(other, "-") - int(self)) if isinstance(other, int) else _reject(other, "-")
+
+    def __mul__(self, other):
+        if isinstance(other, int) and not isinstance(other, Money):
+            return Money(int(self) * other)
+        if isinstance(other, Money):
+            raise TypeError("cannot multiply Money by Money")
+        return _reject(other, "*")
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Money):
+            return int(self) / int(other)
+        if isinstance(other, (int, float, Decimal)):
+            raise TypeError("Money can only be divided by Money (giving a ratio); use // to split an amount into whole cents")
+        return NotImplemented
+
+    def __floordiv__(self, other):
+        if isinstance(other, Money):
+            return int(self) // int(other)
+        return Money(int(self) // _cents_operand(other, "//")) if isinstance(other, int) else _reject(other, "//")
+
+    def __rtruediv__(self, other):
+        if isinstance(other, (int, float, Decimal)):
+            raise TypeError(f"cannot divide {type(other).__name__} by Money")
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-int(self))
+
+    def __abs__(self):
+        return Money(abs(int(self)))
+
+
+def _cents_operand(other, operator):
+    """Return an int operand as cents (or a count). bool is an int too, but never an amount."""
+    if isinstance(other, bool):
+        raise TypeError(f"unsupported operand for Money {operator}: bool")
+    return int(other)
+
+
+def _reject(other, operator):
+    """Refuse float and Decimal operands, which would otherwise be read as cents; defer anything else."""
+    if isinstance(other, (float, Decimal)):
+        raise TypeError(f"unsupported operand for Money {operator}: {type(other).__name__} "
+                        "(convert dollars with Money.from_dollars first)")
+    return NotImplemented
+
+
+def to_money(value):
+    """Return value as Money: None stays None, Money is kept and anything else is read as dollars."""
+    return None if value is None else Money.from_dollars(value)
+
+
+def from_cents(value):
+    """Wrap a cents value read from the database (None stays None)."""
+    return None if value is None else Money(value)
@@ -0,0 +1,338 @@
+"""
+Binary format for the report snapshots stored in reports.report_data.
+
+A report is a list of accounts, each {"account_name", "balance", "transactions": [{"transaction_id",
+"description", "amount", "date"}, ...]}, with amounts and balances as money.Money (integer cents, like
+the live tables). Written as JSON, every key name and every repeated date or description is stored
+again for each transaction. Snapshots store the same data column by column:
+
+    b"BWR" | version | kind | chain depth | parent report_id | zlib( header | string table | columns )
+
+    header               <3sBBHI  magic, version, kind (0 full, 1 delta), depth, parent report_id
+    payload header       <IIIII   string count, account count, row count, removed count, string table bytes
+    string table         every distinct string, as a UTF-8 JSON array (decoded in one C call)
+    account columns      name (uint32 string index), balance (int64 cents), row count (uint32), removed count (uint32)
+    row columns          transaction_id (int64), description (uint32 string index), amount (int64 cents),
+                         date (uint32 string index)
+    removed column       transaction_id (int64)
+
+A full snapshot (a checkpoint) lists every transaction of every account and has no removed IDs. A delta
+stores only the transactions added or changed since its parent report and the IDs of those that
+disappeared; the account columns always list every account, so balances and account order are exact.
+Strings are stored once and referenced by index. Numbers are little-endian. None amounts and balances
+are stored as the smallest int64 and None strings as index 0xFFFFFFFF.
+
+Rows written as JSON text before snapshots existed are still decoded, with their dollar amounts
+converted to Money, but never serve as the parent of a delta.
+"""
+import json
+import struct
+import sys
+import zlib
+from array import array
+from collections import namedtuple
+
+from src.backend.database_interation.money import Money
+
+SNAPSHOT_MAGIC = b"BWR"
+SNAPSHOT_VERSION = 1
+
+FULL_SNAPSHOT = 0
+DELTA_SNAPSHOT = 1
+
+SnapshotHeader = namedtuple("SnapshotHeader", "version kind depth parent_id")
+
+_SNAPSHOT_HEADER = struct.Struct("<3sBBHI")
+SNAPSHOT_HEADER_SIZE = _SNAPSHOT_HEADER.size
+_PAYLOAD_HEADER = struct.Struct("<IIIII")
+_NO_STRING = 0xFFFFFFFF
+_NO_AMOUNT = -(2 ** 63)
+
+
+def _column(typecode, values):
+    """Pack values into little-endian bytes."""
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_column(typecode, payload, offset, count):
+    """Unpack count values from payload at offset. Returns (values, new offset)."""
+    column = array(typecode)
+    end = offset + count * column.itemsize
+    column.frombytes(payload[offset:end])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column, end
+
+
+def _cents(value):
+    """Pack a Money amount or balance. Anything but whole cents is refused rather than truncated."""
+    if value is None:
+        return _NO_AMOUNT
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f"report amounts must be Money (integer cents), not {type(value).__name__}")
+    return value
+
+
+def _money_column(column):
+    """Turn a balance or amount column of cents into a list of Money, with None for missing values."""
+    values = column.tolist()
+    if _NO_AMOUNT not in values:
+        return list(map(Money, values))
+    return [None if value == _NO_AMOUNT else Money(value) for value in values]
+
+
+def _dollars_to_money(value):
+    """Convert a dollar amount from a legacy JSON report to Money (None stays None)."""
+    return None if value is None else Money(round(float(value) * 100))
+
+
+def _read_strings(payload, offset, string_bytes, string_count):
+    """Decode the JSON string table. Returns (index -> string lookup, new offset)."""
+    end = offset + string_bytes
+    strings = dict(enumerate(json.loads(payload[offset:end].decode("utf-8"))))
+    if len(strings) != string_count:
+        raise ValueError("Corrupt report snapshot: string table size does not match its header")
+    strings[_NO_STRING] = None
+    return strings.__getitem__, end
+
+
+def _build_rows(ids, descriptions, amounts, dates, lookup):
+    """
+    Turn row columns into transaction dictionaries. Whole columns are resolved at once, because
+    map() with a bound lookup runs in C rather than per-row Python code. amounts is already a list of Money.
+    """
+    descriptions = list(map(lookup, descriptions))
+    dates = list(map(lookup, dates))
+    return [
+        {"transaction_id": transaction_id, "description": description, "amount": amount, "date": date}
+        for transaction_id, description, amount, date in zip(ids.tolist(), descriptions, amounts, dates)
+    ]
+
+
+def is_snapshot(report_data):
+    """True if report_data holds the binary snapshot format rather than legacy JSON."""
+    return isinstance(report_data, (bytes, bytearray, memoryview)) and bytes(report_data[:3]) == SNAPSHOT_MAGIC
+
+
+def read_header(report_data):
+    """
+    Read the snapshot header from the first SNAPSHOT_HEADER_SIZE bytes of report_data.
+
+    Returns:
+        SnapshotHeader or None: None for legacy JSON rows.
+    """
+    if not is_snapshot(report_data):
+        return None
+    _, version, kind, depth, parent_id = _SNAPSHOT_HEADER.unpack_from(bytes(report_data[:SNAPSHOT_HEADER_SIZE]))
+    return SnapshotHeader(version, kind, depth, parent_id if kind == DELTA_SNAPSHOT else None)
+
+
+def _encode(kind, depth, parent_id, accounts, rows, removed):
+    """Pack a snapshot. accounts is a list of (name, balance, row count, removed count)."""
+    # None maps to _NO_STRING, so every other string's index is its position among the keys minus one
+    positions = {None: _NO_STRING}
+    setdefault = positions.setdefault
+
+    def index(column):
+        return [setdefault(text, len(positions) - 1) for text in column]
+
+    names = index([account[0] for account in accounts])
+    descriptions = index([row.get("description") for row in rows])
+    dates = index([row.get("date") for row in rows])
+    strings = list(positions)[1:]
+    string_table = json.dumps(strings, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    payload = b"".join([
+        _PAYLOAD_HEADER.pack(len(strings), len(accounts), len(rows), len(removed), len(string_table)),
+        string_table,
+        _column("I", names),
+        _column("q", [_cents(account[1]) for account in accounts]),
+        _column("I", [account[2] for account in accounts]),
+        _column("I", [account[3] for account in accounts]),
+        _column("q", [row["transaction_id"] for row in rows]),
+        _column("I", descriptions),
+        _column("q", [_cents(row.get("amount")) for row in rows]),
+        _column("I", dates),
+        _column("q", removed),
+    ])
+    header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, kind, depth, parent_id or 0)
+    return header + zlib.compress(payload)
+
+
+def encode_report(accounts):
+    """
+    Encode a report (the list of account dictionaries built by Accounts.store_report) as a full snapshot.
+    Every transaction needs a transaction_id.
+
+    Returns:
+        bytes: The snapshot, ready to store in reports.report_data.
+    """
+    rows = [transaction for account in accounts for transaction in account.get("transactions", [])]
+    columns = [
+        (account.get("account_name"), account.get("balance"), len(account.get("transactions", [])), 0)
+        for account in accounts
+    ]
+    return _encode(FULL_SNAPSHOT, 0, None, columns, rows, [])
+
+
+def diff_reports(parent_accounts, accounts, max_changed_ratio=0.5):
+    """
+    Compare a report with its parent, matching accounts by name and transactions by transaction_id.
+
+    Returns:
+        dict or None: {"accounts": [{"account_name", "balance", "changed": [...], "removed": [...]}, ...]}
+        in the report's account order, or None when a delta is not worthwhile: a transaction has no ID,
+        or more than max_changed_ratio of the report's transactions changed.
+    """
+    previous = {
+        account.get("account_name"): {t.get("transaction_id"): t for t in account.get("transactions", [])}
+        for account in parent_accounts
+    }
+    total = changed_count = 0
+    delta = []
+    for account in accounts:
+        before = previous.get(account.get("account_name"), {})
+        transactions = account.get("transactions", [])
+        current_ids = set()
+        changed = []
+        for transaction in transactions:
+            transaction_id = transaction.get("transaction_id")
+            if transaction_id is None:
+                return None
+            current_ids.add(transaction_id)
+            old = before.get(transaction_id)
+            if old is None or (old.get("description"), old.get("amount"), old.get("date")) != (
+                    transaction.get("description"), transaction.get("amount"), transaction.get("date")):
+                changed.append(transaction)
+        removed = [transaction_id for transaction_id in before if transaction_id not in current_ids]
+        total += len(transactions)
+        changed_count += len(changed) + len(removed)
+        delta.append({"account_name": account.get("account_name"), "balance": account.get("balance"),
+                      "changed": changed, "removed": removed})
+    if changed_count > max_changed_ratio * max(total, 1):
+        return None
+    return {"accounts": delta}
+
+
+def encode_delta(parent_id, depth, delta):
+    """
+    Encode a delta produced by diff_reports.
+
+    Arguments:
+        parent_id (int): report_id of the report the delta applies to.
+        depth (int): Number of deltas between this report and its checkpoint, this one included.
+    """
+    rows = [transaction for account in delta["accounts"] for transaction in account["changed"]]
+    removed = [transaction_id for account in delta["accounts"] for transaction_id in account["removed"]]
+    columns = [
+        (account["account_name"], account["balance"], len(account["changed"]), len(account["removed"]))
+        for account in delta["accounts"]
+    ]
+    return _encode(DELTA_SNAPSHOT, depth, parent_id, columns, rows, removed)
+
+
+def apply_delta(parent_accounts, delta):
+    """
+    Rebuild a report from its parent's accounts and a decoded delta. The parent is not modified.
+    Transactions are ordered by date and transaction_id, the order Accounts.store_report writes them in.
+    """
+    previous = {
+        account.get("account_name"): {t.get("transaction_id"): t for t in account.get("transactions", [])}
+        for account in parent_accounts
+    }
+    accounts = []
+    for account in delta["accounts"]:
+        transactions = dict(previous.get(account["account_name"], {}))
+        for transaction_id in account["removed"]:
+            transactions.pop(transaction_id, None)
+        for transaction in account["changed"]:
+            transactions[transaction["transaction_id"]] = transaction
+        accounts.append({
+            "account_name": account["account_name"],
+            "balance": account["balance"],
+            "transactions": sorted(transactions.values(), key=lambda t: (str(t.get("date")), t.get("transaction_id"))),
+        })
+    return accounts
+
+
+def decode_snapshot(report_data):
+    """
+    Decode reports.report_data without resolving deltas.
+
+    Returns:
+        tuple: (SnapshotHeader or None, data). For full snapshots and legacy JSON, data is the list of
+        account dictionaries. For deltas it is {"accounts": [...]} as produced by diff_reports; pass it
+        to apply_delta together with the parent report's accounts.
+
+    Raises:
+        ValueError: If the data is neither a supported snapshot version nor valid JSON.
+    """
+    header = read_header(report_data)
+    if header is None:
+        if isinstance(report_data, (bytes, bytearray, memoryview)):
+            report_data = bytes(report_data).decode("utf-8")
+        return None, _legacy_json_to_money(json.loads(report_data))
+    if header.version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported report snapshot version {header.version}")
+
+    try:
+        payload = zlib.decompress(bytes(report_data)[SNAPSHOT_HEADER_SIZE:])
+    except zlib.error as e:
+        raise ValueError(f"Corrupt report snapshot: {e}") from e
+
+    string_count, account_count, row_count, removed_count, string_bytes = _PAYLOAD_HEADER.unpack_from(payload)
+    lookup, offset = _read_strings(payload, _PAYLOAD_HEADER.size, string_bytes, string_count)
+    names, offset = _read_column("I", payload, offset, account_count)
+    balances, offset = _read_column("q", payload, offset, account_count)
+    row_counts, offset = _read_column("I", payload, offset, account_count)
+    removed_counts, offset = _read_column("I", payload, offset, account_count)
+    ids, offset = _read_column("q", payload, offset, row_count)
+    descriptions, offset = _read_column("I", payload, offset, row_count)
+    amounts, offset = _read_column("q", payload, offset, row_count)
+    dates, offset = _read_column("I", payload, offset, row_count)
+    removed, offset = _read_column("q", payload, offset, removed_count)
+    rows = _build_rows(ids, descriptions, _money_column(amounts), dates, lookup)
+    removed = removed.tolist()
+
+    accounts = []
+    position = removed_position = 0
+    for name, balance, count, removed_count in zip(names, _money_column(balances), row_counts, removed_counts):
+        account = {"account_name": lookup(name), "balance": balance}
+        if header.kind == DELTA_SNAPSHOT:
+            account["changed"] = rows[position:position + count]
+            account["removed"] = removed[removed_position:removed_position + removed_count]
+        else:
+            account["transactions"] = rows[position:position + count]
+        accounts.append(account)
+        position += count
+        removed_position += removed_count
+    return header, ({"accounts": accounts} if header.kind == DELTA_SNAPSHOT else accounts)
+
+
+def _legacy_json_to_money(data):
+    """Convert the dollar balances and amounts of a report stored as JSON to Money, in place."""
+    for account in data if isinstance(data, list) else [data]:
+        if isinstance(account, dict):
+            if "balance" in account:
+                account["balance"] = _dollars_to_money(account["balance"])
+            for transaction in account.get("transactions", []):
+                if "amount" in transaction:
+                    transaction["amount"] = _dollars_to_money(transaction["amount"])
+    return data
+
+
+def decode_report(report_data):
+    """
+    Decode a full snapshot or legacy JSON row into the list of account dictionaries.
+
+    Raises:
+        ValueError: If the data is a delta (use ReportStore.reconstruct_report), an unsupported
+            snapshot version, or invalid JSON.
+    """
+    header, data = decode_snapshot(report_data)
+    if header is not None and header.kind == DELTA_SNAPSHOT:
+        raise ValueError("Report snapshot is a delta; it needs its parent report to be decoded")
+    return data
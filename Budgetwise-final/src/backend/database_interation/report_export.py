@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+# Transactions per table. ReportLab re-measures a table every time it splits it across a page, so one
+# table per account made long months quadratic; fixed-size tables split in constant time.
+ROWS_PER_TABLE = 50
+
+TRANSACTION_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+
+class ExportCancelled(Exception):
+    """Raised inside a PDF export when its cancel event is set."""
+
+
+class _FlowableStream(list):
+    """
+    A story for SimpleDocTemplate.build that refills itself from a generator as the build consumes it.
+
+    build() loops while len(story) is non-zero and takes flowables from the front, so topping the list
+    up in __len__ keeps only a handful of flowables alive at once. Each page is laid out and written
+    to the canvas as soon as its flowables arrive, instead of after the whole story was built.
+    """
+
+    def __init__(self, flowables, low_water=8):
+        super().__init__()
+        self._source = iter(flowables)
+        self._low_water = low_water
+
+    def __len__(self):
+        while list.__len__(self) < self._low_water:
+            flowable = next(self._source, None)
+            if flowable is None:
+                break
+            self.append(flowable)
+        return list.__len__(self)
+
+
+def account_flowables(account, styles):
+    """Yield the header and transaction tables of one account of a report."""
+    account_name = account.get("account_name", "Unnamed Account")
+    balance = account.get("balance", 0)
+    transactions = account.get("transactions", [])
+    total_txn = sum(txn.get("amount", 0) for txn in transactions)
+    remaining = balance - total_txn
+
+    yield Paragraph(
+        f"<b>Account:</b> {escape(str(account_name))}&nbsp;&nbsp;&nbsp; "
+        f"<b>Balance:</b> ${balance:.2f}&nbsp;&nbsp;&nbsp; "
+        f"<b>Remaining:</b> ${remaining:.2f}",
+        styles["Heading3"]
+    )
+    yield Spacer(1, 6)
+
+    header = ["Description", "Amount", "Date"]
+    for start in range(0, max(len(transactions), 1), ROWS_PER_TABLE):
+        table_data = [header]
+        for txn in transactions[start:start + ROWS_PER_TABLE]:
+            desc = txn.get("description") or ""
+            amount = txn.get("amount", 0)
+            date = (txn.get("date") or "").split()[0]  # Removing time if present.
+            table_data.append([desc, f"${amount:.2f}", date])
+        table = Table(table_data, colWidths=[200, 100, 100], repeatRows=1)
+        table.setStyle(TRANSACTION_TABLE_STYLE)
+        yield table
+    yield Spacer(1, 12)
+
+
+class ReportPdfExporter:
+    """
+    Renders stored reports to PDF off the UI thread.
+
+    render() writes one or more reports into a single PDF, streaming the story into ReportLab so memory
+    stays bounded by a few pages rather than growing with the number of transactions: a year of reports
+    is decoded one report at a time and its flowables are created only as the pages reach them.
+    start() runs render() in a worker thread with progress and cancellation callbacks for the UI.
+
+    The PDF is written to "<file_path>.part" and renamed when complete, so a cancelled or failed
+    export never leaves a truncated file behind.
+    """
+
+    def __init__(self, report_store):
+        """
+        Args:
+            report_store (ReportStore): Where the reports are read from.
+        """
+        self.report_store = report_store
+
+    def render(self, file_path, report_ids, title="Monthly Report", progress=None, cancel_event=None):
+        """
+        Write the given reports, in order, into one PDF at file_path. Each report starts on a new page.
+
+        Args:
+            file_path (str): Where to save the PDF.
+            report_ids (list of int): The reports to include.
+            title (str): Heading of each report. With several reports the report's date is appended.
+            progress (callable, optional): Called as progress(fraction, message) while rendering.
+            cancel_event (threading.Event, optional): Set it to stop the export.
+
+        Returns:
+            int: The number of pages written.
+
+        Raises:
+            ExportCancelled: If cancel_event was set before the export finished.
+            ValueError: If none of the reports could be read.
+        """
+        styles = getSampleStyleSheet()
+        total = len(report_ids)
+        pages = [0]
+        rendered = [0]
+
+        def check_cancelled():
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+
+        def count_page(canvas, doc):
+            pages[0] += 1
+
+        def story():
+            for index, report_id in enumerate(report_ids):
+                check_cancelled()
+                report = self.report_store.get_report(report_id)
+                if report is None or report["report_data"] is None:
+                    print(f"[render] Skipping report {report_id}: it could not be read")
+                    continue
+                accounts = report["report_data"]
+                if not isinstance(accounts, list):
+                    accounts = [accounts]
+
+                if rendered[0]:
+                    yield PageBreak()
+                heading = title
+                if total > 1 and hasattr(report["report_date"], "strftime"):
+                    heading = f"{title} - {report['report_date'].strftime('%B %d, %Y')}"
+                yield Paragraph(escape(heading), styles["Title"])
+                yield Spacer(1, 12)
+                rendered[0] += 1
+
+                for done, account in enumerate(accounts, start=1):
+                    for flowable in account_flowables(account, styles):
+                        check_cancelled()
+                        yield flowable
+                    if progress:
+                        progress((index + done / max(len(accounts), 1)) / total,
+                                 f"Report {index + 1} of {total}")
+                if progress and not accounts:
+                    progress((index + 1) / total, f"Report {index + 1} of {total}")
+
+        partial_path = f"{file_path}.part"
+        doc = SimpleDocTemplate(partial_path, pagesize=letter, pageCompression=1)
+        try:
+            doc.build(_FlowableStream(story()), onFirstPage=count_page, onLaterPages=count_page)
+            if not rendered[0]:
+                raise ValueError("none of the selected reports could be read")
+            os.replace(partial_path, file_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        return pages[0]
+
+    def start(self, file_path, report_ids, title="Monthly Report", on_progress=None, on_done=None):
+        """
+        Run render() in a daemon thread, which closes its reader connection (see Database.reader) when it ends.
+
+        Args:
+            on_progress (callable, optional): progress(fraction, message), called from the worker thread.
+            on_done (callable, optional): Called from the worker thread with a dict:
+                {"status": "done" | "cancelled" | "failed", "path", "pages", "seconds", "error"}.
+
+        Returns:
+            threading.Event: Set it to cancel the export.
+        """
+        cancel_event = threading.Event()
+
+        def work():
+            try:
+                began = time.perf_counter()
+                result = {"status": "done", "path": file_path, "pages": 0, "seconds": 0.0, "error": None}
+                try:
+                    result["pages"] = self.render(file_path, report_ids, title, on_progress, cancel_event)
+                    print(f"PDF report generated and saved as {file_path}")
+                except ExportCancelled:
+                    result["status"] = "cancelled"
+                except Exception as e:
+                    print(f"An error occurred while generating the PDF report: {e}")
+                    result["status"] = "failed"
+                    result["error"] = str(e)
+                result["seconds"] = time.perf_counter() - began
+                if on_done:
+                    on_done(result)
+            finally:
+                # get_report opened a reader connection for this thread; it ends with the export
+                self.report_store.db.close_reader()
+
+        threading.Thread(target=work, name="ReportPdfExport", daemon=True).start()
+        return cancel_event
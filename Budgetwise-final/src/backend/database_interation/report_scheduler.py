@@ -0,0 +1,298 @@
+import queue
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import sqlcipher3
+
+from src.backend.database_interation.money import from_cents
+from src.backend.database_interation.report_store import ReportStore
+
+# report_type values. 1 is the snapshot stored from the Accounts page; the scheduled reports get their own
+# types so a snapshot taken mid-month never counts as that month's report, and each type keeps its own delta chain.
+REPORT_ACCOUNTS = 1
+REPORT_WEEKLY = 2
+REPORT_MONTHLY = 3
+REPORT_YEARLY = 4
+
+REPORT_NAMES = {REPORT_WEEKLY: "weekly", REPORT_MONTHLY: "monthly", REPORT_YEARLY: "yearly"}
+
+
+def period_start(report_type, day):
+    """Return the first day of the week (Monday), month or year containing day."""
+    if report_type == REPORT_WEEKLY:
+        return day - timedelta(days=day.weekday())
+    if report_type == REPORT_MONTHLY:
+        return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+
+def next_period(report_type, start):
+    """Return the first day of the period after the one starting on start."""
+    if report_type == REPORT_WEEKLY:
+        return start + timedelta(days=7)
+    if report_type == REPORT_MONTHLY:
+        return date(start.year + 1, 1, 1) if start.month == 12 else date(start.year, start.month + 1, 1)
+    return date(start.year + 1, 1, 1)
+
+
+def due_periods(report_type, last_report_day, first_activity_day, today, max_catch_up):
+    """
+    List the start days of the completed periods that still need a report, oldest first.
+
+    Periods are due from the one after the last stored report, or from the user's first transaction
+    when there is no report yet, up to the last period that ended before today. At most the
+    max_catch_up most recent periods are returned, so a long absence does not queue years of weekly reports.
+    """
+    if last_report_day is not None:
+        start = next_period(report_type, period_start(report_type, last_report_day))
+    elif first_activity_day is not None:
+        start = period_start(report_type, first_activity_day)
+    else:
+        return []
+    current = period_start(report_type, today)
+    periods = []
+    while start < current:
+        periods.append(start)
+        start = next_period(report_type, start)
+    return periods[-max_catch_up:] if max_catch_up else []
+
+
+def _parse_day(value):
+    """Read the date part of a stored "YYYY-MM-DD[ HH:MM:SS]" value, or None."""
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+class ReportScheduler:
+    """
+    Generates the weekly, monthly and yearly reports users enabled with the weekly_reports,
+    monthly_reports and yearly_reports columns, in a background thread.
+
+    The worker thread plans the reports that are due, queues one job per report and works through
+    the queue. Its queries, including the diff against the previous report, run on the worker's own
+    reader connection from the Database pool, which it closes when it stops. The writer is only taken
+    by ReportStore.save_report, for one short transaction per report, so the worker never sees or
+    commits the UI thread's writes.
+    The first pass waits startup_delay seconds and then catches up on every period missed while the
+    app was closed, so the first paint of /login or /dashboard never waits on report generation.
+    After that the worker checks again every interval seconds, or as soon as check_now() is called.
+
+    Each report holds every account with the transactions of its period, in the same shape as the
+    report stored from the Accounts page, and is dated the last second of its period so the History
+    page lists it under the month it covers.
+
+    Instrumentation: every job prints its duration and the queue depth left behind it, and get_stats()
+    returns the totals (jobs run and failed, last/average/max job duration, current and peak queue depth).
+    """
+
+    def __init__(self, db_instance, report_store=None, interval=3600, startup_delay=2.0, max_catch_up=52, job_pause=0.05):
+        """
+        Args:
+            db_instance (Database): An instance of the Database class (singleton).
+            report_store (ReportStore, optional): Where reports are saved. Defaults to a store of its own,
+                so the worker's decoded reports do not crowd the UI's cache.
+            interval (float): Seconds between two checks for due reports.
+            startup_delay (float): Seconds to wait before the first check.
+            max_catch_up (int): Most periods of one report type generated for one user in one pass.
+            job_pause (float): Seconds the worker sleeps between two jobs, leaving the UI thread the
+                interpreter while a long catch-up runs.
+        """
+        self.db = db_instance
+        self.report_store = report_store if report_store is not None else ReportStore(db_instance)
+        self.interval = interval
+        self.startup_delay = startup_delay
+        self.max_catch_up = max_catch_up
+        self.job_pause = job_pause
+        self.jobs = queue.Queue()
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "jobs_run": 0,
+            "jobs_failed": 0,
+            "last_job_ms": None,
+            "total_job_ms": 0.0,
+            "max_job_ms": 0.0,
+            "max_queue_depth": 0,
+        }
+
+    def start(self):
+        """Start the worker thread. Does nothing if it is already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ReportScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Ask the worker to stop after its current job and wait up to timeout seconds for it."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def check_now(self):
+        """Wake the worker to check for due reports, e.g. after a user changed their report settings."""
+        self._wake.set()
+
+    def run_pending(self):
+        """
+        Plan and generate every due report on the calling thread, then return. The worker thread
+        calls this on each check; it is public so scripts can run a catch-up synchronously.
+
+        Returns:
+            int: The number of reports generated.
+        """
+        self.enqueue_due()
+        return self.drain()
+
+    def _run(self):
+        if self._stop.wait(self.startup_delay):
+            return
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.run_pending()
+                except Exception as e:
+                    print(f"[ReportScheduler] Error while generating reports: {e}")
+                self._wake.wait(self.interval)
+                self._wake.clear()
+        finally:
+            self.db.close_reader()
+
+    def enqueue_due(self):
+        """
+        Queue one job per due report for every user with a report type enabled.
+
+        Returns:
+            int: The number of jobs queued.
+        """
+        try:
+            with self.db.reader() as cursor:
+                users = cursor.execute(
+                    """SELECT user_id, weekly_reports, monthly_reports, yearly_reports FROM users
+                       WHERE weekly_reports != 0 OR monthly_reports != 0 OR yearly_reports != 0"""
+                ).fetchall()
+                plans = []
+                for user_id, weekly, monthly, yearly in users:
+                    enabled = [report_type for report_type, flag in
+                               ((REPORT_WEEKLY, weekly), (REPORT_MONTHLY, monthly), (REPORT_YEARLY, yearly)) if flag]
+                    last_reports = dict(cursor.execute(
+                        """SELECT report_type, max(report_date) FROM reports
+                           WHERE user_id = ? AND report_type IN (?, ?, ?) GROUP BY report_type""",
+                        (user_id, REPORT_WEEKLY, REPORT_MONTHLY, REPORT_YEARLY),
+                    ).fetchall())
+                    first_activity = cursor.execute(
+                        "SELECT min(transaction_date) FROM transactions WHERE user_id = ?", (user_id,)
+                    ).fetchone()[0]
+                    plans.append((user_id, enabled, last_reports, first_activity))
+        except sqlcipher3.Error as e:
+            print(f"[ReportScheduler] SQLCipher Error while planning reports: {e}")
+            return 0
+
+        today = date.today()
+        queued = 0
+        for user_id, enabled, last_reports, first_activity in plans:
+            for report_type in enabled:
+                for start in due_periods(report_type, _parse_day(last_reports.get(report_type)),
+                                         _parse_day(first_activity), today, self.max_catch_up):
+                    self.jobs.put((user_id, report_type, start))
+                    queued += 1
+        self._record_depth()
+        return queued
+
+    def drain(self):
+        """
+        Generate the queued reports in order, stopping early if the scheduler is stopped.
+
+        Returns:
+            int: The number of reports generated.
+        """
+        generated = 0
+        while not self._stop.is_set():
+            try:
+                user_id, report_type, start = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            began = time.perf_counter()
+            report_id = self.generate_report(user_id, report_type, start)
+            elapsed_ms = (time.perf_counter() - began) * 1000
+            self.jobs.task_done()
+            depth = self.jobs.qsize()
+            with self._stats_lock:
+                if report_id is None:
+                    self._stats["jobs_failed"] += 1
+                else:
+                    self._stats["jobs_run"] += 1
+                    generated += 1
+                self._stats["last_job_ms"] = elapsed_ms
+                self._stats["total_job_ms"] += elapsed_ms
+                self._stats["max_job_ms"] = max(self._stats["max_job_ms"], elapsed_ms)
+            status = "stored" if report_id is not None else "failed"
+            print(f"[ReportScheduler] {REPORT_NAMES[report_type]} report for user {user_id} from {start} "
+                  f"{status} in {elapsed_ms:.1f} ms, queue depth {depth}")
+            if depth:
+                self._stop.wait(self.job_pause)
+        return generated
+
+    def generate_report(self, user_id, report_type, start):
+        """
+        Build and save the report of one period.
+
+        Returns:
+            int or None: The new report_id, or None if reading or saving failed.
+        """
+        end = next_period(report_type, start)
+        try:
+            with self.db.reader() as cursor:
+                accounts = cursor.execute(
+                    """SELECT budget_accounts_id, account_name, total_allocated_amount
+                       FROM budget_accounts WHERE user_id = ? ORDER BY budget_accounts_id""",
+                    (user_id,),
+                ).fetchall()
+                rows = cursor.execute(
+                    """SELECT budget_accounts_id, transaction_id, description, amount, transaction_date
+                       FROM transactions
+                       WHERE user_id = ? AND transaction_date >= ? AND transaction_date < ?
+                         AND transaction_date IS date(transaction_date)
+                       ORDER BY budget_accounts_id, transaction_date, transaction_id""",
+                    (user_id, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")),
+                ).fetchall()
+        except sqlcipher3.Error as e:
+            print(f"[ReportScheduler] SQLCipher Error while reading report data: {e}")
+            return None
+
+        by_account = {}
+        for account_id, transaction_id, description, amount, transaction_date in rows:
+            by_account.setdefault(account_id, []).append(
+                {"transaction_id": transaction_id, "description": description, "amount": from_cents(amount), "date": transaction_date}
+            )
+        report_data = [
+            {"account_name": account_name, "balance": from_cents(balance), "transactions": by_account.get(account_id, [])}
+            for account_id, account_name, balance in accounts
+        ]
+        report_date = (end - timedelta(days=1)).strftime("%Y-%m-%d 23:59:59")
+        return self.report_store.save_report(user_id, report_type, report_data, report_date=report_date)
+
+    def _record_depth(self):
+        depth = self.jobs.qsize()
+        with self._stats_lock:
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: jobs_run, jobs_failed, last_job_ms, average_job_ms, max_job_ms, queue_depth and
+            max_queue_depth since the scheduler was created.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        finished = stats["jobs_run"] + stats["jobs_failed"]
+        stats["average_job_ms"] = stats.pop("total_job_ms") / finished if finished else None
+        stats["queue_depth"] = self.jobs.qsize()
+        return stats
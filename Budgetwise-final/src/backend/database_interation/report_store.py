@@ -0,0 +1,268 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import sqlcipher3
+
+from src.backend.database_interation.money import from_cents
+from src.backend.database_interation.report_codec import (
+    DELTA_SNAPSHOT,
+    SNAPSHOT_HEADER_SIZE,
+    SNAPSHOT_VERSION,
+    apply_delta,
+    decode_snapshot,
+    diff_reports,
+    encode_delta,
+    encode_report,
+    read_header,
+)
+from src.backend.database_interation.report_summary import write_summary
+
+class ReportStore:
+    """
+    Stores reports for the Accounts page and reads them for the History and Reports pages.
+
+    The catalogue query returns only report_id, report_type and report_date, so listing a user's
+    reports no longer pulls every report_data blob into memory. A report's blob is fetched and
+    decoded only when it is opened, and the decoded report is kept in a small LRU cache keyed by
+    report_id. Switching between recently viewed reports then costs a dictionary lookup.
+
+    New reports are written in the compressed snapshot format of report_codec; rows stored as
+    JSON by earlier versions are still read. A new report is stored as a delta against the user's
+    previous report of the same type when few transactions changed, so storing a report costs
+    about as much as the changes since the last one. Every checkpoint_interval reports a full
+    snapshot is written, which bounds how many deltas a read has to apply.
+    Reports in a chain depend on the reports before them, so they must not be deleted one by one.
+
+    Each report's headline figures (period, totals, counts) are written to summary columns of its
+    row and its per-account totals to report_account_totals, so get_catalogue returns them from an
+    index without decoding any report.
+    """
+
+    def __init__(self, db_instance, cache_size=16, checkpoint_interval=10):
+        """
+        Args:
+            db_instance (Database): An instance of the Database class (singleton).
+            cache_size (int): Number of decoded reports kept in memory.
+            checkpoint_interval (int): Reports per chain, the full snapshot included. 1 stores every
+                report in full.
+        """
+        self.db = db_instance
+        self.cache_size = cache_size
+        self.checkpoint_interval = checkpoint_interval
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_catalogue(self, user_id):
+        """
+        List a user's reports without their data, oldest first. Read entirely from the
+        idx_reports_user_catalogue covering index.
+
+        Returns:
+            list of dict: {"report_id", "report_type", "report_date", "period_start", "period_end",
+            "total_allocated", "total_spent", "total_scheduled", "account_count", "transaction_count"}
+            with report_date as stored ("YYYY-MM-DD HH:MM:SS") and the totals as Money. The summary
+            fields are None for a report that could not be summarised.
+        """
+        try:
+            query = """SELECT report_id, report_type, report_date, period_start, period_end, total_allocated,
+                              total_spent, total_scheduled, account_count, transaction_count
+                       FROM reports WHERE user_id = ? ORDER BY report_date, report_id"""
+            with self.db.reader() as cursor:
+                cursor.execute(query, (user_id,))
+                return [
+                    {"report_id": report_id, "report_type": report_type, "report_date": report_date,
+                     "period_start": period_start, "period_end": period_end, "total_allocated": from_cents(allocated),
+                     "total_spent": from_cents(spent), "total_scheduled": from_cents(scheduled),
+                     "account_count": account_count, "transaction_count": transaction_count}
+                    for (report_id, report_type, report_date, period_start, period_end, allocated, spent, scheduled,
+                         account_count, transaction_count) in cursor.fetchall()
+                ]
+        except sqlcipher3.Error as e:
+            print(f"[get_catalogue] SQLCipher Error: {e}")
+            return []
+
+    def save_report(self, user_id, report_type, accounts, report_date=None):
+        """
+        Store a report, as a delta against the user's previous report of the same type when that is
+        worthwhile and as a full snapshot otherwise.
+
+        Args:
+            user_id (int): The owner of the report.
+            report_type (int): The report type (1 for the monthly accounts report).
+            accounts (list of dict): The accounts and their transactions, as built by Accounts.store_report.
+                Every transaction needs its transaction_id.
+            report_date (str, optional): "YYYY-MM-DD HH:MM:SS" to store instead of the current time,
+                for reports generated after the period they cover.
+
+        Returns:
+            int or None: The new report_id, or None if the insert failed.
+        """
+        try:
+            query = """INSERT INTO reports (user_id, report_type, report_date, report_data)
+                       VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)"""
+            # Diff against the previous report on this thread's reader, so the writer is only held for the insert
+            with self.db.reader() as cursor:
+                parent_id, report_data = self.encode_for_chain(cursor, user_id, report_type, accounts)
+            with self.db.transaction() as cursor:
+                if self.checkpoint_interval > 1 and self.latest_report_id(cursor, user_id, report_type) != parent_id:
+                    # Another report of this type was stored in between; encode against that one instead
+                    parent_id, report_data = self.encode_for_chain(cursor, user_id, report_type, accounts)
+                cursor.execute(query, (user_id, report_type, report_date, report_data))
+                report_id = cursor.lastrowid
+                if report_date is None:
+                    report_date = cursor.execute("SELECT report_date FROM reports WHERE report_id = ?", (report_id,)).fetchone()[0]
+                write_summary(cursor, report_id, report_type, report_date, accounts)
+                return report_id
+        except sqlcipher3.Error as e:
+            print(f"[save_report] SQLCipher Error: {e}")
+            return None
+
+    def get_account_totals(self, report_id):
+        """
+        Return a report's per-account figures without decoding the report.
+
+        Returns:
+            list of dict: {"account_name", "balance", "spent", "scheduled", "transaction_count"} in the
+            report's account order, amounts as Money. Empty if the report has no summary.
+        """
+        try:
+            query = """SELECT account_name, balance, spent, scheduled, transaction_count
+                       FROM report_account_totals WHERE report_id = ? ORDER BY position"""
+            with self.db.reader() as cursor:
+                cursor.execute(query, (report_id,))
+                return [
+                    {"account_name": account_name, "balance": from_cents(balance), "spent": from_cents(spent),
+                     "scheduled": from_cents(scheduled), "transaction_count": transaction_count}
+                    for account_name, balance, spent, scheduled, transaction_count in cursor.fetchall()
+                ]
+        except sqlcipher3.Error as e:
+            print(f"[get_account_totals] SQLCipher Error: {e}")
+            return []
+
+    def latest_report_id(self, cursor, user_id, report_type):
+        """Return the report_id of the user's latest report of this type, or None."""
+        return cursor.execute(
+            "SELECT max(report_id) FROM reports WHERE user_id = ? AND report_type = ?", (user_id, report_type)
+        ).fetchone()[0]
+
+    def encode_for_chain(self, cursor, user_id, report_type, accounts):
+        """
+        Encode a new report as a delta against the latest report of the same user and type, or as a
+        full snapshot when there is no usable parent, the chain is due a checkpoint, or too much changed.
+
+        Returns:
+            tuple: (report_id of the latest report the encoding was based on or None, encoded blob)
+        """
+        if self.checkpoint_interval > 1:
+            row = cursor.execute(
+                """SELECT report_id, substr(report_data, 1, ?) FROM reports
+                   WHERE user_id = ? AND report_type = ? ORDER BY report_id DESC LIMIT 1""",
+                (SNAPSHOT_HEADER_SIZE, user_id, report_type),
+            ).fetchone()
+            header = read_header(row[1]) if row else None
+            if header is not None and header.version == SNAPSHOT_VERSION and header.depth + 1 < self.checkpoint_interval:
+                parent = self.get_report(row[0])
+                if parent is not None and parent["report_data"] is not None:
+                    delta = diff_reports(parent["report_data"], accounts)
+                    if delta is not None:
+                        return row[0], encode_delta(row[0], header.depth + 1, delta)
+            return (row[0] if row else None), encode_report(accounts)
+        return None, encode_report(accounts)
+
+    def reconstruct_report(self, report_id, report_data):
+        """
+        Decode a report's blob into its list of accounts. A delta is applied to its parent report,
+        which comes from the cache or is reconstructed the same way, back to the nearest full snapshot.
+
+        Raises:
+            ValueError: If the blob, or a report it depends on, cannot be decoded.
+        """
+        header, data = decode_snapshot(report_data)
+        if header is None or header.kind != DELTA_SNAPSHOT:
+            return data
+        parent = self.get_report(header.parent_id)
+        if parent is None or parent["report_data"] is None:
+            raise ValueError(f"parent report {header.parent_id} is missing or unreadable")
+        return apply_delta(parent["report_data"], data)
+
+    def get_report(self, report_id):
+        """
+        Return one decoded report, reading it from the database only on a cache miss.
+
+        Returns:
+            dict or None: {"report_id", "report_type", "report_date" (datetime), "report_data"},
+            or None if the report does not exist. The returned report is shared through the cache
+            and must not be modified.
+        """
+        with self._lock:
+            report = self._cache.get(report_id)
+            if report is not None:
+                self._cache.move_to_end(report_id)
+                return report
+
+        try:
+            query = "SELECT report_type, report_date, report_data FROM reports WHERE report_id = ?"
+            with self.db.reader() as cursor:
+                row = cursor.execute(query, (report_id,)).fetchone()
+        except sqlcipher3.Error as e:
+            print(f"[get_report] SQLCipher Error: {e}")
+            return None
+        if row is None:
+            return None
+
+        report_type, report_date, report_data = row
+        report = {
+            "report_id": report_id,
+            "report_type": report_type,
+            "report_date": self.parse_report_date(report_date),
+            "report_data": self.decode(report_id, report_data),
+        }
+        with self._lock:
+            self._cache[report_id] = report
+            self._cache.move_to_end(report_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return report
+
+    def get_month_reports(self, catalogue, month, year, report_id=None):
+        """
+        Decode the reports of a catalogue that fall in the given month, optionally only one report_id.
+        Dates are compared as "YYYY-MM" prefixes, so reports outside the month are never decoded.
+        """
+        prefix = f"{int(year):04d}-{int(month):02d}"
+        reports = []
+        for entry in catalogue:
+            if not str(entry["report_date"]).startswith(prefix):
+                continue
+            if report_id is not None and entry["report_id"] != report_id:
+                continue
+            report = self.get_report(entry["report_id"])
+            if report is not None:
+                reports.append(report)
+        return reports
+
+    def invalidate(self, report_id=None):
+        """Drop one report, or every report, from the cache after it was changed or deleted."""
+        with self._lock:
+            if report_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(report_id, None)
+
+    @staticmethod
+    def parse_report_date(report_date):
+        """Convert a stored "YYYY-MM-DD HH:MM:SS" date to a datetime, leaving other values as they are."""
+        try:
+            return datetime.strptime(report_date, "%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError) as ex:
+            print(f"Error parsing report date {report_date!r}: {ex}")
+            return report_date
+
+    def decode(self, report_id, report_data):
+        """Decode a report_data blob (full snapshot, delta or legacy JSON). Returns None if it cannot be decoded."""
+        try:
+            return self.reconstruct_report(report_id, report_data)
+        except (TypeError, ValueError) as ex:
+            print(f"Error decoding report_data for report_id {report_id}: {ex}")
+            return None
@@ -0,0 +1,203 @@
+from datetime import date, datetime
+
+from src.backend.database_interation.money import Money
+from src.backend.database_interation.report_codec import DELTA_SNAPSHOT, apply_delta, decode_snapshot
+
+# Headline figures of a report, stored in the reports row next to report_data so the report list
+# and its totals can be read without decoding a single blob. summary_version is NULL until a row
+# has been summarised; rows written before these columns existed are backfilled by migrate_report_summaries,
+# schema migration 3. Totals are integer cents.
+REPORT_SUMMARY_COLUMNS = (
+    ("period_start", "TEXT"),
+    ("period_end", "TEXT"),
+    ("total_allocated", "INTEGER"),
+    ("total_spent", "INTEGER"),
+    ("total_scheduled", "INTEGER"),
+    ("account_count", "INTEGER"),
+    ("transaction_count", "INTEGER"),
+    ("summary_version", "INTEGER"),
+    # Written by the update_reports_timestamp trigger, which older schemas created without the column,
+    # so every UPDATE of a report failed with "no such column: updated_at"
+    ("updated_at", "DATETIME"),
+)
+
+SUMMARY_VERSION = 1
+
+# Per-account figures of each report, and a covering index that answers the report catalogue
+# (with its headline figures) from the index alone, never touching the pages holding the blobs.
+# Every statement is idempotent so the same script can be applied to databases created before it existed.
+REPORT_SUMMARY_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS report_account_totals (
+            report_id INTEGER NOT NULL REFERENCES reports(report_id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            account_name TEXT,
+            balance INTEGER DEFAULT 0,
+            spent INTEGER DEFAULT 0,
+            scheduled INTEGER DEFAULT 0,
+            transaction_count INTEGER DEFAULT 0,
+            PRIMARY KEY (report_id, position)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_reports_user_catalogue ON reports(
+            user_id, report_date, report_id, report_type, period_start, period_end,
+            total_allocated, total_spent, total_scheduled, account_count, transaction_count
+        );
+
+        -- Lets the startup check find unsummarised reports without reading past every blob
+        CREATE INDEX IF NOT EXISTS idx_reports_unsummarised ON reports(report_id) WHERE summary_version IS NULL;
+"""
+
+# Report types whose period is the week, month or year ending on report_date (see report_scheduler)
+_WEEKLY, _MONTHLY, _YEARLY = 2, 3, 4
+
+
+def report_period(report_type, report_date):
+    """
+    Return the ("YYYY-MM-DD", "YYYY-MM-DD") first and last day a report covers, derived from its type
+    and stored date. Scheduled reports are dated the last second of their period; every other report
+    covers the calendar month it was stored in.
+    """
+    day = datetime.strptime(str(report_date)[:10], "%Y-%m-%d").date()
+    if report_type == _WEEKLY:
+        start = date.fromordinal(day.toordinal() - 6)
+    elif report_type == _YEARLY:
+        start = day.replace(month=1, day=1)
+        day = day.replace(month=12, day=31)
+    else:
+        start = day.replace(day=1)
+        next_month = date(day.year + 1, 1, 1) if day.month == 12 else date(day.year, day.month + 1, 1)
+        if report_type != _MONTHLY:
+            day = date.fromordinal(next_month.toordinal() - 1)
+    return start.strftime("%Y-%m-%d"), day.strftime("%Y-%m-%d")
+
+
+def summarize_report(accounts, report_date):
+    """
+    Compute the headline and per-account figures of a report.
+
+    A transaction dated after the report's date is scheduled: it is counted in "scheduled", not in "spent",
+    the same way the History page shows it.
+
+    Returns:
+        tuple: (summary dict with total_allocated, total_spent, total_scheduled, account_count and
+        transaction_count, [(account_name, balance, spent, scheduled, transaction_count), ...]), amounts as Money
+    """
+    report_day = str(report_date)[:10]
+    account_rows = []
+    for account in accounts:
+        spent = scheduled = Money(0)
+        transactions = account.get("transactions", [])
+        for transaction in transactions:
+            amount = transaction.get("amount") or 0
+            if (transaction.get("date") or "")[:10] > report_day:
+                scheduled += amount
+            else:
+                spent += amount
+        account_rows.append((account.get("account_name"), account.get("balance") or Money(0), spent, scheduled, len(transactions)))
+    summary = {
+        "total_allocated": sum((row[1] for row in account_rows), Money(0)),
+        "total_spent": sum((row[2] for row in account_rows), Money(0)),
+        "total_scheduled": sum((row[3] for row in account_rows), Money(0)),
+        "account_count": len(account_rows),
+        "transaction_count": sum(row[4] for row in account_rows),
+    }
+    return summary, account_rows
+
+
+def write_summary(cursor, report_id, report_type, report_date, accounts):
+    """Store the summary columns and per-account totals of one report, replacing any previous ones."""
+    summary, account_rows = summarize_report(accounts, report_date)
+    period_start, period_end = report_period(report_type, report_date)
+    cursor.execute(
+        """UPDATE reports SET period_start = ?, period_end = ?, total_allocated = ?, total_spent = ?,
+                              total_scheduled = ?, account_count = ?, transaction_count = ?, summary_version = ?
+           WHERE report_id = ?""",
+        (period_start, period_end, summary["total_allocated"], summary["total_spent"], summary["total_scheduled"],
+         summary["account_count"], summary["transaction_count"], SUMMARY_VERSION, report_id),
+    )
+    cursor.execute("DELETE FROM report_account_totals WHERE report_id = ?", (report_id,))
+    cursor.executemany(
+        """INSERT INTO report_account_totals (report_id, position, account_name, balance, spent, scheduled, transaction_count)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        [(report_id, position, *row) for position, row in enumerate(account_rows)],
+    )
+
+
+def migrate_report_summaries(conn, batch_size=200, progress=None):
+    """
+    Add the summary columns, table and index to a database created before they existed, then summarise
+    every report that has no summary yet. Does nothing but two quick checks on an up-to-date database.
+
+    Delta reports are rebuilt from their parents, which come first in report_id order, so only the
+    latest report of each chain is kept in memory.
+
+    Arguments:
+        conn (sqlcipher3.Connection): A connection to the database.
+        batch_size (int): Reports summarised per commit.
+        progress (callable, optional): progress(done, total), called after every commit.
+
+    Returns:
+        int: The number of reports summarised.
+    """
+    cursor = conn.cursor()
+    try:
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(reports)")}
+        for name, column_type in REPORT_SUMMARY_COLUMNS:
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE reports ADD COLUMN {name} {column_type}")
+        cursor.executescript(REPORT_SUMMARY_SCHEMA)
+        conn.commit()
+
+        pending = [row[0] for row in cursor.execute(
+            "SELECT report_id FROM reports WHERE summary_version IS NULL ORDER BY report_id")]
+        if not pending:
+            return 0
+
+        decoded = {}  # report_id -> accounts, for the parents of delta reports still to come
+        summarised = 0
+        for start in range(0, len(pending), batch_size):
+            cursor.execute("BEGIN")
+            for report_id in pending[start:start + batch_size]:
+                accounts = _decode_chain(cursor, report_id, decoded)
+                if accounts is None:
+                    continue
+                report_type, report_date = cursor.execute(
+                    "SELECT report_type, report_date FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+                write_summary(cursor, report_id, report_type, report_date, accounts)
+                summarised += 1
+            conn.commit()
+            if progress:
+                progress(min(start + batch_size, len(pending)), len(pending))
+        print(f"Summarised {summarised} reports.")
+        return summarised
+    except Exception as e:
+        conn.rollback()
+        print("Error migrating report summaries:", e)
+        raise
+    finally:
+        cursor.close()
+
+
+def _decode_chain(cursor, report_id, decoded, cache_size=32):
+    """Decode a report, applying deltas to their parents. Keeps recently decoded reports in decoded."""
+    if report_id in decoded:
+        return decoded[report_id]
+    row = cursor.execute("SELECT report_data FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+    if row is None:
+        return None
+    try:
+        header, data = decode_snapshot(row[0])
+        if header is not None and header.kind == DELTA_SNAPSHOT:
+            parent = _decode_chain(cursor, header.parent_id, decoded, cache_size)
+            if parent is None:
+                raise ValueError(f"parent report {header.parent_id} is missing")
+            data = apply_delta(parent, data)
+    except (TypeError, ValueError) as e:
+        print(f"Error decoding report_data for report_id {report_id}: {e}")
+        return None
+    if not isinstance(data, list):
+        data = [data]
+    decoded[report_id] = data
+    while len(decoded) > cache_size:
+        decoded.pop(next(iter(decoded)))
+    return data
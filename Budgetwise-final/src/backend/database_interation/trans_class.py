@@ -2,17 +2,40 @@ import sqlcipher3 as s3
 from datetime import (
     date,
 )  # this library allows us to get the current date on the user machine in order to allow transaction dating
+from src.backend.database_interation.dates import iso_today, to_iso_date
+from src.backend.database_interation.money import Money, from_cents, to_money
+
+
+def month_bounds(year, month):
+    """
+    Return the half-open date range [start, end) covering a calendar month as "YYYY-MM-DD" strings.
+
+    Comparing transaction_date against these bounds (instead of wrapping it in strftime)
+    lets SQLite use the transaction_date indexes.
+    """
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
 
 
 # An important note to make when reviewing this code is to recognize that database variables have under_scores and local python variables do not
+# Amounts are stored as integer cents: every amount returned here is Money, and amounts passed in may be Money or dollars (see to_money)
+# Dates are stored as "YYYY-MM-DD" strings: dates passed in may be date objects or any format to_iso_date reads
 class TransClass:
 
+    # Sort keys for get_transaction_page: (column, index of that column in a returned row).
+    # Each key ends with transaction_id so the keyset cursor is unique, and matches a composite index on transactions.
+    SORT_KEYS = {
+        "transaction_date": [("t.transaction_date", 5), ("t.transaction_id", 0)],
+        "transaction_amount": [("t.amount", 3), ("t.transaction_id", 0)],
+        "budget_account_id": [("t.budget_accounts_id", 2), ("t.transaction_date", 5), ("t.transaction_id", 0)],
+    }
+
     # inherit connection object from the user_data class
     def __init__(self, user_data):
         # Use the existing database connection from user_data
         self.user_data = user_data
         self.db = self.user_data.db
-        self.conn = self.db.cursor()
 
     def createTransaction(
         self, userID, transtype, transAmount, description, status, date=date.today()
@@ -21,45 +44,266 @@ class TransClass:
             formatted_date = date.strftime("%Y-%m-%d")
             # this query should create a transaction in the database
             query = """INSERT INTO transaction (user_id, budget_accounts_id, vendor_id, amount, description, recurring, transaction_date, status) VALUES (?,?,?,?,?,?,?,?,?,?,?)"""
-            self.conn.execute(
-                query,
-                (
-                    userID,
-                    transtype,
-                    transAmount,
-                    description,
-                    0,
-                    3,
-                    formatted_date,
-                    status,
-                ),
-            )  # WARNING STATUS_TYPE_OBJECT NOT FINAL
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    query,
+                    (
+                        userID,
+                        transtype,
+                        to_money(transAmount),
+                        description,
+                        0,
+                        3,
+                        formatted_date,
+                        status,
+                    ),
+                )  # WARNING STATUS_TYPE_OBJECT NOT FINAL
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in createTransaction: {e}")
 
     def getBudgetAccountName(self, budget_account_id):
         query = """SELECT account_name FROM budget_accounts WHERE budget_accounts_id = ?"""
-        self.conn.execute(query, (budget_account_id,))
-        return self.conn.fetchone()[0]  # Assuming it returns a single result.
+        with self.db.reader() as cursor:
+            return cursor.execute(query, (budget_account_id,)).fetchone()[0]  # Assuming it returns a single result.
 
 
     def getTransactionDetails(self, transactionID):
         try:
             # this query should return all of the details related to a single specific transaction_id
             query = """SELECT budget_accounts_id, vendor_id, amount, description, recurring, transaction_date  FROM transactions WHERE transaction_id = ?"""
-            self.conn.execute(query, (transactionID))
-            return self.conn.fetchall()
+            with self.db.reader() as cursor:
+                return cursor.execute(query, (transactionID)).fetchall()
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in getTransactionDetails: {e}")
 
+    def get_transaction_rows(self, userID):
+        """
+        Return every transaction for a user, already joined with its budget account and vendor,
+        in a single statement instead of one lookup per transaction.
+
+        Each row is a list in the order the Transactions page expects:
+        [ transaction_id, budget_account_name, budget_account_id, amount, description,
+          transaction_date, recurring, vendor_id, vendor_name ]
+        """
+        try:
+            query = """SELECT t.transaction_id, ba.account_name, t.budget_accounts_id, t.amount,
+                              t.description, t.transaction_date, t.recurring, t.vendor_id, v.vendor_name
+                       FROM transactions t
+                       JOIN budget_accounts ba ON t.budget_accounts_id = ba.budget_accounts_id
+                       LEFT JOIN vendors v ON t.vendor_id = v.vendor_id
+                       WHERE t.user_id = ?
+                       ORDER BY t.transaction_id"""
+            with self.db.reader() as cursor:
+                cursor.execute(query, (userID,))
+                return [self.row_with_money(row) for row in cursor.fetchall()]
+        # if sqlite3 throws, print error to screen.
+        except s3.Error as e:
+            print(f"An error occurred in get_transaction_rows: {e}")
+            return []
+
+    def get_transaction_page(self, userID, limit, after=None, sort_by="transaction_date", descending=True, filters=None):
+        """
+        Return one window of a user's transactions, sorted and filtered in SQL, using keyset
+        pagination on the sort key followed by transaction_id.
+
+        Arguments:
+            userID (int): The user whose transactions are listed.
+            limit (int): The maximum number of rows to return.
+            after (tuple, optional): The key of the last row of the previous window, as built by
+                get_page_key. None starts from the first row.
+            sort_by (str): One of the keys of SORT_KEYS.
+            descending (bool): Sort direction.
+            filters (dict, optional): Any of account_id, vendor_id, recurring, min_amount, max_amount,
+                start_date and end_date (dates or "YYYY-MM-DD", both inclusive).
+
+        Returns:
+            list: Rows in the same layout as get_transaction_rows.
+        """
+        if sort_by not in self.SORT_KEYS:
+            print(f"Unsupported sort key in get_transaction_page: {sort_by}")
+            return []
+
+        key_columns = [column for column, _ in self.SORT_KEYS[sort_by]]
+        direction = "DESC" if descending else "ASC"
+
+        try:
+            query = """SELECT t.transaction_id, ba.account_name, t.budget_accounts_id, t.amount,
+                              t.description, t.transaction_date, t.recurring, t.vendor_id, v.vendor_name
+                       FROM transactions t
+                       JOIN budget_accounts ba ON t.budget_accounts_id = ba.budget_accounts_id
+                       LEFT JOIN vendors v ON t.vendor_id = v.vendor_id
+                       WHERE t.user_id = ?"""
+            params = [userID]
+
+            conditions, filter_params = self.build_transaction_filters(filters or {})
+            for condition in conditions:
+                query += f" AND {condition}"
+            params.extend(filter_params)
+
+            if after is not None:
+                placeholders = ", ".join("?" for _ in key_columns)
+                query += f" AND ({', '.join(key_columns)}) {'<' if descending else '>'} ({placeholders})"
+                params.extend(after)
+
+            query += " ORDER BY " + ", ".join(f"{column} {direction}" for column in key_columns) + " LIMIT ?"
+            params.append(limit)
+
+            with self.db.reader() as cursor:
+                cursor.execute(query, params)
+                return [self.row_with_money(row) for row in cursor.fetchall()]
+        # if sqlite3 throws, print error to screen.
+        except s3.Error as e:
+            print(f"An error occurred in get_transaction_page: {e}")
+            return []
+
+    def row_with_money(self, row, index=3):
+        """Return a fetched row as a list with the amount at index wrapped in Money."""
+        row = list(row)
+        row[index] = from_cents(row[index])
+        return row
+
+    def get_page_key(self, row, sort_by="transaction_date"):
+        """Build the keyset cursor for get_transaction_page from a returned row."""
+        return tuple(row[index] for _, index in self.SORT_KEYS[sort_by])
+
+    def build_transaction_filters(self, filters):
+        """
+        Translate a filter dictionary into SQL conditions on the transactions table (aliased t).
+
+        Every condition compares a bare column against a parameter so the composite
+        indexes created in Installation.create_tables can be used.
+
+        Returns:
+            tuple: (list of condition strings, list of parameters)
+        """
+        conditions = []
+        params = []
+        if filters.get("account_id") is not None:
+            conditions.append("t.budget_accounts_id = ?")
+            params.append(filters["account_id"])
+        if filters.get("vendor_id") is not None:
+            conditions.append("t.vendor_id = ?")
+            params.append(filters["vendor_id"])
+        if filters.get("recurring") is not None:
+            conditions.append("t.recurring = ?")
+            params.append(int(filters["recurring"]))
+        if filters.get("min_amount") is not None:
+            conditions.append("t.amount >= ?")
+            params.append(to_money(filters["min_amount"]))
+        if filters.get("max_amount") is not None:
+            conditions.append("t.amount <= ?")
+            params.append(to_money(filters["max_amount"]))
+        if filters.get("start_date"):
+            conditions.append("t.transaction_date >= ?")
+            params.append(to_iso_date(filters["start_date"]))
+        if filters.get("end_date"):
+            conditions.append("t.transaction_date <= ?")
+            params.append(to_iso_date(filters["end_date"]))
+        return conditions, params
+
+    def get_month_transactions_by_account(self, userID, year, month):
+        """
+        Return every transaction a user made in a calendar month, grouped by budget account,
+        using one range query instead of one query per account.
+
+        Returns:
+            dict: {budget_accounts_id: [(transaction_id, description, amount, transaction_date), ...]}
+        """
+        start, end = month_bounds(year, month)
+        try:
+            query = """SELECT budget_accounts_id, transaction_id, description, amount, transaction_date
+                       FROM transactions
+                       WHERE user_id = ? AND transaction_date >= ? AND transaction_date < ?
+                         AND transaction_date IS date(transaction_date)
+                       ORDER BY budget_accounts_id, transaction_date, transaction_id"""
+            with self.db.reader() as cursor:
+                cursor.execute(query, (userID, start, end))
+                grouped = {}
+                for account_id, transaction_id, description, amount, transaction_date in cursor.fetchall():
+                    grouped.setdefault(account_id, []).append((transaction_id, description, from_cents(amount), transaction_date))
+                return grouped
+        # if sqlite3 throws, print error to screen.
+        except s3.Error as e:
+            print(f"An error occurred in get_month_transactions_by_account: {e}")
+            return {}
+
+    def get_account_month_totals(self, userID, year, month):
+        """
+        Return each account's spend for a calendar month from the account_month_totals summary table,
+        which is kept current by triggers on transactions. Reads one row per account instead of
+        re-summing every transaction.
+
+        Returns:
+            dict: {budget_accounts_id: total_amount} (accounts with no spend are omitted)
+        """
+        try:
+            query = """SELECT budget_accounts_id, total_amount
+                       FROM account_month_totals
+                       WHERE user_id = ? AND month = ?"""
+            with self.db.reader() as cursor:
+                cursor.execute(query, (userID, f"{year:04d}-{month:02d}"))
+                return {account_id: Money(total) for account_id, total in cursor.fetchall()}
+        # if sqlite3 throws, print error to screen.
+        except s3.Error as e:
+            print(f"An error occurred in get_account_month_totals: {e}")
+            return {}
+
+    def get_scheduled_totals(self, userID, year, month, after):
+        """
+        Return the per-account total of a month's transactions dated after the given "YYYY-MM-DD" date.
+        Subtracting these from get_account_month_totals gives the completed spend; only the future
+        part of the month is scanned. Like the summary, it skips dates that are not a real "YYYY-MM-DD"
+        (e.g. "2024-02-30", left unreadable by migration 6).
+
+        Returns:
+            dict: {budget_accounts_id: scheduled_amount}
+        """
+        start, end = month_bounds(year, month)
+        try:
+            query = """SELECT budget_accounts_id, SUM(amount)
+                       FROM transactions
+                       WHERE user_id = ? AND transaction_date > ? AND transaction_date >= ? AND transaction_date < ?
+                         AND transaction_date IS date(transaction_date)
+                       GROUP BY budget_accounts_id"""
+            with self.db.reader() as cursor:
+                cursor.execute(query, (userID, after, start, end))
+                return {account_id: Money(total) for account_id, total in cursor.fetchall()}
+        # if sqlite3 throws, print error to screen.
+        except s3.Error as e:
+            print(f"An error occurred in get_scheduled_totals: {e}")
+            return {}
+
+    def get_account_month_transactions(self, accountID, year, month):
+        """
+        Return one account's transactions for a calendar month, for pages that only need the rows
+        when the user expands an account.
+
+        Returns:
+            list: [(transaction_id, description, amount, transaction_date), ...]
+        """
+        start, end = month_bounds(year, month)
+        try:
+            query = """SELECT transaction_id, description, amount, transaction_date
+                       FROM transactions
+                       WHERE user_id = ? AND budget_accounts_id = ? AND transaction_date >= ? AND transaction_date < ?
+                         AND transaction_date IS date(transaction_date)
+                       ORDER BY transaction_date, transaction_id"""
+            with self.db.reader() as cursor:
+                cursor.execute(query, (self.user_data.user_id, accountID, start, end))
+                return [tuple(self.row_with_money(row, 2)) for row in cursor.fetchall()]
+        # if sqlite3 throws, print error to screen.
+        except s3.Error as e:
+            print(f"An error occurred in get_account_month_transactions: {e}")
+            return []
+
     def getTransactionList(self, userID):
         try:
             # this query will return all of the transaction_ID's from a particular user_id
             query = """SELECT transaction_id FROM transactions WHERE user_id = ?"""
-            self.conn.execute(query, (userID,))
-            return self.conn.fetchall()
+            with self.db.reader() as cursor:
+                return cursor.execute(query, (userID,)).fetchall()
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in getTransactionList: {e}")
@@ -73,7 +317,8 @@ class TransClass:
             query = (
                 """UPDATE transactions SET status = ? WHERE date < ? AND status = ?"""
             )
-            self.conn.execute(query, (1, formatted_date, 2))  # update status
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (1, formatted_date, 2))  # update status
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in checkTransactionDate: {e}")
@@ -82,7 +327,8 @@ class TransClass:
         try:
             # this query will delete the transaction with the associated transactionID
             query = """DELETE FROM transactions WHERE transaction_id = ?"""
-            self.conn.execute(query, (transactionID,))
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (transactionID,))
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in delete_transaction: {e}")
@@ -92,8 +338,8 @@ class TransClass:
         try:
             # this query will fetch the importance rating of a single transactionID
             query = """SELECT recurring FROM transactions WHERE transaction_id = ?"""
-            self.conn.execute(query, (transactionID,))
-            return self.conn.fetchone()
+            with self.db.reader() as cursor:
+                return cursor.execute(query, (transactionID,)).fetchone()
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in getRecurring: {e}")
@@ -102,7 +348,8 @@ class TransClass:
         try:
             # this query will set the recurring boolean for a specific transaction_id
             query = """UPDATE transactions SET recurring = ? WHERE transaction_id = ?"""
-            self.conn.execute(query, (isRecurring, transactionID))
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (isRecurring, transactionID))
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in setRecurring: {e}")
@@ -111,8 +358,9 @@ class TransClass:
         try:
             # this query will fetch the amount of a specified transaction
             query = """SELECT amount FROM transactions WHERE transaction_id = ?"""
-            self.conn.execute(query, (transactionID,))
-            return self.conn.fetchone()
+            with self.db.reader() as cursor:
+                row = cursor.execute(query, (transactionID,)).fetchone()
+            return (from_cents(row[0]),) if row else None
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in getAmount: {e}")
@@ -121,7 +369,8 @@ class TransClass:
         try:
             # this query will set the transaction amount related to the transactionid
             query = """UPDATE transactions SET amount = ? WHERE transaction_id = ?"""
-            self.conn.execute(query, (transAmount, transactionID))
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (to_money(transAmount), transactionID))
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in setAmount: {e}")
@@ -130,8 +379,8 @@ class TransClass:
         try:
             # this query will fetch the description related to the transactionid
             query = """SELECT description FROM transactions WHERE transaction_id = ?"""
-            self.conn.execute(query, (transactionID,))
-            return self.conn.fetchone()
+            with self.db.reader() as cursor:
+                return cursor.execute(query, (transactionID,)).fetchone()
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in getDescription: {e}")
@@ -142,7 +391,8 @@ class TransClass:
             query = (
                 """UPDATE transactions SET description = ? WHERE transaction_id = ?"""
             )
-            self.conn.execute(query, (transDesc, transactionID))
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (transDesc, transactionID))
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in setDescription: {e}")
@@ -153,8 +403,8 @@ class TransClass:
             query = (
                 """SELECT transaction_date FROM transactions WHERE transactionID = ?"""
             )
-            self.conn.execute(query, (transactionID,))
-            return self.conn.fetchone()
+            with self.db.reader() as cursor:
+                return cursor.execute(query, (transactionID,)).fetchone()
         # if sqlite3 throws, print error to screen.
         except s3.Error as e:
             print(f"An error occurred in getDate: {e}")
@@ -169,8 +419,8 @@ class TransClass:
             transaction_data['user_id'],
             transaction_data['budget_accounts_id'],
             transaction_data['vendor_id'],
-            transaction_data['amount'],
-            transaction_data['transaction_date'],
+            to_money(transaction_data['amount']),
+            to_iso_date(transaction_data['transaction_date']),
             transaction_data['description'],
             transaction_data['recurring']
         )
@@ -185,28 +435,24 @@ class TransClass:
         Insert a new transaction into the database using account_id and vendor_id directly.
         User ID is fetched from self.user_data.user_id, and transaction_id is auto-incremented.
         """
-        if transaction_date is None:
-            transaction_date = date.today().strftime("%Y-%m-%d")
-
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                """INSERT INTO transactions (user_id, budget_accounts_id, vendor_id, amount, description, recurring, transaction_date, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    self.user_data.user_id,  # User ID fetched from self.user_data
-                    account_id,
-                    vendor_id,
-                    transAmount,
-                    description,
-                    int(recurring),
-                    transaction_date,
-                    int(status)
+            transaction_date = iso_today() if transaction_date is None else to_iso_date(transaction_date)
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """INSERT INTO transactions (user_id, budget_accounts_id, vendor_id, amount, description, recurring, transaction_date, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        self.user_data.user_id,  # User ID fetched from self.user_data
+                        account_id,
+                        vendor_id,
+                        to_money(transAmount),
+                        description,
+                        int(recurring),
+                        transaction_date,
+                        int(status)
+                    )
                 )
-            )
 
-            # Commit the changes to the database
-            self.db.commit_db()  # Commit the transaction to the database
             print(f"Transaction created for user_id {self.user_data.user_id} with amount {transAmount}")
             return True
 
@@ -215,33 +461,30 @@ class TransClass:
             return False
 
     def update_transaction(self, transaction_id, account_id, vendor_id, transAmount, description, recurring, transaction_date=None, status=2):
-        if transaction_date is None:
-            transaction_date = date.today().strftime("%Y-%m-%d")
-
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                """UPDATE transactions
-                SET budget_accounts_id = ?,
-                    vendor_id = ?,
-                    amount = ?,
-                    description = ?,
-                    recurring = ?,
-                    transaction_date = ?,
-                    status = ?
-                WHERE transaction_id = ?""",
-                (
-                    account_id,
-                    vendor_id,
-                    transAmount,
-                    description,
-                    int(recurring),
-                    transaction_date,
-                    int(status),
-                    transaction_id
+            transaction_date = iso_today() if transaction_date is None else to_iso_date(transaction_date)
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """UPDATE transactions
+                    SET budget_accounts_id = ?,
+                        vendor_id = ?,
+                        amount = ?,
+                        description = ?,
+                        recurring = ?,
+                        transaction_date = ?,
+                        status = ?
+                    WHERE transaction_id = ?""",
+                    (
+                        account_id,
+                        vendor_id,
+                        to_money(transAmount),
+                        description,
+                        int(recurring),
+                        transaction_date,
+                        int(status),
+                        transaction_id
+                    )
                 )
-            )
-            self.db.commit_db()
             print(f"Transaction updated for transaction_id {transaction_id} with new amount {transAmount}")
             return True
 
@@ -255,12 +498,12 @@ class TransClass:
 
     def get_account_id(self, account_name):
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                """SELECT budget_accounts_id FROM budget_accounts WHERE account_name = ?""",
-                (account_name,)
-            )
-            result = cursor.fetchone()
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """SELECT budget_accounts_id FROM budget_accounts WHERE account_name = ?""",
+                    (account_name,)
+                )
+                result = cursor.fetchone()
             return result[0] if result else None
         except Exception as e:
             print(f"An error occurred in get_account_id: {e}")
@@ -268,12 +511,12 @@ class TransClass:
 
     def get_vendor_id(self, vendor_name):
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                """SELECT vendor_id FROM vendors WHERE vendor_name = ?""",
-                (vendor_name,)
-            )
-            result = cursor.fetchone()
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """SELECT vendor_id FROM vendors WHERE vendor_name = ?""",
+                    (vendor_name,)
+                )
+                result = cursor.fetchone()
             return result[0] if result else None
         except Exception as e:
             print(f"An error occurred in get_vendor_id: {e}")
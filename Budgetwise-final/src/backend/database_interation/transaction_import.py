@@ -0,0 +1,292 @@
+import csv
+import os
+import re
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+
+import sqlcipher3
+
+from src.backend.database_interation.money import Money
+
+# Header names recognised in CSV exports, compared case-insensitively.
+CSV_COLUMNS = {
+    "date": ("date", "transaction date", "posted date", "posting date", "trans date"),
+    "amount": ("amount", "transaction amount", "amt"),
+    "debit": ("debit", "withdrawal", "withdrawals"),
+    "credit": ("credit", "deposit", "deposits"),
+    "vendor": ("payee", "vendor", "merchant", "name"),
+    "description": ("description", "memo", "details", "narrative"),
+    "account": ("account", "budget account", "category"),
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%d.%m.%Y", "%Y/%m/%d", "%Y%m%d")
+
+# OFX files hold one <STMTTRN> block per transaction. OFX 1.x (SGML) leaves leaf tags unclosed,
+# so the tokenizer reads "<TAG>value" pairs and does not rely on closing tags.
+OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9_.]+)>([^<]*)")
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value):
+    """
+    Return a "YYYY-MM-DD" string for the date formats banks export, or None if unrecognised.
+    A statement only holds a few hundred distinct dates, so results are cached.
+    """
+    value = value.strip()
+    # QIF writes years after 1999 as 1/15'24
+    value = value.replace("'", "/").replace(" ", "")
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def parse_amount(value):
+    """Parse "1,234.56", "$12.00" and "(12.00)" style amounts into Money. Returns None if empty or invalid."""
+    value = value.strip().replace(",", "").replace("$", "")
+    if not value:
+        return None
+    negative = value.startswith("(") and value.endswith(")")
+    try:
+        amount = Money.from_dollars(value.strip("()"))
+    except ValueError:
+        return None
+    return -amount if negative else amount
+
+
+def read_csv(path):
+    """
+    Yield one record per row of a CSV export.
+
+    Amounts follow the bank's sign: a single "amount" column is used as is, and separate
+    debit/credit columns become negative/positive amounts.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        normalised = [column.strip().lower() for column in header]
+        index = {}
+        for field, names in CSV_COLUMNS.items():
+            for name in names:
+                if name in normalised:
+                    index[field] = normalised.index(name)
+                    break
+        if "date" not in index or not ({"amount", "debit", "credit"} & index.keys()):
+            raise ValueError("CSV file needs a date column and an amount or debit/credit column.")
+
+        def cell(row, field):
+            position = index.get(field)
+            return row[position] if position is not None and position < len(row) else ""
+
+        for row in reader:
+            if not row:
+                continue
+            if "amount" in index:
+                amount = parse_amount(cell(row, "amount"))
+            else:
+                debit, credit = parse_amount(cell(row, "debit")), parse_amount(cell(row, "credit"))
+                amount = -abs(debit) if debit else (abs(credit) if credit else None)
+            yield {
+                "date": cell(row, "date"),
+                "amount": amount,
+                "vendor": cell(row, "vendor"),
+                "description": cell(row, "description"),
+                "account": cell(row, "account"),
+            }
+
+
+def read_ofx(path, chunk_size=65536):
+    """Yield one record per <STMTTRN> block of an OFX/QFX file, reading the file in chunks."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        buffer = ""
+        record = None
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            # Keep a possibly incomplete final token for the next chunk
+            cut = max(buffer.rfind("<"), 0) if chunk else len(buffer)
+            for closing, tag, text in OFX_TOKEN.findall(buffer[:cut]):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    if closing and record is not None:
+                        yield {
+                            "date": record.get("DTPOSTED", "")[:8],
+                            "amount": parse_amount(record.get("TRNAMT", "")),
+                            "vendor": record.get("NAME", "") or record.get("PAYEE", ""),
+                            "description": record.get("MEMO", ""),
+                            "account": "",
+                        }
+                        record = None
+                    elif not closing:
+                        record = {}
+                elif record is not None and not closing:
+                    record[tag] = text.strip()
+            buffer = buffer[cut:]
+            if not chunk:
+                break
+
+
+def read_qif(path):
+    """Yield one record per "^"-terminated entry of a QIF file."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        record = {}
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("!"):
+                continue
+            code, value = line[0], line[1:].strip()
+            if code == "^":
+                if record:
+                    yield {
+                        "date": record.get("D", ""),
+                        "amount": parse_amount(record.get("T", "") or record.get("U", "")),
+                        "vendor": record.get("P", ""),
+                        "description": record.get("M", ""),
+                        "account": record.get("L", "").split(":")[0],
+                    }
+                record = {}
+            else:
+                record[code] = value
+
+
+READERS = {
+    ".csv": read_csv,
+    ".ofx": read_ofx,
+    ".qfx": read_ofx,
+    ".qif": read_qif,
+}
+
+
+class TransactionImporter:
+    """
+    Streams bank export files (CSV, OFX/QFX, QIF) into the transactions table.
+
+    Records flow through generators (read -> normalise -> resolve -> batch), so memory stays
+    constant regardless of file size. Accounts and vendors are resolved through dictionaries
+    loaded once per import; unknown vendors are created on first sight. Every batch is written
+    with executemany inside a single Database.transaction(), so an import is all-or-nothing and
+    commits once.
+
+    Bank exports sign withdrawals negative. BudgetWise records spending as positive amounts,
+    so withdrawals are imported as positive spend and deposits are skipped unless include_credits is set.
+    """
+
+    def __init__(self, user_data, batch_size=5000, cache_kib=131072):
+        """
+        Arguments:
+            user_data (UserData): The logged-in user's data; provides user_id and the database.
+            batch_size (int): Rows per executemany call.
+            cache_kib (int): Page cache used while importing. Rows arrive in file order, so every
+                insert touches a different part of each transactions index; once the indexes
+                outgrow the profile's cache, every insert re-reads and re-decrypts pages.
+        """
+        self.user_data = user_data
+        self.db = self.user_data.db
+        self.batch_size = batch_size
+        self.cache_kib = cache_kib
+        self.account_ids = {}
+        self.vendor_ids = {}
+        self.skipped = 0
+
+    def import_file(self, path, default_account_id, file_type=None, include_credits=False):
+        """
+        Import every transaction in a bank export file.
+
+        Arguments:
+            path (str): The file to import.
+            default_account_id (int): Budget account for rows whose account/category column does
+                not match one of the user's accounts.
+            file_type (str, optional): "csv", "ofx", "qfx" or "qif". Defaults to the file extension.
+            include_credits (bool): Import deposits as negative spend instead of skipping them.
+
+        Returns:
+            dict: {"imported", "skipped", "seconds", "rows_per_second"}
+
+        Raises:
+            ValueError: If the file type is not supported or the file has no usable columns.
+        """
+        extension = "." + (file_type or os.path.splitext(path)[1].lstrip(".")).lower()
+        if extension not in READERS:
+            raise ValueError(f"Unsupported import file type: {extension}")
+
+        start = time.perf_counter()
+        self.skipped = 0
+        self.load_lookups()
+
+        rows = self.resolve(self.normalise(READERS[extension](path), include_credits), default_account_id)
+        imported = 0
+        with self.db.transaction() as cursor:
+            cache_size = cursor.execute("PRAGMA cache_size").fetchone()[0]
+            try:
+                cursor.execute(f"PRAGMA cache_size = {-int(self.cache_kib)}")
+                while True:
+                    batch = list(islice(rows, self.batch_size))
+                    if not batch:
+                        break
+                    cursor.executemany(
+                        """INSERT INTO transactions (user_id, budget_accounts_id, vendor_id, amount, description, recurring, transaction_date, status)
+                           VALUES (?, ?, ?, ?, ?, 0, ?, ?)""",
+                        batch,
+                    )
+                    imported += len(batch)
+            finally:
+                cursor.execute(f"PRAGMA cache_size = {int(cache_size)}")
+
+        seconds = time.perf_counter() - start
+        result = {
+            "imported": imported,
+            "skipped": self.skipped,
+            "seconds": seconds,
+            "rows_per_second": imported / seconds if seconds else 0.0,
+        }
+        print(f"Imported {imported} transactions from {path} ({result['rows_per_second']:.0f} rows/s, {self.skipped} skipped)")
+        return result
+
+    def load_lookups(self):
+        """Load the user's account and vendor names once, keyed by lower-case name."""
+        with self.db.reader() as cursor:
+            cursor.execute("SELECT account_name, budget_accounts_id FROM budget_accounts WHERE user_id = ?", (self.user_data.user_id,))
+            self.account_ids = {name.strip().lower(): account_id for name, account_id in cursor.fetchall()}
+            cursor.execute("SELECT vendor_name, vendor_id FROM vendors WHERE user_id = ?", (self.user_data.user_id,))
+            self.vendor_ids = {name.strip().lower(): vendor_id for name, vendor_id in cursor.fetchall()}
+
+    def normalise(self, records, include_credits):
+        """Convert raw records to (date, amount, vendor, description, account), skipping unusable rows."""
+        today = date.today().strftime("%Y-%m-%d")
+        for record in records:
+            transaction_date = parse_date(record["date"])
+            amount = record["amount"]
+            if transaction_date is None or amount is None or amount == 0 or (amount > 0 and not include_credits):
+                self.skipped += 1
+                continue
+            vendor = record["vendor"].strip() or "Unknown"
+            description = record["description"].strip() or vendor
+            yield transaction_date, -amount, vendor, description, record["account"].strip(), transaction_date <= today
+
+    def resolve(self, records, default_account_id):
+        """Turn normalised records into INSERT parameters, creating missing vendors as they appear."""
+        user_id = self.user_data.user_id
+        for transaction_date, amount, vendor, description, account, posted in records:
+            account_id = self.account_ids.get(account.lower(), default_account_id)
+            vendor_id = self.vendor_ids.get(vendor.lower())
+            if vendor_id is None:
+                vendor_id = self.create_vendor(vendor)
+            # Status 1 marks posted transactions, 2 scheduled ones (see TransClass.checkTransactionDate)
+            yield user_id, account_id, vendor_id, amount, description, transaction_date, 1 if posted else 2
+
+    def create_vendor(self, name):
+        """Insert a vendor inside the running import transaction and cache its ID."""
+        try:
+            cursor = self.db.cursor()  # The writer; resolve() only runs inside import_file's transaction
+            cursor.execute("INSERT INTO vendors (user_id, vendor_name) VALUES (?, ?)", (self.user_data.user_id, name))
+            self.vendor_ids[name.lower()] = cursor.lastrowid
+            return cursor.lastrowid
+        except sqlcipher3.Error as e:
+            print(f"[create_vendor] SQLCipher Error: {e}")
+            raise
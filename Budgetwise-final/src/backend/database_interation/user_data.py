@@ -1,7 +1,9 @@
 import re
-from argon2 import PasswordHasher
+from concurrent.futures import ThreadPoolExecutor
 from argon2.exceptions import VerifyMismatchError, Argon2Error
 import sqlcipher3
+from src.backend.database_creation.hashing_profiles import concurrent_hash_limit, make_password_hasher
+from src.backend.database_interation.money import Money, from_cents, to_money
 
 class UserData:
     """
@@ -9,12 +11,18 @@ class UserData:
     - Fetching user details
     - Retrieving and validating security questions & answers
     - Updating passwords securely
+
+    Hashes are made with the Argon2 profile chosen at install time (see hashing_profiles). A password
+    or security answer hashed with other parameters is rehashed with the current profile after it
+    has been verified.
+
+    Budget and account amounts are Money (integer cents); amounts passed in may also be dollars.
     """
 
     def __init__(self, db_instance):
-        """Initialize with database instance and Argon2 password hasher."""
+        """Initialize with database instance and an Argon2 password hasher for the configured hashing profile."""
         self.db = db_instance
-        self.ph = PasswordHasher()
+        self.ph = make_password_hasher((db_instance.settings or {}).get("hashing_profile"))
         # Other temp info dictionary
         self.temp_budget = {}
         # Quick access
@@ -22,7 +30,7 @@ class UserData:
         self.username = ""
         self.budgets = []
         self.budget_name = ""
-        self.budget_amount = 0.0
+        self.budget_amount = Money(0)
         self.budget_id = 0
         # For sign up process
         self.temp_sign_up_data = {}
@@ -39,10 +47,63 @@ class UserData:
     def hash_password(self, password: str) -> str:
         """Hashes a password using Argon2 before storing it."""
         return self.ph.hash(password)
-    
+
+    def hash_secrets(self, secrets, max_workers=None):
+        """
+        Hashes several secrets at once, such as the three security answers at sign-up.
+
+        Argon2 releases the GIL, so each secret is hashed on its own thread. At most
+        concurrent_hash_limit hashes run at the same time, which keeps their memory within
+        HASHING_MEMORY_BUDGET.
+
+        Args:
+            secrets (list of str): The secrets to hash.
+            max_workers (int, optional): Overrides how many hashes run at once.
+
+        Returns:
+            list of str: The hashes, in the order of secrets.
+        """
+        secrets = list(secrets)
+        workers = min(len(secrets), max_workers or concurrent_hash_limit(self.ph))
+        if workers <= 1:
+            return [self.ph.hash(secret) for secret in secrets]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="BudgetWiseHash") as pool:
+            return list(pool.map(self.ph.hash, secrets))
+
+    def rehash_if_outdated(self, username, column, stored_hash, secret):
+        """
+        Replaces stored_hash with a hash of secret made with the current hashing profile, if stored_hash
+        was made with other Argon2 parameters. Only call this after secret has been verified against stored_hash.
+
+        Args:
+            username (str): The user the hash belongs to.
+            column (str): The users column holding the hash (password_hash or security_questionN_answer).
+            stored_hash (str): The hash secret was verified against.
+            secret (str): The password or answer the user provided.
+
+        Returns:
+            bool: True if the hash was replaced, False otherwise.
+        """
+        if not self.ph.check_needs_rehash(stored_hash):
+            return False
+        new_hash = self.ph.hash(secret)  # Hashed before taking the write lock
+        try:
+            with self.db.transaction() as cursor:
+                # Matching the old hash too leaves the row alone if it changed since it was read
+                cursor.execute(
+                    f"UPDATE users SET {column} = ? WHERE username = ? AND {column} = ?",
+                    (new_hash, username, stored_hash)
+                )
+            print(f"Rehashed {column} for {username} with the current hashing profile.")
+            return cursor.rowcount > 0
+        except sqlcipher3.Error as e:
+            print(f"Error rehashing {column}: {e}")
+            return False
+
     def verify_password(self, username: str, provided_password: str) -> bool:
         """
-        Verifies a user's password against the stored hash in the database.
+        Verifies a user's password against the stored hash in the database, and rehashes it
+        if the hash was made with an older hashing profile.
 
         Args:
             username (str): The username of the user.
@@ -59,6 +120,7 @@ class UserData:
         try:
             if self.ph.verify(password_hash_from_db, provided_password):
                 self.username = username
+                self.rehash_if_outdated(username, "password_hash", password_hash_from_db, provided_password)
                 return(True)
         except VerifyMismatchError:
             return False  # Incorrect password
@@ -83,16 +145,15 @@ class UserData:
         security_question3_answer = self.temp_sign_up_data.get("security_question3_answer")
 
         try:
-            cursor = self.db.cursor()  # Create a cursor to interact with the database
-            cursor.execute(
-                "INSERT INTO users (username, password_hash, alerts_enabled, default_chart, weekly_reports,"
-                "monthly_reports, yearly_reports, security_question1, security_question2, security_question3,"
-                "security_question1_answer, security_question2_answer, security_question3_answer) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (self.username, password_hash, 1, 0, 0, 0, 0, security_question1, security_question2, security_question3, 
-                security_question1_answer, security_question2_answer, security_question3_answer)
-            )  # Insert the new user's information into the 'users' table
-            self.db.commit_db()  # Commit the changes to the database
+            with self.db.transaction() as cursor:  # Commits when the block ends, rolls back on error
+                cursor.execute(
+                    "INSERT INTO users (username, password_hash, alerts_enabled, default_chart, weekly_reports,"
+                    "monthly_reports, yearly_reports, security_question1, security_question2, security_question3,"
+                    "security_question1_answer, security_question2_answer, security_question3_answer) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.username, password_hash, 1, 0, 0, 0, 0, security_question1, security_question2, security_question3, 
+                    security_question1_answer, security_question2_answer, security_question3_answer)
+                )  # Insert the new user's information into the 'users' table
             self.temp_sign_up_data.clear()  # Clear the temporary user input data
             self.user_id = self.get_user_id(self.username)
             return True
@@ -116,16 +177,16 @@ class UserData:
 
         try:
             hashed_password = self.hash_password(new_password)
-            cursor = self.db.cursor()
-            cursor.execute(
-                """UPDATE users 
-                   SET password_hash = ?
-                   WHERE username = ?""",
-                (hashed_password, username)
-            )
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """UPDATE users 
+                       SET password_hash = ?
+                       WHERE username = ?""",
+                    (hashed_password, username)
+                )
+                updated = cursor.rowcount > 0
             print(f"Password updated successfully for {username}.")
-            return cursor.rowcount > 0  # Returns True if any row was updated
+            return updated  # Returns True if any row was updated
         except sqlcipher3.Error as e:
             print(f"Error updating password: {e}")
             return False
@@ -141,9 +202,9 @@ class UserData:
                 str or None: The password hash if the user exists, otherwise None if the user is not found.
             """
             try:
-                cursor = self.db.cursor()  # Create a cursor to interact with the database
-                cursor.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
-                result = cursor.fetchone()  # Fetch the password hash from the database
+                with self.db.reader() as cursor:  # This thread's read-only connection
+                    cursor.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
+                    result = cursor.fetchone()  # Fetch the password hash from the database
                 return result[0] if result else None  # Return the password hash or None if the user doesn't exist
             except Exception as e:
                 print(f"Error retrieving user credentials: {e}")  # Handle any errors during retrieval
@@ -166,14 +227,14 @@ class UserData:
 
         try:
             # Query the database for security questions
-            cursor = self.db.cursor()
-            cursor.execute(
-                """SELECT security_question1, security_question2, security_question3,
-                security_question1_answer, security_question2_answer, security_question3_answer
-                FROM users WHERE username = ?""",
-                (self.username,)
-            )
-            result = cursor.fetchone()
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """SELECT security_question1, security_question2, security_question3,
+                    security_question1_answer, security_question2_answer, security_question3_answer
+                    FROM users WHERE username = ?""",
+                    (self.username,)
+                )
+                result = cursor.fetchone()
 
             # Return questions as a dictionary if found
             if result:
@@ -193,7 +254,8 @@ class UserData:
 
     def verify_security_answer(self, question_key, user_answer):
         """
-        Verifies if the provided answer matches the stored hashed answer for the selected question.
+        Verifies if the provided answer matches the stored hashed answer for the selected question,
+        and rehashes the answer if the hash was made with an older hashing profile.
         """
         try:
             # Convert question_key to string to match stored dictionary keys
@@ -214,7 +276,9 @@ class UserData:
             print(f"Stored Hashed Answer for Key {question_key_str}: {hashed_answer}")  # Debugging
 
             # Verify answer using Argon2 (or your hashing method)
-            return self.ph.verify(hashed_answer, user_answer)
+            verified = self.ph.verify(hashed_answer, user_answer)
+            self.rehash_if_outdated(self.username, f"security_question{question_key_str}_answer", hashed_answer, user_answer)
+            return verified
 
         except VerifyMismatchError:
             print("Incorrect security answer.")
@@ -239,12 +303,12 @@ class UserData:
             bool: True if the username exists, False otherwise.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                """SELECT 1 FROM users WHERE username = ? LIMIT 1""",
-                (username,)
-            )
-            result = cursor.fetchone()
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """SELECT 1 FROM users WHERE username = ? LIMIT 1""",
+                    (username,)
+                )
+                result = cursor.fetchone()
             return result is not None
         except sqlcipher3.Error as e:
             print(f"Error checking if username exists: {e}")
@@ -258,12 +322,12 @@ class UserData:
             return None
 
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                """SELECT user_id, username FROM users WHERE username = ?""",
-                (username,)
-            )
-            result = cursor.fetchone()
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """SELECT user_id, username FROM users WHERE username = ?""",
+                    (username,)
+                )
+                result = cursor.fetchone()
             print(f"Fetched user result: {result}")
         except sqlcipher3.Error as e:
             print(f"Database error while fetching user: {e}")
@@ -275,17 +339,14 @@ class UserData:
 
     def create_budget(self, budget_name, budget_amount):
         try:            
-            # Get user ID from the database
-            cursor = self.db.cursor()
-
-            # Insert the budget data into the budgets table
-            cursor.execute(
-                """INSERT INTO budgets (user_id, budget_name, total_budgeted_amount, leftover_amount, start_date, end_date) 
-                VALUES (?, ?, ?, ?, DATE('now'), DATE('now', 'start of month', '+1 month', '-1 day'))""",
-                (self.user_id, budget_name, budget_amount, budget_amount),
-            )
+            with self.db.transaction() as cursor:
+                # Insert the budget data into the budgets table
+                cursor.execute(
+                    """INSERT INTO budgets (user_id, budget_name, total_budgeted_amount, leftover_amount, start_date, end_date) 
+                    VALUES (?, ?, ?, ?, DATE('now'), DATE('now', 'start of month', '+1 month', '-1 day'))""",
+                    (self.user_id, budget_name, to_money(budget_amount), to_money(budget_amount)),
+                )
 
-            self.db.commit_db()
             print(f"Budget '{budget_name}' successfully added for user '{self.username}', at user_id '{self.user_id}', self.user_data.budget_name = , '{self.budget_name}', self.user_data.budget_amount = '{self.budget_amount}'.")
             return True
 
@@ -306,9 +367,9 @@ class UserData:
             int or None: The budget_id if found, otherwise None.
         """
         try:
-            cursor = self.db.cursor()
-            cursor.execute("SELECT budget_id FROM budgets WHERE user_id = ? AND budget_name = ?", (self.user_id, self.budget_name))
-            result = cursor.fetchone()
+            with self.db.reader() as cursor:
+                cursor.execute("SELECT budget_id FROM budgets WHERE user_id = ? AND budget_name = ?", (self.user_id, self.budget_name))
+                result = cursor.fetchone()
 
             if result:
                 self.budget_id = result[0]
@@ -338,9 +399,9 @@ class UserData:
             return None
 
         try:
-            cursor = self.db.cursor()
-            cursor.execute("SELECT user_id FROM users WHERE username = ?", (username.strip(),))
-            result = cursor.fetchone()
+            with self.db.reader() as cursor:
+                cursor.execute("SELECT user_id FROM users WHERE username = ?", (username.strip(),))
+                result = cursor.fetchone()
 
             if result:
                 self.user_id = result[0]
@@ -357,25 +418,25 @@ class UserData:
     def get_budget_accounts(self):
         """Fetch all budget accounts for the user and budget."""
         try:
-            cursor = self.db.cursor()
-            # Assuming you have a way to know the current budget_id
-            # You might need to pass budget_id as an argument or store it in self
-            cursor.execute("SELECT account_name FROM budget_accounts WHERE user_id = ?", (self.user_id,))
-            return [row[0] for row in cursor.fetchall()]
+            with self.db.reader() as cursor:
+                # Assuming you have a way to know the current budget_id
+                # You might need to pass budget_id as an argument or store it in self
+                cursor.execute("SELECT account_name FROM budget_accounts WHERE user_id = ?", (self.user_id,))
+                return [row[0] for row in cursor.fetchall()]
         except sqlcipher3.Error as e:
             print(f"Database error while fetching budget accounts: {e}")
             return []
 
-    def add_budget_account(self, budget_id, account_name, total_allocated_amount=0.0, current_amount=0.0, savings_goal=0.0, notes=None):
+    def add_budget_account(self, budget_id, account_name, total_allocated_amount=0, current_amount=0, savings_goal=0, notes=None):
         """Add a budget account for the user."""
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                """INSERT INTO budget_accounts (user_id, budget_id, account_name, total_allocated_amount, current_amount, savings_goal, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (self.user_id, budget_id, account_name, total_allocated_amount, current_amount, savings_goal, notes),
-            )
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """INSERT INTO budget_accounts (user_id, budget_id, account_name, total_allocated_amount, current_amount, savings_goal, notes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (self.user_id, budget_id, account_name, to_money(total_allocated_amount), to_money(current_amount),
+                     to_money(savings_goal), notes),
+                )
             print(f"Budget account '{account_name}' successfully added.")
             return True
         except sqlcipher3.Error as e:
@@ -385,9 +446,8 @@ class UserData:
     def delete_budget_account(self, account_name):
         """Delete a budget account for the user."""
         try:
-            cursor = self.db.cursor()
-            cursor.execute("DELETE FROM budget_accounts WHERE user_id = ? AND account_name = ?", (self.user_id, account_name))
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute("DELETE FROM budget_accounts WHERE user_id = ? AND account_name = ?", (self.user_id, account_name))
             print(f"Budget account '{account_name}' successfully deleted.")
             return True
         except sqlcipher3.Error as e:
@@ -397,12 +457,11 @@ class UserData:
     def update_budget_account_balance(self, account_name, new_balance):
         """Update the current balance of a specific budget account."""
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                "UPDATE budget_accounts SET current_amount = ? WHERE user_id = ? AND account_name = ?",
-                (new_balance, self.user_id, account_name),
-            )
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "UPDATE budget_accounts SET current_amount = ? WHERE user_id = ? AND account_name = ?",
+                    (to_money(new_balance), self.user_id, account_name),
+                )
             print(f"Budget account '{account_name}' current balance updated to {new_balance}.")
             return True
         except sqlcipher3.Error as e:
@@ -410,24 +469,25 @@ class UserData:
             return False
 
     def add_budget_accounts(self, budget_id, accounts):
-        """Add multiple budget accounts at once based on the new data structure."""
+        """Add multiple budget accounts at once based on the new data structure. All accounts are saved or none are."""
         try:
-            cursor = self.db.cursor()
-            for account_data in accounts:
-                cursor.execute(
+            with self.db.transaction() as cursor:
+                cursor.executemany(
                     """INSERT INTO budget_accounts (user_id, budget_id, account_name, total_allocated_amount, current_amount, savings_goal, notes)
                     VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        self.user_id,
-                        budget_id,
-                        account_data.get("name"),
-                        account_data.get("total_allocated", 0.0),
-                        account_data.get("total_allocated", 0.0), # Assuming initial current amount is the allocated amount
-                        account_data.get("savings_goal", 0.0),
-                        account_data.get("description"),
-                    ),
+                    [
+                        (
+                            self.user_id,
+                            budget_id,
+                            account_data.get("name"),
+                            to_money(account_data.get("total_allocated", 0)),
+                            to_money(account_data.get("total_allocated", 0)), # Assuming initial current amount is the allocated amount
+                            to_money(account_data.get("savings_goal", 0)),
+                            account_data.get("description"),
+                        )
+                        for account_data in accounts
+                    ],
                 )
-            self.db.commit_db()
             print(f"Multiple budget accounts successfully added.")
             return True
         except sqlcipher3.Error as e:
@@ -437,16 +497,15 @@ class UserData:
 
     def update_budget(self, name, amount):
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                "UPDATE budgets SET budget_name = ?, total_budgeted_amount = ? WHERE budget_id = ? AND user_id = ?",
-                (name, amount, self.budget_id, self.user_id)
-            )
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "UPDATE budgets SET budget_name = ?, total_budgeted_amount = ? WHERE budget_id = ? AND user_id = ?",
+                    (name, to_money(amount), self.budget_id, self.user_id)
+                )
             print("DB update committed.")
 
             self.budget_name = name
-            self.budget_amount = amount
+            self.budget_amount = to_money(amount)
         except Exception as e:
             print(f"Database update failed: {e}")
 
@@ -454,36 +513,36 @@ class UserData:
 
     def get_budget_details(self):
         try:
-            cursor = self.db.cursor()
-            cursor.execute("SELECT budget_id, budget_name, total_budgeted_amount FROM budgets WHERE user_id = ?", (self.user_id,))
-            result = cursor.fetchone()
+            with self.db.reader() as cursor:
+                cursor.execute("SELECT budget_id, budget_name, total_budgeted_amount FROM budgets WHERE user_id = ?", (self.user_id,))
+                result = cursor.fetchone()
 
             if result:
-                self.budget_id, self.budget_name, self.budget_amount = result
+                self.budget_id, self.budget_name, self.budget_amount = result[0], result[1], from_cents(result[2])
                 print(f"Budget found: ID = {self.budget_id}, Name = {self.budget_name}, Amount = {self.budget_amount}")
                 return self.budget_id, self.budget_name, self.budget_amount
             else:
                 print(f"No budget found for user_id: {self.user_id}")
                 self.budget_id = 0
                 self.budget_name = ""
-                self.budget_amount = 0
+                self.budget_amount = Money(0)
                 return None
 
         except sqlcipher3.Error as e:
             print(f"Database error while fetching budget details: {e}")
             self.budget_id = 0
             self.budget_name = ""
-            self.budget_amount = 0
+            self.budget_amount = Money(0)
             return None
 
 
     def get_all_budget_details(self):
         try:
-            cursor = self.db.cursor()
-            cursor.execute("SELECT budget_id, budget_name, total_budgeted_amount FROM budgets WHERE user_id = ?", (self.user_id,))
-            results = cursor.fetchall()
+            with self.db.reader() as cursor:
+                cursor.execute("SELECT budget_id, budget_name, total_budgeted_amount FROM budgets WHERE user_id = ?", (self.user_id,))
+                results = [(budget_id, name, from_cents(amount)) for budget_id, name, amount in cursor.fetchall()]
 
-            self.budgets = results if results else []
+            self.budgets = results
 
             if self.budgets:
                 print(f"{len(self.budgets)} budget(s) found for user_id: {self.user_id}")
@@ -509,12 +568,12 @@ class UserData:
     def get_all_budget_accounts(self):
         """Fetch all budget accounts for the current user and budget, and store them in self.accounts."""
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                "SELECT budget_accounts_id, account_name FROM budget_accounts WHERE user_id = ? AND budget_id = ?",
-                (self.user_id, self.budget_id)
-            )
-            results = cursor.fetchall()
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    "SELECT budget_accounts_id, account_name FROM budget_accounts WHERE user_id = ? AND budget_id = ?",
+                    (self.user_id, self.budget_id)
+                )
+                results = cursor.fetchall()
             self.account_names = results  # Store as list of tuples: [(id, name), ...]
             return self.account_names
         except sqlcipher3.Error as e:
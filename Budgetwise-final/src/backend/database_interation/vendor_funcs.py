@@ -25,8 +25,8 @@ class Vendor:
         try:
             query = """INSERT INTO vendors (user_id, vendor_name)
                        VALUES (?, ?)"""
-            self.db.cursor().execute(query, (user_id, name))
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (user_id, name))
         except sqlcipher3.Error as e:
             print(f"[create_vendor] SQLCipher Error: {e}")
 
@@ -42,7 +42,8 @@ class Vendor:
         """
         try:
             query = "SELECT vendor_id, vendor_name FROM vendors WHERE user_id = ?"
-            return self.db.cursor().execute(query, (user_id,)).fetchall()
+            with self.db.reader() as cursor:
+                return cursor.execute(query, (user_id,)).fetchall()
         except sqlcipher3.Error as e:
             print(f"[get_vendors_by_user_id] SQLCipher Error: {e}")
             return []
@@ -59,8 +60,8 @@ class Vendor:
             query = """UPDATE vendors 
                        SET vendor_name = ?
                        WHERE vendor_id = ?"""
-            self.db.cursor().execute(query, (name, vendor_id))
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (name, vendor_id))
         except sqlcipher3.Error as e:
             print(f"[update_vendor] SQLCipher Error: {e}")
 
@@ -73,8 +74,8 @@ class Vendor:
         """
         try:
             query = "DELETE FROM vendors WHERE vendor_id = ?"
-            self.db.cursor().execute(query, (vendor_id,))
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (vendor_id,))
         except sqlcipher3.Error as e:
             print(f"[delete_vendor] SQLCipher Error: {e}")
 
@@ -90,7 +91,8 @@ class Vendor:
         """
         try:
             query = "SELECT vendor_name FROM vendors WHERE vendor_id = ?"
-            result = self.db.cursor().execute(query, (vendor_id,)).fetchone()
+            with self.db.reader() as cursor:
+                result = cursor.execute(query, (vendor_id,)).fetchone()
             return result[0] if result else None
         except sqlcipher3.Error as e:
             print(f"[get_vendor_name] SQLCipher Error: {e}")
@@ -108,7 +110,8 @@ class Vendor:
         """
         try:
             query = "SELECT vendor_id, vendor_name FROM vendors WHERE vendor_id = ?"
-            result = self.db.cursor().execute(query, (vendor_id,)).fetchone()
+            with self.db.reader() as cursor:
+                result = cursor.execute(query, (vendor_id,)).fetchone()
             return result if result else None
         except sqlcipher3.Error as e:
             print(f"[get_vendor_details] SQLCipher Error: {e}")
@@ -121,13 +124,8 @@ class Vendor:
                     return []
 
                 query = "SELECT vendor_id, vendor_name FROM vendors where user_id = ?"
-                cursor = self.db.cursor()
-                
-                # Debugging: Check if cursor is created successfully
-                if cursor is None:
-                    return []
-
-                vendors = cursor.execute(query, (user_id,)).fetchall()
+                with self.db.reader() as cursor:
+                    vendors = cursor.execute(query, (user_id,)).fetchall()
 
                 # Debugging: Output the fetched vendors
                 return vendors
@@ -1,14 +1,16 @@
 import flet as ft
 from datetime import date, datetime
+from src.backend.database_interation.money import Money
 
 class AddTransaction(ft.AlertDialog):
-    def __init__(self, page, user_data, colors, trans_funcs, vend_funcs):
+    def __init__(self, page, user_data, colors, trans_funcs, vend_funcs, async_db):
         super().__init__(modal=True, bgcolor=colors.GREY_BACKGROUND)
 
         self.page = page
         self.user_data = user_data
         self.colors = colors
         self.trans_funcs = trans_funcs  # Should be an instance of TransClass
+        self.async_trans = async_db.wrap(trans_funcs)  # Saves run off the UI event loop
         self.vend_funcs = vend_funcs
         self.refresh = None  # To be set externally
 
@@ -220,13 +222,20 @@ class AddTransaction(ft.AlertDialog):
 
         self.page.update()
 
-    def save_transaction(self, e = None):
-        if self.update_trans:
-            # Call the update method if in update mode
-            self.update_transaction(e)
-        else:
-            # Otherwise, create a new transaction
-            self.confirm_transaction(e)
+    async def save_transaction(self, e = None):
+        # The button stays disabled while the save runs, so a double click cannot add the transaction twice
+        self.confirm_button.disabled = True
+        self.page.update()
+        try:
+            if self.update_trans:
+                # Call the update method if in update mode
+                await self.update_transaction(e)
+            else:
+                # Otherwise, create a new transaction
+                await self.confirm_transaction(e)
+        finally:
+            self.confirm_button.disabled = False
+            self.page.update()
 
 
     def populate_account_dropdown(self):
@@ -244,14 +253,14 @@ class AddTransaction(ft.AlertDialog):
             self.selected_account = e.control.value
         self.page.update()
 
-    def confirm_transaction(self, e):
+    async def confirm_transaction(self, e):
         # Input validation
         if not all([self.selected_vendor, self.selected_account, self.amount_field.value]):
             self.show_snackbar("Please fill all required fields.", self.colors.ERROR_RED)
             return
 
         try:
-            amount = float(self.amount_field.value)
+            amount = Money.from_dollars(self.amount_field.value)
         except ValueError:
             self.show_snackbar("Amount must be a number.", self.colors.ERROR_RED)
             return
@@ -271,7 +280,7 @@ class AddTransaction(ft.AlertDialog):
 
         print(f"Inserting into transactions: user_id: {self.selected_account} vendor_ID: {self.selected_vendor} transaction amount: {amount} description (optional): {description} recurring: {recurring} date: {transaction_date} status: {status}")
         # Perform transaction insert
-        success = self.trans_funcs.create_transaction(
+        success = await self.async_trans.create_transaction(
             account_id=self.selected_account,
             vendor_id=self.selected_vendor,
             transAmount=amount,
@@ -301,7 +310,7 @@ class AddTransaction(ft.AlertDialog):
         self.reset_dialog_fields()
         self.page.update()
     
-    def update_transaction(self, e):
+    async def update_transaction(self, e):
         # Validate input fields.
         print("update_transaction called")
         if not all([self.selected_vendor, self.selected_account, self.amount_field.value]):
@@ -310,7 +319,7 @@ class AddTransaction(ft.AlertDialog):
             return
 
         try:
-            amount = float(self.amount_field.value)
+            amount = Money.from_dollars(self.amount_field.value)
         except ValueError:
             self.show_snackbar("Amount must be a number.", self.colors.ERROR_RED)
             return
@@ -333,7 +342,7 @@ class AddTransaction(ft.AlertDialog):
             f"Date: {transaction_date}, Status: {status}")
 
         # Call the update_transaction method in trans_funcs
-        success = self.trans_funcs.update_transaction(
+        success = await self.async_trans.update_transaction(
             transaction_id=self.transaction_id,
             account_id=self.selected_account,
             vendor_id=self.selected_vendor,
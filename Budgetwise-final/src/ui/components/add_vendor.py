@@ -10,7 +10,6 @@ class AddVendor(ft.AlertDialog):
         self.vend_funcs = vend_funcs
         self.refresh = None
         self.db = self.user_data.db
-        self.cursor = self.db.cursor()
         self.vendor_name_list = []
         # Vendor input fields
         self.vendor_name_field = ft.TextField(
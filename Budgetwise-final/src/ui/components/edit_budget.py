@@ -1,4 +1,5 @@
 import flet as ft
+from src.backend.database_interation.money import Money, from_cents
 
 class EditBudget(ft.AlertDialog):
     def __init__(self, Page, user_data, colors, on_close=None):
@@ -10,7 +11,7 @@ class EditBudget(ft.AlertDialog):
         self.on_close = on_close
 
         self.initial_name = ""
-        self.initial_amount = 0.0
+        self.initial_amount = Money(0)
         self.budget = []
 
         # Prefill with current budget data
@@ -23,7 +24,6 @@ class EditBudget(ft.AlertDialog):
         self.current_name = self.user_data.budget_name
         self.current_amount = self.user_data.budget_amount
         self.db = self.user_data.db
-        self.cursor = self.db.cursor()
 
         self.budget_name = ft.TextField(
             label="Budget Name",
@@ -133,7 +133,7 @@ class EditBudget(ft.AlertDialog):
                 self.current_amount = budget_entry.get('total_budgeted_amount')
                 
         self.initial_name = self.current_name
-        self.initial_amount = float(self.current_amount)
+        self.initial_amount = Money.from_dollars(self.current_amount)
         self.refresh = refresh
     
     def updateinformation(self):
@@ -149,18 +149,19 @@ class EditBudget(ft.AlertDialog):
                 self.current_amount = budget_entry.get('total_budgeted_amount')
         
         self.initial_name = self.current_name
-        self.initial_amount = float(self.current_amount)
+        self.initial_amount = Money.from_dollars(self.current_amount)
         print(self.userid )
     
     def get_budget(self):
-        self.cursor.execute("""
-            SELECT budget_id, budget_name, total_budgeted_amount
-            FROM budgets
-            WHERE user_id = ?
-        """, (self.userid,))  # Fetch accounts specific to the logged-in user
+        with self.db.reader() as cursor:
+            cursor.execute("""
+                SELECT budget_id, budget_name, total_budgeted_amount
+                FROM budgets
+                WHERE user_id = ?
+            """, (self.userid,))  # Fetch accounts specific to the logged-in user
 
-        budget = self.cursor.fetchall()
-        return [{'budget_id': b[0], 'budget_name': b[1], 'total_budgeted_amount': b[2]} for b in budget]
+            budget = cursor.fetchall()
+        return [{'budget_id': b[0], 'budget_name': b[1], 'total_budgeted_amount': from_cents(b[2])} for b in budget]
 
 
 
@@ -197,9 +198,9 @@ class EditBudget(ft.AlertDialog):
             return
 
         try:
-            amount = float(amount_str)
-            if round(amount, 2) != amount:
+            if round(float(amount_str), 2) != float(amount_str):
                 raise ValueError()
+            amount = Money.from_dollars(amount_str)
         except ValueError:
             self.budget_amount.error_text = "Enter a valid amount (up to 2 decimal places)"
             self.budget_amount.update()
@@ -0,0 +1,130 @@
+import flet as ft
+from src.backend.database_interation.transaction_import import TransactionImporter, READERS
+
+class ImportTransactions(ft.AlertDialog):
+    """Dialog that imports a bank export file (CSV, OFX/QFX, QIF) into the user's transactions."""
+
+    def __init__(self, page, user_data, colors):
+        super().__init__(modal=True, bgcolor=colors.GREY_BACKGROUND)
+
+        self.page = page
+        self.user_data = user_data
+        self.colors = colors
+        self.refresh = None  # To be set externally
+        self.importer = TransactionImporter(user_data)
+        self.selected_path = None
+
+        # File picker lives in the page overlay; it returns the chosen file's path on desktop
+        self.file_picker = ft.FilePicker(on_result=self.file_picked)
+        self.page.overlay.append(self.file_picker)
+
+        self.file_button = ft.ElevatedButton(
+            "Choose File",
+            icon=ft.Icons.UPLOAD_FILE,
+            on_click=lambda e: self.file_picker.pick_files(
+                dialog_title="Import transactions",
+                allowed_extensions=[extension.lstrip(".") for extension in READERS],
+            ),
+        )
+        self.file_label = ft.Text("No file selected", color=self.colors.TEXT_COLOR)
+
+        # Rows whose account/category column does not match an account go here
+        self.account_dropdown = ft.Dropdown(label="Default Budget Account", options=[], value=None, filled=True, width=400)
+        self.credits_checkbox = ft.Checkbox(label="Also import deposits as refunds", value=False)
+        self.status_text = ft.Text("", color=self.colors.TEXT_COLOR)
+        self.progress = ft.ProgressRing(visible=False, width=24, height=24)
+
+        self.import_button = ft.TextButton(
+            "Import",
+            on_click=self.run_import,
+            style=ft.ButtonStyle(
+                color={ft.ControlState.DEFAULT: self.colors.TEXT_COLOR},
+                bgcolor={ft.ControlState.DEFAULT: self.colors.GREEN_BUTTON},
+                shape={ft.ControlState.DEFAULT: ft.RoundedRectangleBorder(radius=8)},
+            ),
+        )
+        cancel_button = ft.TextButton(
+            "Close", on_click=self.close_dialog,
+            style=ft.ButtonStyle(
+                color={ft.ControlState.DEFAULT: self.colors.TEXT_COLOR},
+                bgcolor={ft.ControlState.DEFAULT: self.colors.GREY_BACKGROUND},
+                shape={ft.ControlState.DEFAULT: ft.RoundedRectangleBorder(radius=8)},
+            ),
+        )
+
+        self.content = ft.Container(
+            width=500,
+            bgcolor=self.colors.GREY_BACKGROUND,
+            border_radius=10,
+            padding=20,
+            content=ft.Column(
+                controls=[
+                    ft.Text("Import Transactions", size=22, weight=ft.FontWeight.BOLD, color=self.colors.TEXT_COLOR),
+                    ft.Text("Bank exports in CSV, OFX/QFX or QIF format.", color=self.colors.TEXT_COLOR),
+                    ft.Row([self.file_button, self.file_label], spacing=10),
+                    self.account_dropdown,
+                    self.credits_checkbox,
+                    ft.Row([self.progress, self.status_text], spacing=10),
+                    ft.Row(controls=[self.import_button, cancel_button], alignment=ft.MainAxisAlignment.CENTER),
+                ],
+                tight=True,
+                spacing=15,
+            ),
+        )
+
+    def open_and_refresh(self):
+        """Refreshes the account list and opens the dialog."""
+        accounts = self.user_data.get_all_budget_accounts()
+        self.account_dropdown.options = [ft.dropdown.Option(key=str(acc[0]), text=acc[1]) for acc in accounts]
+        self.account_dropdown.value = str(accounts[0][0]) if accounts else None
+        self.selected_path = None
+        self.file_label.value = "No file selected"
+        self.status_text.value = ""
+        self.open = True
+        self.page.update()
+
+    def file_picked(self, e: ft.FilePickerResultEvent):
+        if e.files:
+            self.selected_path = e.files[0].path
+            self.file_label.value = e.files[0].name
+            self.page.update()
+
+    def run_import(self, e):
+        if not self.selected_path:
+            self.status_text.value = "Choose a file to import."
+            self.page.update()
+            return
+        if not self.account_dropdown.value:
+            self.status_text.value = "Create a budget account first."
+            self.page.update()
+            return
+
+        self.import_button.disabled = True
+        self.progress.visible = True
+        self.status_text.value = "Importing..."
+        self.page.update()
+        try:
+            result = self.importer.import_file(
+                self.selected_path,
+                int(self.account_dropdown.value),
+                include_credits=bool(self.credits_checkbox.value),
+            )
+            self.status_text.value = (
+                f"Imported {result['imported']} transactions in {result['seconds']:.1f}s "
+                f"({result['rows_per_second']:.0f} rows/s), skipped {result['skipped']}."
+            )
+            if self.refresh:
+                self.refresh()
+        except (OSError, ValueError) as ex:
+            self.status_text.value = f"Import failed: {ex}"
+        except Exception as ex:
+            print(f"An error occurred in run_import: {ex}")
+            self.status_text.value = "Import failed. No transactions were added."
+        finally:
+            self.import_button.disabled = False
+            self.progress.visible = False
+            self.page.update()
+
+    def close_dialog(self, e=None):
+        self.open = False
+        self.page.update()
@@ -1,4 +1,5 @@
 import flet as ft
+from src.backend.database_interation.money import Money
 
 class NavRail(ft.Container):
     def __init__(self, page: ft.Page, user_data):
@@ -49,7 +50,7 @@ class NavRail(ft.Container):
         self.user_data.username = ""
         self.user_data.budgets = []
         self.user_data.budget_name = ""
-        self.user_data.budget_amount = 0.0
+        self.user_data.budget_amount = Money(0)
         self.user_data.budget_id = 0
         # For sign up process
         self.user_data.temp_sign_up_data = {}
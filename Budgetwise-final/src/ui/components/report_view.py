@@ -0,0 +1,113 @@
+import flet as ft
+from collections import OrderedDict
+
+
+def build_report_view_model(report):
+    """
+    Precompute what the History and Reports pages display for a report, once per report.
+
+    A transaction dated after the report was created is "scheduled". Dates are stored as "YYYY-MM-DD"
+    (optionally followed by a time), so comparing the first ten characters orders them like the
+    datetimes they stand for, without parsing every transaction.
+
+    Returns:
+        list of dict: One entry per account with account_name, balance, total (every transaction),
+        spent (transactions that are not scheduled) and rows: [(description, amount, date, scheduled), ...].
+    """
+    accounts = report.get("report_data") or []
+    if not isinstance(accounts, list):
+        accounts = [accounts]
+    report_date = report.get("report_date")
+    report_day = report_date.strftime("%Y-%m-%d") if hasattr(report_date, "strftime") else str(report_date or "")[:10]
+
+    view_model = []
+    for account in accounts:
+        rows = []
+        total = spent = 0
+        for transaction in account.get("transactions", []):
+            amount = transaction.get("amount", 0)
+            day = (transaction.get("date") or "")[:10]
+            scheduled = bool(report_day) and day > report_day
+            total += amount
+            if not scheduled:
+                spent += amount
+            rows.append((transaction.get("description", ""), amount, day, scheduled))
+        view_model.append({
+            "account_name": account.get("account_name", "Unnamed Account"),
+            "balance": account.get("balance", 0),
+            "total": total,
+            "spent": spent,
+            "rows": rows,
+        })
+    return view_model
+
+
+class ReportView(ft.Container):
+    """
+    The rendered controls of one report. The view is isolated: updating the table that holds it only
+    sends the view's own properties (such as visible) and never walks its rows.
+    """
+
+    def is_isolated(self):
+        return True
+
+
+class ReportViewCache:
+    """
+    Keeps the rendered views of the most recently shown reports mounted in a host column, with only
+    the current one visible.
+
+    Showing a report that is still cached flips two visible flags, so switching back to it sends two
+    property changes to the client instead of every row again. A report shown for the first time is
+    built once with build_view and only its controls are added. The least recently shown view is
+    removed once more than capacity are mounted.
+    """
+
+    def __init__(self, host, build_view, capacity=6):
+        """
+        Args:
+            host (ft.Column): The table the views are shown in. Its controls are managed by the cache.
+            build_view (callable): build_view(report) returns the control for a report.
+            capacity (int): Number of report views kept mounted.
+        """
+        self.host = host
+        self.build_view = build_view
+        self.capacity = capacity
+        self._views = OrderedDict()
+        self._message = None
+
+    def show(self, report):
+        """Show the view of report (a dict from ReportStore.get_report), building it on first use."""
+        report_id = report["report_id"]
+        view = self._views.get(report_id)
+        if view is None:
+            view = ReportView(content=self.build_view(report), visible=False)
+            self._views[report_id] = view
+            self.host.controls.append(view)
+            while len(self._views) > self.capacity:
+                _, evicted = self._views.popitem(last=False)
+                self.host.controls.remove(evicted)
+        self._views.move_to_end(report_id)
+        self._show_only(view)
+
+    def show_message(self, control):
+        """Hide every report view and show control (e.g. a "no data" text) instead."""
+        self._show_only(None)
+        self._message = control
+        self.host.controls.insert(0, control)
+        self.host.update()
+
+    def clear(self):
+        """Unmount every cached view, e.g. when the reports they show are no longer valid."""
+        self._views.clear()
+        self._message = None
+        self.host.controls.clear()
+
+    def _show_only(self, visible_view):
+        if self._message is not None:
+            self.host.controls.remove(self._message)
+            self._message = None
+        for view in self._views.values():
+            view.visible = view is visible_view
+        if visible_view is not None:
+            self.host.update()
@@ -0,0 +1,39 @@
+import flet as ft
+
+
+def skeleton_bar(width, colors, height=16):
+    """A grey placeholder bar standing in for a value that is still loading."""
+    return ft.Container(
+        width=width,
+        height=height,
+        border_radius=4,
+        bgcolor=ft.Colors.with_opacity(0.15, colors.TEXT_COLOR),
+    )
+
+
+def skeleton_rows(widths, colors, count=5, spacing=10, height=16):
+    """
+    Placeholder rows shown while a page's data loads, laid out with the same column widths as the
+    real rows so nothing jumps when they are swapped in.
+
+    Arguments:
+        widths (list of int): The width of each column.
+        colors (Colors): The app colors.
+        count (int): How many rows to show.
+    """
+    return [
+        ft.Row(
+            [skeleton_bar(width, colors, height) for width in widths],
+            alignment=ft.MainAxisAlignment.CENTER,
+            spacing=spacing,
+        )
+        for _ in range(count)
+    ]
+
+
+def skeleton_data_rows(column_count, colors, count=5, width=80):
+    """Placeholder ft.DataRow rows for a DataTable with column_count columns."""
+    return [
+        ft.DataRow(cells=[ft.DataCell(skeleton_bar(width, colors)) for _ in range(column_count)])
+        for _ in range(count)
+    ]
@@ -1,11 +1,14 @@
+import asyncio
 import flet as ft
 from datetime import datetime, timedelta
-import json
 from src.ui.pages_scenes.accounts_popup import MakeEdits
 from src.ui.components.edit_budget import EditBudget
+from src.backend.database_interation.dates import iso_today
+from src.backend.database_interation.money import from_cents
+from src.ui.components.skeleton import skeleton_rows
 
 class Accounts(ft.View):
-    def __init__(self, page: ft.Page, user_data, NavRail, colors):
+    def __init__(self, page: ft.Page, user_data, NavRail, colors, trans_funcs, report_store, async_db):
         super().__init__(route="/accounts", bgcolor= colors.GREY_BACKGROUND)
 
         self.colors = colors
@@ -22,14 +25,18 @@ class Accounts(ft.View):
         # Initialize the elements you need
         self.page = page
         self.user_data = user_data
+        self.trans_funcs = trans_funcs
+        self.report_store = report_store
+        self.async_db = async_db
+        self.async_trans = async_db.wrap(trans_funcs)  # TransClass methods as awaitables
         self.userid = None
         
         # Use the existing database connection from user_data
         self.db = self.user_data.db
-        self.cursor = self.db.cursor()
 
         # Retrieve budget ID for the user
         self.budgetid = None 
+        self.load_generation = 0  # Bumped by every refresh_table, so a slower earlier load cannot overwrite a newer one
 
         self.table = ft.Column(spacing=10, alignment=ft.MainAxisAlignment.CENTER)
 
@@ -140,52 +147,48 @@ class Accounts(ft.View):
         self.page.update()
 
     def refresh_table(self):
-        """Updates the table dynamically and uses a custom meter to show overspending."""
-        self.table.controls.clear()  # Clear the table for refresh
+        """Show the table header over placeholder rows, then fill the table in once its data has loaded (see load_table)."""
+        self.load_generation += 1
+        self.table.controls = [self.table_header(), *skeleton_rows([200, 150, 300, 300, 50], self.colors, count=4)]
+        self.table.update()
+        self.page.run_task(self.load_table, self.load_generation)
 
-        # Table Header
-        self.table.controls.append(ft.Row([
+    def table_header(self):
+        return ft.Row([
             ft.Text("Account", weight="bold", width=200, color=self.colors.BLUE_BACKGROUND, text_align="center", size=24),
             ft.Text("Balance", weight="bold", width=150, color=self.colors.BLUE_BACKGROUND, text_align="center", size=24),
             ft.Text("Allocation", weight="bold", width=300, color=self.colors.BLUE_BACKGROUND, text_align="center", size=24),
             ft.Text("Transactions", weight="bold", width=300, color=self.colors.BLUE_BACKGROUND, text_align="center", size=24),
             ft.Text("", width=50)  # Placeholder for delete button column
-        ], alignment=ft.MainAxisAlignment.CENTER, spacing=10))
+        ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
+
+    async def load_table(self, generation):
+        """Read the accounts and this month's totals side by side off the event loop, then draw the table unless a newer refresh_table has started since."""
+        # Month spend comes from the account_month_totals summary (one row per account);
+        # only this month's future-dated transactions are read to split out scheduled spend.
+        now = datetime.now()
+        accounts, month_totals, scheduled_totals = await asyncio.gather(
+            self.async_db.run(self.get_accounts),
+            self.async_trans.get_account_month_totals(self.userid, now.year, now.month),
+            self.async_trans.get_scheduled_totals(self.userid, now.year, now.month, iso_today()),
+        )
+        if generation != self.load_generation:
+            return  # A newer load replaces this one
+        self.draw_table(accounts, month_totals, scheduled_totals)
+
+    def draw_table(self, accounts, month_totals, scheduled_totals):
+        """Updates the table dynamically and uses a custom meter to show overspending."""
+        self.table.controls.clear()  # Clear the table for refresh
+        self.table.controls.append(self.table_header())
 
-        accounts = self.get_accounts()
         for account in accounts:
             # Extract basic account information
             budget_accounts_id = account['budget_accounts_id']
             account_name = account['account_name']
             allocated_balance = account['total_allocated_amount']
 
-            current_month = datetime.now().month
-            current_year = datetime.now().year
-
-            self.cursor.execute("""
-                SELECT description, amount, transaction_date 
-                FROM transactions 
-                WHERE budget_accounts_id = ? AND user_id = ?
-                AND strftime('%m', transaction_date) = ? 
-                AND strftime('%Y', transaction_date) = ?
-            """, (budget_accounts_id, self.userid, f"{current_month:02d}", f"{current_year}"))
-            transactions = self.cursor.fetchall()
-
-
-            # Use report_creation_dt to separate completed from scheduled transactions.
-            report_creation_dt = datetime.now()  # or your specific report creation timestamp
-            completed_total = 0.0
-            # Prepare a list for displaying transactions (including scheduled status)
-            display_transactions = []
-            for description, amount, transaction_date in transactions:
-                # Assume transaction_date is formatted as "YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS"
-                transaction_dt = datetime.strptime(transaction_date.split()[0], "%Y-%m-%d")
-                if transaction_dt <= report_creation_dt:
-                    completed_total += amount
-                    status = ""  # Transaction is finalized
-                else:
-                    status = "Scheduled"  # Future transaction
-                display_transactions.append((description, amount, transaction_date, status))
+            # Completed spend excludes transactions scheduled later this month.
+            completed_total = month_totals.get(budget_accounts_id, 0) - scheduled_totals.get(budget_accounts_id, 0)
 
             # Calculate updated balance using only completed transactions.
             updated_balance = allocated_balance - completed_total
@@ -193,46 +196,9 @@ class Accounts(ft.View):
             # Create the custom meter using the allocated and updated balances.
             custom_meter = self.create_custom_meter(allocated_balance, updated_balance, width=300, height=10)
 
-            # Build the Sub-Table Header (adding a "Status" column if needed).
-            sub_table_header = ft.Row(
-                controls=[
-                    ft.Text("Description", weight="bold", width=200, text_align="center",color=self.colors.GREEN_BUTTON, size=18),
-                    ft.Text("Amount", weight="bold", width=150, text_align="center",color=self.colors.GREEN_BUTTON, size=18),
-                    ft.Text("Transaction Date", weight="bold", width=200, text_align="center",color=self.colors.GREEN_BUTTON, size=18),
-                    ft.Text("Status", weight="bold", width=100, text_align="center",color=self.colors.GREEN_BUTTON, size=18),
-                ],
-                spacing=0,
-                alignment=ft.MainAxisAlignment.CENTER,
-                vertical_alignment=ft.CrossAxisAlignment.CENTER,
-            )
-
-            # Build the Sub-Table Rows for transactions.
-            sub_table_rows = ft.Column(
-                controls=[
-                    ft.Row(
-                        controls=[
-                            ft.Text(description, width=200, text_align="center",color=self.colors.TEXT_COLOR, size=16),
-                            ft.Text(f"${amount:.2f}", width=150, text_align="center",color=self.colors.TEXT_COLOR, size=16),
-                            ft.Text(transaction_date, width=200, text_align="center",color=self.colors.TEXT_COLOR, size=16),
-                            ft.Text(
-                                status,
-                                width=100,
-                                text_align="center",
-                                size=16,
-                                color=self.colors.BLUE_BACKGROUND if status == "Scheduled" else self.colors.TEXT_COLOR,
-                            ),
-                        ],
-                        spacing=0,
-                        alignment=ft.MainAxisAlignment.CENTER,
-                        vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                    ) for description, amount, transaction_date, status in display_transactions
-                ],
-                spacing=5,
-            )
-
-            # Wrap the sub-table in a Container (initially hidden)
+            # The sub-table rows are only queried the first time the account is expanded.
             sub_table = ft.Container(
-                content=ft.Column([sub_table_header, sub_table_rows]),
+                content=None,
                 visible=False,
                 padding=10,
             )
@@ -240,7 +206,7 @@ class Accounts(ft.View):
             # Toggle Button for Sub-Table
             toggle_button = ft.ElevatedButton(
                 text="View Transactions",
-                on_click=lambda e, container=sub_table: self.toggle_sub_table(container),
+                on_click=lambda e, container=sub_table, a=budget_accounts_id: self.toggle_sub_table(container, a),
                 width=150
             )
 
@@ -282,22 +248,77 @@ class Accounts(ft.View):
 
 
 
-    def toggle_sub_table(self, container):
-        """Toggle visibility of a sub-table."""
+    def toggle_sub_table(self, container, budget_accounts_id):
+        """Toggle visibility of a sub-table, loading its transactions the first time it is shown."""
+        if container.content is None:
+            container.content = self.build_sub_table(budget_accounts_id)
         container.visible = not container.visible
         self.table.update()
 
+    def build_sub_table(self, budget_accounts_id):
+        """Builds the transaction sub-table for one account's current month."""
+        now = datetime.now()
+        transactions = self.trans_funcs.get_account_month_transactions(budget_accounts_id, now.year, now.month)
+
+        # Transactions dated after today are scheduled. Dates are stored as "YYYY-MM-DD", so they compare as strings.
+        today = iso_today()
+        # Prepare a list for displaying transactions (including scheduled status)
+        display_transactions = [
+            (description, amount, transaction_date, "" if transaction_date <= today else "Scheduled")
+            for _, description, amount, transaction_date in transactions
+        ]
+
+        # Build the Sub-Table Header (adding a "Status" column if needed).
+        sub_table_header = ft.Row(
+            controls=[
+                ft.Text("Description", weight="bold", width=200, text_align="center",color=self.colors.GREEN_BUTTON, size=18),
+                ft.Text("Amount", weight="bold", width=150, text_align="center",color=self.colors.GREEN_BUTTON, size=18),
+                ft.Text("Transaction Date", weight="bold", width=200, text_align="center",color=self.colors.GREEN_BUTTON, size=18),
+                ft.Text("Status", weight="bold", width=100, text_align="center",color=self.colors.GREEN_BUTTON, size=18),
+            ],
+            spacing=0,
+            alignment=ft.MainAxisAlignment.CENTER,
+            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+
+        # Build the Sub-Table Rows for transactions.
+        sub_table_rows = ft.Column(
+            controls=[
+                ft.Row(
+                    controls=[
+                        ft.Text(description, width=200, text_align="center",color=self.colors.TEXT_COLOR, size=16),
+                        ft.Text(f"${amount:.2f}", width=150, text_align="center",color=self.colors.TEXT_COLOR, size=16),
+                        ft.Text(transaction_date, width=200, text_align="center",color=self.colors.TEXT_COLOR, size=16),
+                        ft.Text(
+                            status,
+                            width=100,
+                            text_align="center",
+                            size=16,
+                            color=self.colors.BLUE_BACKGROUND if status == "Scheduled" else self.colors.TEXT_COLOR,
+                        ),
+                    ],
+                    spacing=0,
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                ) for description, amount, transaction_date, status in display_transactions
+            ],
+            spacing=5,
+        )
+
+        return ft.Column([sub_table_header, sub_table_rows])
+
     # TODO: Change the select statement to pull only budget_accounts tied to a specific user_id
     def get_accounts(self):
         # Include a WHERE clause to filter by user_id
-        self.cursor.execute("""
-            SELECT budget_accounts_id, account_name, total_allocated_amount
-            FROM budget_accounts 
-            WHERE user_id = ?
-        """, (self.userid,))  # Use self.userid to fetch accounts specific to the logged-in user
+        with self.db.reader() as cursor:
+            cursor.execute("""
+                SELECT budget_accounts_id, account_name, total_allocated_amount
+                FROM budget_accounts 
+                WHERE user_id = ?
+            """, (self.userid,))  # Use self.userid to fetch accounts specific to the logged-in user
 
-        accounts = self.cursor.fetchall()
-        return [{'budget_accounts_id': account[0], 'account_name': account[1], 'total_allocated_amount': account[2]} for account in accounts]
+            accounts = cursor.fetchall()
+        return [{'budget_accounts_id': account[0], 'account_name': account[1], 'total_allocated_amount': from_cents(account[2])} for account in accounts]
 
     def create_custom_meter(self, allocated_balance, current_balance, width=300, height=10):
         """
@@ -358,11 +379,12 @@ class Accounts(ft.View):
     def delete_account(self, account):
         """Deletes an account if no related transactions exist and refreshes the table."""
         # Check for related transactions
-        self.cursor.execute(
-            "SELECT COUNT(*) FROM transactions WHERE budget_accounts_id = ?",
-            (account,)
-        )
-        transaction_count = self.cursor.fetchone()[0]  # Get the count
+        with self.db.reader() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM transactions WHERE budget_accounts_id = ?",
+                (account,)
+            )
+            transaction_count = cursor.fetchone()[0]  # Get the count
 
         if transaction_count > 0:
             # Build an error message.
@@ -374,11 +396,11 @@ class Accounts(ft.View):
             self.page.snack_bar.open = True
             self.page.update()
         else:
-            self.cursor.execute(
-                "DELETE FROM budget_accounts WHERE budget_accounts_id = ? AND user_id = ?",
-                (account, self.userid)
-            )
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "DELETE FROM budget_accounts WHERE budget_accounts_id = ? AND user_id = ?",
+                    (account, self.userid)
+                )
             self.refresh_table()
             self.edits_page.refresh_accounts_list()
 
@@ -391,41 +413,28 @@ class Accounts(ft.View):
 
             # Gather data from the accounts table
             accounts = self.get_accounts()  # Assuming this method returns all accounts
-            for account in accounts:
-                budget_accounts_id, account_name, balance = account['budget_accounts_id'], account['account_name'], account['total_allocated_amount']
 
-                # Calculate updated balance and transactions
-                current_month = datetime.now().month
-                current_year = datetime.now().year
+            # Every transaction of the current month, grouped by account, in one query
+            now = datetime.now()
+            month_transactions = self.trans_funcs.get_month_transactions_by_account(self.userid, now.year, now.month)
 
-                self.cursor.execute("""
-                    SELECT description, amount, transaction_date 
-                    FROM transactions 
-                    WHERE budget_accounts_id = ? AND user_id = ?
-                    AND strftime('%m', transaction_date) = ? 
-                    AND strftime('%Y', transaction_date) = ?
-                """, (budget_accounts_id, self.userid, f"{current_month:02d}", f"{current_year}"))
-                transactions = self.cursor.fetchall()
+            for account in accounts:
+                budget_accounts_id, account_name, balance = account['budget_accounts_id'], account['account_name'], account['total_allocated_amount']
+                transactions = month_transactions.get(budget_accounts_id, [])
 
-                # Format account data with transactions
+                # Format account data with transactions (reports keep amounts as Money, in cents)
                 account_data = {
                     "account_name": account_name,
-                    "balance": balance,
+                    "balance": from_cents(balance),
                     "transactions": [
-                        {"description": t[0], "amount": t[1], "date": t[2]} for t in transactions
+                        {"transaction_id": t[0], "description": t[1], "amount": from_cents(t[2]), "date": t[3]} for t in transactions
                     ]
                 }
                 report_data.append(account_data)
 
-            # Serialize the report data as JSON
-            report_json = json.dumps(report_data)
-
-            # Insert the report into the reports table
-            self.cursor.execute("""
-                INSERT INTO reports (user_id, report_type, report_data) 
-                VALUES (?, ?, ?)
-            """, (self.userid, 1, report_json))
-            self.db.commit_db()
+            # Store the report as a compressed snapshot in the reports table
+            if self.report_store.save_report(self.userid, 1, report_data) is None:
+                return
 
             print("Report stored successfully!")
 
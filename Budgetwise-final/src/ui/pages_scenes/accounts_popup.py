@@ -1,5 +1,6 @@
 import flet as ft
 import datetime as dt
+from src.backend.database_interation.money import Money, from_cents
 class MakeEdits(ft.AlertDialog):
     def __init__(self, user_data, colors):
         super().__init__()
@@ -12,14 +13,13 @@ class MakeEdits(ft.AlertDialog):
         self.userid = 1
         
         self.db = self.user_data.db
-        self.cursor = self.db.cursor()
 
         # Initialize accounts and leftover amount
         self.budgets = []
         self.accounts = []
         self.current_account_id = 0
-        self.leftover_amount = 9999.99
-        self.total_allocated_amount = 9999.99
+        self.leftover_amount = Money(999999)
+        self.total_allocated_amount = Money(999999)
         self.budgetName = "PlaceHolder"
         self.budget_id = 0
 
@@ -119,10 +119,11 @@ class MakeEdits(ft.AlertDialog):
         # ... (same as before)
         total_allocated = sum(account["total_allocated_amount"] for account in self.accounts)
         self.leftover_amount = self.total_allocated_amount - total_allocated
-        self.cursor.execute(
-        "UPDATE budgets SET leftover_amount = ? WHERE user_id = ? AND budget_id = ?",
-        (self.leftover_amount, self.userid, self.budget_id)
-    )
+        with self.db.transaction() as cursor:
+            cursor.execute(
+                "UPDATE budgets SET leftover_amount = ? WHERE user_id = ? AND budget_id = ?",
+                (self.leftover_amount, self.userid, self.budget_id)
+            )
         self.budget_info.value = (
             f"Budget: {self.budgetName} (${self.total_allocated_amount}) - "
             f"Leftover: ${self.leftover_amount}"
@@ -154,62 +155,52 @@ class MakeEdits(ft.AlertDialog):
             self.budgetName = budget.get('budget_name', 'PlaceHolder')
         else:
             # If there are no budgets returned, you can keep defaults.
-            self.leftover_amount = 0.0
-            self.total_allocated_amount = 0.0
+            self.leftover_amount = Money(0)
+            self.total_allocated_amount = Money(0)
             self.budgetName = "PlaceHolder"
 
     def get_budget(self):
-        self.cursor.execute("""
-                SELECT budget_id, total_budgeted_amount, leftover_amount, budget_name
-                FROM budgets
-                WHERE user_id = ?
-            """, (self.userid,)) 
-        budgets = self.cursor.fetchall()
+        with self.db.reader() as cursor:
+            cursor.execute("""
+                    SELECT budget_id, total_budgeted_amount, leftover_amount, budget_name
+                    FROM budgets
+                    WHERE user_id = ?
+                """, (self.userid,)) 
+            budgets = cursor.fetchall()
 
         return [
                 {
                     'budget_id': account[0],
-                    'total_budgeted_amount': account[1],
-                    'leftover_amount': account[2],
+                    'total_budgeted_amount': from_cents(account[1]),
+                    'leftover_amount': from_cents(account[2]),
                     'budget_name': account[3]
                 }
                 for account in budgets
             ]
     def get_accounts(self):
-        # Get account information for the logged-in user
-        self.cursor.execute("""
-            SELECT budget_accounts_id, account_name, total_allocated_amount, notes
-            FROM budget_accounts 
-            WHERE user_id = ?
-        """, (self.userid,))
-        accounts = self.cursor.fetchall()
-
-        current_month = dt.datetime.now().month
-        current_year = dt.datetime.now().year
-
-        results = []
-        for account in accounts:
-            budget_accounts_id = account[0]
-            # Fetch just the 'amount' for transactions for the current month and year
-            self.cursor.execute("""
-                SELECT COALESCE(SUM(amount), 0)
-                FROM transactions 
-                WHERE budget_accounts_id = ? AND user_id = ?
-                AND strftime('%m', transaction_date) = ? 
-                AND strftime('%Y', transaction_date) = ?
-            """, (budget_accounts_id, self.userid, f"{current_month:02d}", f"{current_year}"))
-            total_transaction_amount = self.cursor.fetchone()[0]
+        # Get account information for the logged-in user, with this month's spend
+        # read from the trigger-maintained account_month_totals summary.
+        with self.db.reader() as cursor:
+            cursor.execute("""
+                SELECT b.budget_accounts_id, b.account_name, b.total_allocated_amount, b.notes,
+                       COALESCE(m.total_amount, 0)
+                FROM budget_accounts b
+                LEFT JOIN account_month_totals m
+                    ON m.budget_accounts_id = b.budget_accounts_id AND m.month = ?
+                WHERE b.user_id = ?
+            """, (dt.datetime.now().strftime("%Y-%m"), self.userid))
+            accounts = cursor.fetchall()
 
-            
-            results.append({
+        return [
+            {
                 'budget_accounts_id': account[0],
                 'account_name': account[1],
-                'total_allocated_amount': account[2],
+                'total_allocated_amount': from_cents(account[2]),
                 'notes': account[3],
-                'total_transaction_amount': total_transaction_amount  # sum of these amounts
-            })
-
-        return results
+                'total_transaction_amount': Money(account[4])  # sum of this month's amounts
+            }
+            for account in accounts
+        ]
 
 
 
@@ -283,7 +274,7 @@ class MakeEdits(ft.AlertDialog):
             return
 
         try:
-            allocated = float(allocated_str)
+            allocated = Money.from_dollars(allocated_str)
         except ValueError:
             self.account_allocated_field.error_text = "Please enter a valid number"
             self.account_allocated_field.update()
@@ -305,20 +296,16 @@ class MakeEdits(ft.AlertDialog):
             
             # --- New Checker for Transactions Total ---
             # Ensure that the new allocated amount is not lower than the sum of existing transactions.
-            current_month = dt.datetime.now().month
-            current_year = dt.datetime.now().year
-
-            self.cursor.execute(
-                """
-                SELECT COALESCE(SUM(amount), 0)
-                FROM transactions
-                WHERE budget_accounts_id = ?
-                AND strftime('%m', transaction_date) = ?
-                AND strftime('%Y', transaction_date) = ?
-                """,
-                (self.current_account_id, f"{current_month:02d}", f"{current_year}")
-            )
-            transactions_sum = self.cursor.fetchone()[0]
+            with self.db.reader() as cursor:
+                cursor.execute(
+                    """
+                    SELECT COALESCE(SUM(total_amount), 0)
+                    FROM account_month_totals
+                    WHERE budget_accounts_id = ? AND month = ?
+                    """,
+                    (self.current_account_id, dt.datetime.now().strftime("%Y-%m"))
+                )
+                transactions_sum = Money(cursor.fetchone()[0])
             if allocated < transactions_sum:
                 self.account_allocated_field.error_text = (
                     f"Allocated amount (${allocated}) cannot be less than the total transaction amount (${transactions_sum})."
@@ -333,35 +320,38 @@ class MakeEdits(ft.AlertDialog):
                 return
 
         try:
-            if hasattr(self, "current_account_id") and self.current_account_id is not None:
-                # Update the existing account using its primary key.
-                update_query = """
-                    UPDATE budget_accounts
-                    SET account_name = ?, total_allocated_amount = ?, notes = ?
-                    WHERE budget_accounts_id = ?
-                """
-                update_params = (name, allocated, description, self.current_account_id)
-                self.cursor.execute(update_query, update_params)
-                print("Account updated.")
-                # Clear the current_account_id state to switch back to insertion mode.
-                self.current_account_id = None
-            else:
-                # Insert a new account.
-                insert_query = """
-                    INSERT INTO budget_accounts (user_id, budget_id, account_name, total_allocated_amount, notes)
-                    VALUES (?, ?, ?, ?, ?)
-                """
-                insert_params = (self.userid, self.budget_id, name, allocated, description)
-                self.cursor.execute(insert_query, insert_params)
-                print("Account inserted.")
-
-            self.db.commit_db()  # Commit the transaction.
+            # The account change and the budget's new leftover amount are committed together.
+            with self.db.transaction() as cursor:
+                if hasattr(self, "current_account_id") and self.current_account_id is not None:
+                    # Update the existing account using its primary key.
+                    update_query = """
+                        UPDATE budget_accounts
+                        SET account_name = ?, total_allocated_amount = ?, notes = ?
+                        WHERE budget_accounts_id = ?
+                    """
+                    update_params = (name, allocated, description, self.current_account_id)
+                    cursor.execute(update_query, update_params)
+                    print("Account updated.")
+                else:
+                    # Insert a new account.
+                    insert_query = """
+                        INSERT INTO budget_accounts (user_id, budget_id, account_name, total_allocated_amount, notes)
+                        VALUES (?, ?, ?, ?, ?)
+                    """
+                    insert_params = (self.userid, self.budget_id, name, allocated, description)
+                    cursor.execute(insert_query, insert_params)
+                    print("Account inserted.")
+
+                # Update your leftover amount from the changed accounts.
+                self.accounts = self.get_accounts()
+                self.update_leftover()
+            # Clear the current_account_id state to switch back to insertion mode.
+            self.current_account_id = None
         except Exception as ex:
             print("Error handling account:", ex)
             return
 
-        # Update your leftover amount and refresh UI elements.
-        self.update_leftover()
+        # Refresh UI elements.
         self.refresh()
         self.refresh_accounts_list()
 
@@ -380,11 +370,12 @@ class MakeEdits(ft.AlertDialog):
     def delete_account_from_db(self, account):
         """Deletes an account if no related transactions exist and refreshes the table."""
         # Check for related transactions
-        self.cursor.execute(
-            "SELECT COUNT(*) FROM transactions WHERE budget_accounts_id = ?",
-            (account,)
-        )
-        transaction_count = self.cursor.fetchone()[0]  # Get the count
+        with self.db.reader() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM transactions WHERE budget_accounts_id = ?",
+                (account,)
+            )
+            transaction_count = cursor.fetchone()[0]  # Get the count
 
         if transaction_count > 0:
             # Inform the user that the account can't be deleted
@@ -397,11 +388,11 @@ class MakeEdits(ft.AlertDialog):
             self.page.update()
         else:
             # Proceed with deletion
-            self.cursor.execute(
-                "DELETE FROM budget_accounts WHERE budget_accounts_id = ? AND user_id = ?",
-                (account, self.userid)
-            )
-            self.db.commit_db()
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "DELETE FROM budget_accounts WHERE budget_accounts_id = ? AND user_id = ?",
+                    (account, self.userid)
+                )
             self.refresh_accounts_list()
             self.refresh()
     
@@ -1,5 +1,6 @@
 from time import sleep
 import flet as ft
+from src.backend.database_interation.money import Money
 
 
 class AddBudgetAccounts(ft.View):
@@ -167,7 +168,7 @@ class AddBudgetAccounts(ft.View):
             return
 
         try:
-            allocated = float(allocated_str)
+            allocated = Money.from_dollars(allocated_str)
         except ValueError:
             self.account_allocated_field.error_text = "Please enter a valid number"
             self.account_allocated_field.update()
@@ -183,7 +184,7 @@ class AddBudgetAccounts(ft.View):
             "name": name,
             "total_allocated": allocated,
             "current_amount": allocated,
-            "savings_goal": 0.0,
+            "savings_goal": Money(0),
             "description": description,
         }
         self.accounts.append(account)
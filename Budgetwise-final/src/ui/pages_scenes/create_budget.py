@@ -1,5 +1,6 @@
 import flet as ft
 import re
+from src.backend.database_interation.money import Money
 
 class CreateBudget(ft.View):
     def __init__(self, page: ft.Page, user_data, colors):
@@ -128,8 +129,8 @@ class CreateBudget(ft.View):
             self.budget_amount.update()
             return
 
-        # Convert amount to float after validation
-        budget_amount = float(budget_amount)
+        # Convert amount to Money (integer cents) after validation
+        budget_amount = Money.from_dollars(budget_amount)
 
         # Store the information temporarily in user_data
         self.user_data.budget_name = budget_name
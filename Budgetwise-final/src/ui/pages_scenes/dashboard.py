@@ -1,8 +1,11 @@
+import asyncio
 import flet as ft
-import datetime
+from src.backend.database_interation.dates import iso_today
+from src.backend.database_interation.money import Money, from_cents
+from src.ui.components.skeleton import skeleton_rows
 
 class Dashboard(ft.View):
-    def __init__(self, page: ft.Page, user_data, NavRail, colors):
+    def __init__(self, page: ft.Page, user_data, NavRail, colors, async_db):
         super().__init__(route="/dashboard", bgcolor=colors.GREY_BACKGROUND)
     
         self.page = page
@@ -10,9 +13,9 @@ class Dashboard(ft.View):
         self.controls.append(ft.Text("Dashboard"))
         self.colors = colors
 
-        # Database
+        # Database: the page's queries run on async_db's executor (see load_dashboard)
         self.db = user_data.db
-        self.cursor = user_data.db.cursor()
+        self.async_db = async_db
 
         if self.page.session.get("userID") != None:
             print("Dashboard successfully retrieved userID")
@@ -29,8 +32,10 @@ class Dashboard(ft.View):
             alignment=ft.MainAxisAlignment.START
         )
 
-        self.total_budget = self.get_total_budget()
-        self.budget_accounts = self.get_accounts()
+        # Filled in by load_dashboard each time the page is shown
+        self.total_budget = Money(0)
+        self.budget_accounts = []
+        self.load_generation = 0  # Bumped by every did_mount, so a slower earlier load cannot overwrite a newer one
 
         # Convert accounts to input format
         input_accounts = [{
@@ -159,22 +164,43 @@ class Dashboard(ft.View):
         #     self.userID = 1
         if self.user_data.user_id != 0:
             self.userID = self.user_data.user_id
-        self.total_budget = self.get_total_budget()
-        self.budget_accounts = self.get_accounts()
         self.budget_name_label.controls[1].value = self.user_data.budget_name
-        self.draw_transaction_table()
+        self.load_generation += 1
+        self.show_loading()
+        self.page.update()
+        self.page.run_task(self.load_dashboard, self.load_generation)
+
+    def show_loading(self):
+        """Show placeholder rows in the upcoming transactions table until load_dashboard fills it in."""
+        self.transaction_table.controls = [
+            ft.Text("Upcoming Transactions", color=self.colors.TEXT_COLOR, weight="bold", size=20),
+            *skeleton_rows([120, 180, 150, 100], self.colors, count=4),
+        ]
+
+    async def load_dashboard(self, generation):
+        """Read the budget, accounts and upcoming transactions side by side off the event loop, then draw them unless a newer did_mount has started since."""
+        total_budget, budget_accounts, transactions = await asyncio.gather(
+            self.async_db.run(self.get_total_budget),
+            self.async_db.run(self.get_accounts),
+            self.async_db.run(self.get_transactions),
+        )
+        if generation != self.load_generation:
+            return  # A newer load replaces this one
+        self.total_budget, self.budget_accounts = total_budget, budget_accounts
+        self.draw_transaction_table(transactions)
         self.update_pie_chart()
         self.input_panel.update_view(self.total_budget, self.budget_accounts)
         self.page.update()
 
     def get_accounts(self):
-        self.cursor.execute("SELECT budget_accounts_id, account_name, total_allocated_amount, current_amount FROM budget_accounts WHERE user_id = ?", (self.userID,))
-        accounts = self.cursor.fetchall()
+        with self.db.reader() as cursor:
+            cursor.execute("SELECT budget_accounts_id, account_name, total_allocated_amount, current_amount FROM budget_accounts WHERE user_id = ?", (self.userID,))
+            accounts = cursor.fetchall()
         return [{
             'budget_accounts_id': account[0], 
             'account_name': account[1], 
-            'total_allocated_amount': account[2], 
-            'current_amount': account[3]
+            'total_allocated_amount': from_cents(account[2]), 
+            'current_amount': from_cents(account[3])
         } for account in accounts]
     
     def get_transactions(self):
@@ -183,31 +209,32 @@ class Dashboard(ft.View):
                    FROM transactions t
                    JOIN vendors v ON t.vendor_id = v.vendor_id
                    JOIN budget_accounts ba ON t.budget_accounts_id = ba.budget_accounts_id
-                   WHERE t.user_id = ? AND t.transaction_date > CURRENT_TIMESTAMP
-                   ORDER BY t.transaction_date ASC""" # Optional: Order by date
-        self.cursor.execute(query, (self.userID,))
-        transactions = self.cursor.fetchall()
+                   WHERE t.user_id = ? AND t.transaction_date > ? AND t.transaction_date IS date(t.transaction_date)
+                   ORDER BY t.transaction_date ASC""" # Upcoming transactions: dated after today's local date (unreadable dates sort last and are skipped)
+        with self.db.reader() as cursor:
+            cursor.execute(query, (self.userID, iso_today()))
+            transactions = cursor.fetchall()
         # Update dictionary keys to match new query results
         return [{
             'account_name': transaction[0],
             'vendor_name': transaction[1],
             'transaction_date': transaction[2],
-            'amount': transaction[3]
+            'amount': from_cents(transaction[3])
         } for transaction in transactions]
 
     def get_total_budget(self):
-        self.cursor.execute("SELECT total_budgeted_amount FROM budgets WHERE user_id = ?", (self.userID,))
-        result = self.cursor.fetchone()
-        return result[0] if result else 5000
+        with self.db.reader() as cursor:
+            cursor.execute("SELECT total_budgeted_amount FROM budgets WHERE user_id = ?", (self.userID,))
+            result = cursor.fetchone()
+        return from_cents(result[0]) if result else Money(500000)
     
     def save_budget(self, e):
-        for account in self.input_panel.accounts:
-            original_data = account['original_data']
-            self.cursor.execute(
+        # Every account's allocation is saved in one commit
+        with self.db.transaction() as cursor:
+            cursor.executemany(
                 "UPDATE budget_accounts SET total_allocated_amount = ? WHERE budget_accounts_id = ?",
-                (account['allocated'], original_data['budget_accounts_id'])
+                [(account['allocated'], account['original_data']['budget_accounts_id']) for account in self.input_panel.accounts]
             )
-        self.db.commit_db()
 
         snackbar = ft.SnackBar(
             content=ft.Text("Budget saved successfully!"),
@@ -222,7 +249,8 @@ class Dashboard(ft.View):
 
 # Inside the Dashboard class
 
-    def draw_transaction_table(self):
+    def draw_transaction_table(self, transactions):
+        """Draw the upcoming transactions returned by get_transactions."""
         self.transaction_table.controls.clear()
         self.transaction_table.controls.append(
             ft.Text("Upcoming Transactions",
@@ -230,8 +258,6 @@ class Dashboard(ft.View):
                     weight="bold",
                     size=20))
 
-        transactions = self.get_transactions()
-
         if len(transactions) == 0:
             self.transaction_table.controls.append(
                 ft.Text("No upcoming transactions",
@@ -263,19 +289,9 @@ class Dashboard(ft.View):
                 # Get data using new keys
                 account_name = transaction['account_name']
                 vendor_name = transaction['vendor_name']
-                timestamp_str = transaction['transaction_date']
+                date_str = transaction['transaction_date']  # Stored as "YYYY-MM-DD", shown as is
                 amount = transaction['amount']
 
-                try:
-                    timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d')
-                    date_str = timestamp.strftime('%Y-%m-%d') # Format date
-                except (ValueError, TypeError):
-                     # Handle cases where timestamp_str might be None or already a date object, or wrong format
-                    if isinstance(timestamp_str, datetime.date):
-                         date_str = timestamp_str.strftime('%Y-%m-%d')
-                    else:
-                         date_str = str(timestamp_str) # Fallback
-
                 amount_str = f"${amount:.2f}"
 
                 # Create the transaction row with the NEW order and widths
@@ -354,7 +370,7 @@ class Dashboard(ft.View):
         if not hasattr(self, 'pie_chart') or not self.pie_chart:
             return
 
-        accounts = self.get_accounts()
+        accounts = self.budget_accounts  # Loaded by load_dashboard and kept current by the input panel
         total_allocated = sum(account['total_allocated_amount'] for account in accounts)
         if total_allocated == 0:
             return
@@ -424,7 +440,7 @@ class BudgetInputPanel:
     def create_input_change_handler(self, account):
         def handler(e):
             try:
-                new_value = float(e.control.value) if e.control.value else 0.0
+                new_value = Money.from_dollars(e.control.value) if e.control.value else Money(0)
                 
                 proposed_total = sum(
                     acc['allocated'] if acc['name'] != account['name'] else new_value 
@@ -1,10 +1,11 @@
 import flet as ft
 
 class ForgotPasswordQuestions(ft.View):
-    def __init__(self, page: ft.Page, user_data, colors):
+    def __init__(self, page: ft.Page, user_data, colors, async_db):
         super().__init__(route="/forgot_password_questions", bgcolor=colors.BLUE_BACKGROUND)
         self.page = page
         self.user_data = user_data
+        self.async_user = async_db.wrap(user_data)  # Argon2 verification runs off the event loop
         self.username = None  # Username is set after verification
         self.colors = colors
 
@@ -153,7 +154,7 @@ class ForgotPasswordQuestions(ft.View):
         self.continue_button.disabled = not (selected_key and user_answer)
         self.page.update()
 
-    def validate_security_answer(self, e):
+    async def validate_security_answer(self, e):
         """Verifies the security answer for the selected question."""
         selected_key = self.question_dropdown.value  # Example: "1", "2", or "3"
         user_answer = self.answer_field.value.strip()
@@ -167,7 +168,13 @@ class ForgotPasswordQuestions(ft.View):
         selected_key = str(selected_key)
 
         # Verify the security answer
-        if self.user_data.verify_security_answer(selected_key, user_answer):
+        self.continue_button.disabled = True
+        self.page.update()
+        try:
+            verified = await self.async_user.verify_security_answer(selected_key, user_answer)
+        finally:
+            self.continue_button.disabled = False
+        if verified:
             print("Security answer verified successfully!")
             self.answer_field.value = ""
             self.page.go("/reset_password")
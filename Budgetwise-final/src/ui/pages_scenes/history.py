@@ -1,11 +1,11 @@
 import flet as ft
 from datetime import datetime
-import json
 from src.ui.pages_scenes.reports import Reports
+from src.ui.components.report_view import ReportViewCache, build_report_view_model
 
 
 class History(ft.View):
-    def __init__(self, page: ft.Page,user_data, NavRail, colors):
+    def __init__(self, page: ft.Page,user_data, NavRail, colors, report_store):
         super().__init__(route="/history", bgcolor= colors.GREY_BACKGROUND)
 
         self.controls.append(ft.Text("History"))
@@ -25,14 +25,17 @@ class History(ft.View):
         
         # Use the existing database connection fromuser_data
         self.db = self.user_data.db
-        self.cursor = self.db.cursor()
 
         # Retrieve budget ID for the user
         self.budget_id = self.user_data.budget_id
+        # Report catalogue (IDs, types and dates); report data is loaded on demand through report_store
+        self.report_store = report_store
         self.reports = []
 
         # Table container, starts empty
         self.table = ft.Column(spacing=10, alignment=ft.MainAxisAlignment.CENTER)
+        # Rendered reports stay mounted, so switching back to one only flips its visibility
+        self.view_cache = ReportViewCache(self.table, self.build_report_table)
 
         # Scrollable wrapper specifically for the dynamic table elements
         self.TableElements = ft.ListView(
@@ -55,8 +58,9 @@ class History(ft.View):
         reports_options = self.get_combined_report_options()
         self.report_dropdown=self.create_combined_report_dropdown(reports_options)
 
-        self.reports_page = Reports(user_data, colors)
+        self.reports_page = Reports(user_data, colors, report_store)
         self.page.overlay.append(self.reports_page)
+        self.page.overlay.append(self.reports_page.file_picker)  # Save dialog used by the PDF export
         self.reports_button = ft.Container(
             content=ft.ElevatedButton(
                 text="Reports",
@@ -152,41 +156,14 @@ class History(ft.View):
         """
         Retrieves a specific report for the given month/year and the report's unique identifier.
         """
-        # Get all reports for the provided month and year.
-        reports = self.fetch_json_data(None, selected_month_year)
+        # Only the selected report is decoded; it comes from the report store's cache when viewed recently.
+        reports = self.fetch_json_data(None, selected_month_year, selected_report_id)
         
-        # Look for the report with the specific report_id.
-        for report in reports:
-            if report["report_id"] == selected_report_id:
-                return report
-        
-        return None  # If no matching report is found.
+        return reports[0] if reports else None  # None if no matching report is found.
 
     def fetch_reports(self):
-        """Fetch all reports for the specific user, including report data, and update self.reports."""
-        try:
-            # Clear the reports list to ensure no stale data
-            self.reports.clear()
-
-            # Query the database for reports connected to the specific user, including report_data
-            self.cursor.execute(
-                "SELECT report_id, report_type, report_date, report_data FROM reports WHERE user_id = ?", 
-                (self.user_id,)
-            )
-            rows = self.cursor.fetchall()
-
-            # Populate the reports list with the fetched data
-            for row in rows:
-                report_id, report_type, report_date, report_data = row
-                self.reports.append({
-                    "report_id": report_id,
-                    "report_type": report_type,
-                    "report_date": report_date,
-                    "report_data": report_data,  # Include report_data
-                })
-
-        except Exception as e:
-            print(f"An error occurred while fetching reports: {e}")
+        """Fetch the catalogue of the user's reports into self.reports. Report data is not loaded here."""
+        self.reports = self.report_store.get_catalogue(self.user_id)
 
     def create_combined_report_dropdown(self, options):
         """
@@ -256,12 +233,10 @@ class History(ft.View):
         selected_option = self.report_dropdown.value
 
         if selected_option == "No data available":
-            self.table.controls.clear()
-            self.table.controls.append(
+            self.view_cache.show_message(
                 ft.Text("No reports available for the selected month and year.",
                         italic=True, color=self.colors.GREY_BACKGROUND, size=24)
             )
-            self.table.update()
             return
 
         # Parse the dropdown option.
@@ -277,79 +252,50 @@ class History(ft.View):
             selected_month_year = (dt.month, dt.year)
         except Exception as ex:
             print(f"Error parsing selected option: {ex}")
-            self.table.controls.clear()
-            self.table.controls.append(
+            self.view_cache.show_message(
                 ft.Text("Invalid selection format.",
                         italic=True, color=self.colors.ERROR_RED, size=24)
             )
-            self.table.update()
             return
 
         # Retrieve the specific report.
         report = self.get_specific_report(selected_month_year, selected_report_id)
         if not report:
-            self.table.controls.clear()
-            self.table.controls.append(
+            self.view_cache.show_message(
                 ft.Text("No report data found for the selected option.",
                         italic=True, color=self.colors.GREY_BACKGROUND, size=24)
             )
-            self.table.update()
             return
 
-        # Get the accounts data from the report.
-        accounts = report.get("report_data", [])
-        if not isinstance(accounts, list):
-            accounts = [accounts]
+        # Built once per report; a report viewed before is shown again as it was left.
+        self.view_cache.show(report)
+
+    def build_report_table(self, report):
+        """Build the table of one report: a header row, then one row per account with its hidden transactions sub-table."""
+        table = ft.Column(spacing=10, alignment=ft.MainAxisAlignment.CENTER)
 
-        # Clear the current table controls.
-        self.table.controls.clear()
+        # Headline figures come from the report's catalogue entry, summarised when the report was stored.
+        summary = next((entry for entry in self.reports if entry["report_id"] == report["report_id"]), None)
+        if summary and summary.get("total_allocated") is not None:
+            table.controls.append(ft.Row([
+                ft.Text(f"Allocated: ${summary['total_allocated']:.2f}", color=self.colors.TEXT_COLOR, size=18),
+                ft.Text(f"Spent: ${summary['total_spent']:.2f}", color=self.colors.TEXT_COLOR, size=18),
+                ft.Text(f"Remaining: ${summary['total_allocated'] - summary['total_spent']:.2f}", color=self.colors.TEXT_COLOR, size=18),
+                ft.Text(f"{summary['transaction_count']} transactions", color=self.colors.TEXT_COLOR, size=18),
+            ], alignment=ft.MainAxisAlignment.CENTER, spacing=30))
 
         # Table Header Row.
-        self.table.controls.append(ft.Row([
+        table.controls.append(ft.Row([
             ft.Text("Account", weight="bold", width=200, color=self.colors.BLUE_BACKGROUND, text_align="center", size=24),
             ft.Text("Balance", weight="bold", width=150, color=self.colors.BLUE_BACKGROUND, text_align="center", size=24),
             ft.Text("Allocation", weight="bold", width=300, color=self.colors.BLUE_BACKGROUND, text_align="center", size=24),
             ft.Text("Transactions", weight="bold", width=300, color=self.colors.BLUE_BACKGROUND, text_align="center", size=24),
         ], alignment=ft.MainAxisAlignment.CENTER, spacing=10))
 
-        # Get the report creation date.
-        report_creation_dt = report.get("report_date")
-        if isinstance(report_creation_dt, str):
-            try:
-                report_creation_dt = datetime.strptime(report_creation_dt, "%Y-%m-%d %H:%M:%S")
-            except Exception as ex:
-                print(f"Error converting report creation date: {ex}")
-                report_creation_dt = None
-
-        # Iterate over each account.
-        for account in accounts:
-            account_name = account.get("account_name", "Unnamed Account")
-            balance = account.get("balance", 0)
-            transactions = account.get("transactions", [])
-
-            total_spent = 0  # This will only accumulate amounts from non-scheduled (completed) transactions.
-            display_transactions = []  # Holds transactions along with their status.
-
-            # Process each transaction.
-            for transaction in transactions:
-                # Assume transaction date is formatted as "YYYY-MM-DD" (or similar).
-                txn_date = datetime.strptime(transaction["date"].split()[0], "%Y-%m-%d")
-                # If the transaction date is after the report creation date, mark it as scheduled.
-                if report_creation_dt and txn_date.date() > report_creation_dt.date():
-                    status = "Scheduled"
-                else:
-                    status = ""
-                    total_spent += transaction.get("amount", 0)
-                display_transactions.append(
-                    (
-                        transaction.get("description", ""),
-                        transaction.get("amount", 0),
-                        transaction.get("date", ""),
-                        status
-                    )
-                )
-
-            updated_balance = balance - total_spent
+        # Iterate over each account. Scheduled transactions (dated after the report) are not in "spent".
+        for account in build_report_view_model(report):
+            balance = account["balance"]
+            updated_balance = balance - account["spent"]
 
             # Instead of a standard progress bar, use the custom meter widget.
             custom_meter = self.create_custom_meter(balance, updated_balance, width=300, height=10)
@@ -375,16 +321,16 @@ class History(ft.View):
                             ft.Text(f"${amount:.2f}", width=150, color=self.colors.TEXT_COLOR, text_align="center", size=16),
                             ft.Text(date, width=150, color=self.colors.TEXT_COLOR, text_align="center", size=16),
                             ft.Text(
-                                status,
+                                "Scheduled" if scheduled else "",
                                 width=100,
                                 text_align="center",
                                 size=16,
-                                color=self.colors.BLUE_BACKGROUND if status == "Scheduled" else self.colors.TEXT_COLOR,
+                                color=self.colors.BLUE_BACKGROUND if scheduled else self.colors.TEXT_COLOR,
                             ),
                         ],
                         alignment=ft.MainAxisAlignment.CENTER,
                         vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                    ) for desc, amount, date, status in display_transactions
+                    ) for desc, amount, date, scheduled in account["rows"]
                 ]
             )
 
@@ -403,10 +349,10 @@ class History(ft.View):
             )
 
             # Assemble the account row, with the custom meter in place of the standard progress bar.
-            self.table.controls.append(ft.Container(
+            table.controls.append(ft.Container(
                 content=ft.Column([
                     ft.Row([
-                        ft.Text(account_name, width=200, color=self.colors.TEXT_COLOR, text_align="center", size=16),
+                        ft.Text(account["account_name"], width=200, color=self.colors.TEXT_COLOR, text_align="center", size=16),
                         ft.Text(f"${updated_balance:.2f}", width=150, color=self.colors.TEXT_COLOR, text_align="center", size=16),
                         ft.Container(content=custom_meter, alignment=ft.alignment.center, width=300),
                         ft.Container(content=toggle_button, alignment=ft.alignment.center, width=300),
@@ -416,8 +362,7 @@ class History(ft.View):
                 padding=10
             ))
 
-        # Finally, update the table display.
-        self.table.update()
+        return table
 
 
 
@@ -479,45 +424,17 @@ class History(ft.View):
 
     def fetch_json_data(self, e, selected_month_year, selected_report_id=None):
         """
-        Filter the list self.reports for reports from the specified month and year,
-        parse their JSON 'report_data', and return a list of dictionaries formatted for display.
-        If selected_report_id is provided, only include the report with that ID.
+        Return the reports in self.reports from the specified month and year, with 'report_data' decoded
+        for display. If selected_report_id is provided, only that report is decoded.
         """
         month, year = selected_month_year
-        parsed_reports = []
-
-        for report in self.reports:
-            try:
-                # Assumes the format is 'YYYY-MM-DD HH:MM:SS'
-                report_date_obj = datetime.strptime(report["report_date"], "%Y-%m-%d %H:%M:%S")
-            except Exception as ex:
-                print(f"Error parsing date for report_id {report['report_id']}: {ex}")
-                continue
-
-            if report_date_obj.month == month and report_date_obj.year == year:
-                # If a specific report ID was provided, filter out non-matching reports
-                if selected_report_id is not None and report["report_id"] != selected_report_id:
-                    continue
-
-                try:
-                    parsed_data = json.loads(report["report_data"])
-                except Exception as ex:
-                    print(f"Error parsing JSON for report_id {report['report_id']}: {ex}")
-                    parsed_data = None
-
-                parsed_reports.append({
-                    "report_id": report["report_id"],
-                    "report_type": report["report_type"],
-                    "report_date": report_date_obj,
-                    "report_data": parsed_data  # Contains your account data
-                })
-        return parsed_reports
+        return self.report_store.get_month_reports(self.reports, month, year, selected_report_id)
 
 
     def toggle_sub_table(self, container):
-        """Toggle visibility of a sub-table."""
+        """Toggle visibility of a sub-table. Only that sub-table is sent to the client."""
         container.visible = not container.visible
-        self.table.update()
+        container.update()
 
 
     def parse_month_year(self, month_year):
@@ -2,11 +2,13 @@ import flet as ft
 from argon2.exceptions import VerifyMismatchError
 
 class Login(ft.View):
-    def __init__(self, page: ft.Page, user_data, colors):
+    def __init__(self, page: ft.Page, user_data, colors, async_db):
         super().__init__(route="/login", bgcolor= colors.BLUE_BACKGROUND)
 
         self.page = page
         self.user_data = user_data  # User repository reference
+        self.async_user = async_db.wrap(user_data)  # Argon2 verification runs off the event loop
+        self.verifying = False  # True while a login attempt is being verified
         self.colors = colors
 
         # Input fields
@@ -123,8 +125,10 @@ class Login(ft.View):
             self.error_text.value = ""
             self.page.update()
 
-    def login_attempt(self, e):
-        """Handle login attempt."""
+    async def login_attempt(self, e):
+        """Handle login attempt. The password is verified on the database executor while the button is disabled."""
+        if self.verifying:
+            return  # Enter pressed again while the last attempt is verified
         username = self.username_field.value.strip()
         password = self.password_field.value.strip()
 
@@ -132,7 +136,12 @@ class Login(ft.View):
             self.error_text.value = "Please enter both valid username and password."
         else:
             try:
-                is_authenticated = self.user_data.verify_password(username, password)
+                self.verifying = self.login_button.disabled = True
+                self.page.update()
+                try:
+                    is_authenticated = await self.async_user.verify_password(username, password)
+                finally:
+                    self.verifying = self.login_button.disabled = False
 
                 if is_authenticated is True:
                     self.user_data.user_id = self.user_data.get_user_id(username)
@@ -1,18 +1,11 @@
 import flet as ft
 from datetime import datetime
-import json
-import tkinter as tk
-from tkinter import filedialog
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+from src.ui.components.report_view import ReportViewCache, build_report_view_model
 class Reports(ft.AlertDialog):
-    def __init__(self, user_data, colors):
+    def __init__(self, user_data, colors, report_store):
         super().__init__(modal=True)  # Initialize as an AlertDialog
         self.user_repo = user_data
         self.db = self.user_repo.db
-        self.cursor = self.db.cursor()
         self.colors = colors
 
         self.month_name = 0
@@ -20,8 +13,16 @@ class Reports(ft.AlertDialog):
         self.report_id = 0
         self.month_year = 0
         self.userid = 1
+        # Report catalogue (IDs, types and dates); report data is loaded on demand through report_store
+        self.report_store = report_store
         self.reports = []
 
+        # PDFs are rendered in a worker thread; the file picker must be added to the page overlay by the owner
+        self._pdf_exporter = None  # Created on first export (see pdf_exporter)
+        self.file_picker = ft.FilePicker(on_result=self.save_path_picked)
+        self.pending_export = None  # (report_ids, title) waiting for the save dialog
+        self.cancel_export = None  # threading.Event of the running export
+
         # Title Row
         title_row = ft.Row(
             [ft.Text("Reports", size=30, weight="bold", color=self.colors.TEXT_COLOR)],
@@ -30,7 +31,9 @@ class Reports(ft.AlertDialog):
         )
 
         # Reports Table Container
-        self.table = ft.Column(spacing=10, alignment=ft.MainAxisAlignment.CENTER)
+        self.table = ft.Column(spacing=10, alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+        # Rendered reports stay mounted, so switching back to one only flips its visibility
+        self.view_cache = ReportViewCache(self.table, self.build_report_table)
 
         # Scrollable Wrapper for Table Content
         self.TableElements = ft.ListView(
@@ -58,10 +61,21 @@ class Reports(ft.AlertDialog):
         )
 
         # Refresh Button
+        self.print_button = ft.ElevatedButton(
+            text="Print",
+            on_click=lambda e: self.generate_pdf_report(self.month_name, self.year_name, self.report_id),
+        )
+        self.print_year_button = ft.ElevatedButton(
+            text="Print Year",
+            on_click=lambda e: self.generate_year_pdf_report(self.year_name, self.report_id),
+        )
+        self.cancel_export_button = ft.ElevatedButton(text="Cancel", visible=False, on_click=self.cancel_pdf_export)
+        self.export_progress = ft.ProgressBar(width=200, value=0, visible=False)
+        self.export_status = ft.Text("", color=self.colors.TEXT_COLOR)
         self.refresh_button = ft.Container(
-            content=ft.ElevatedButton(
-                text="Print",
-                on_click=lambda e: self.generate_pdf_report(self.month_name, self.year_name, self.report_id),
+            content=ft.Row(
+                [self.print_button, self.print_year_button, self.cancel_export_button, self.export_progress, self.export_status],
+                spacing=10,
             ),
             alignment=ft.alignment.bottom_left,
             padding=10,
@@ -89,6 +103,14 @@ class Reports(ft.AlertDialog):
         )
 
 
+    @property
+    def pdf_exporter(self):
+        """The PDF exporter, created on first use so ReportLab is only imported when a report is printed."""
+        if self._pdf_exporter is None:
+            from src.backend.database_interation.report_export import ReportPdfExporter
+            self._pdf_exporter = ReportPdfExporter(self.report_store)
+        return self._pdf_exporter
+
     def show(self):
         """Show the popup."""
         self.open = True
@@ -106,30 +128,8 @@ class Reports(ft.AlertDialog):
         self.fetch_reports()
 
     def fetch_reports(self):
-        """Fetch all reports for the specific user, including report data, and update self.reports."""
-        try:
-            # Clear the reports list to ensure no stale data
-            self.reports.clear()
-
-            # Query the database for reports connected to the specific user, including report_data
-            self.cursor.execute(
-                "SELECT report_id, report_type, report_date, report_data FROM reports WHERE user_id = ?", 
-                (self.userid,)
-            )
-            rows = self.cursor.fetchall()
-
-            # Populate the reports list with the fetched data
-            for row in rows:
-                report_id, report_type, report_date, report_data = row
-                self.reports.append({
-                    "report_id": report_id,
-                    "report_type": report_type,
-                    "report_date": report_date,
-                    "report_data": report_data,  # Include report_data
-                })
-
-        except Exception as e:
-            print(f"An error occurred while fetching reports: {e}")
+        """Fetch the catalogue of the user's reports into self.reports. Report data is not loaded here."""
+        self.reports = self.report_store.get_catalogue(self.userid)
 
     def refresh_reports(self, e, selected_option):
         """
@@ -141,14 +141,12 @@ class Reports(ft.AlertDialog):
         """
 
         if selected_option == "No data available":
-            self.table.controls.clear()
-            self.table.controls.append(
+            self.view_cache.show_message(
                 ft.Text(
                     "No reports available for the selected option.",
                     italic=True, color=self.colors.GREY_BACKGROUND, size=24
                 )
             )
-            self.table.update()
             return
 
         # Parse the selected option into a date and report ID.
@@ -165,45 +163,36 @@ class Reports(ft.AlertDialog):
             selected_month_year = (dt.month, dt.year)
         except Exception as ex:
             print(f"Error parsing selection: {ex}")
-            self.table.controls.clear()
-            self.table.controls.append(
+            self.view_cache.show_message(
                 ft.Text(
                     "Invalid selection format.",
                     italic=True, color=self.colors.ERROR_RED, size=24
                 )
             )
-            self.table.update()
             return
 
         # Retrieve the specific report using fetch_json_data.
         self.report_id = selected_report_id
         reports = self.fetch_json_data(e, selected_month_year, selected_report_id)
         if not reports:
-            self.table.controls.clear()
-            self.table.controls.append(
+            self.view_cache.show_message(
                 ft.Text(
                     "No report data found for the selected option.",
                     italic=True, color=self.colors.GREY_BACKGROUND, size=24
                 )
             )
-            self.table.update()
             return
 
         # Since we filtered by report_id, we expect at most one report.
-        report = reports[0]
-
-        # Get the accounts data from the report.
-        accounts = report.get("report_data", [])
-        if not isinstance(accounts, list):
-            accounts = [accounts]
+        # Built once per report; a report viewed before is shown again without rebuilding it.
+        self.view_cache.show(reports[0])
 
-        # Clear current table controls and set table alignment.
-        self.table.controls.clear()
-        self.table.alignment = ft.MainAxisAlignment.CENTER
-        self.table.horizontal_alignment = ft.CrossAxisAlignment.CENTER
+    def build_report_table(self, report):
+        """Build the table of one report: a header row, then each account with all of its transactions."""
+        table = ft.Column(spacing=10, alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER)
 
         # Build the table header (Account, Balance, Remaining).
-        self.table.controls.append(
+        table.controls.append(
             ft.Row(
                 [
                     ft.Text("Account", weight="bold", width=200, text_align="center", size=24, color=self.colors.BLUE_BACKGROUND),
@@ -215,25 +204,10 @@ class Reports(ft.AlertDialog):
             )
         )
 
-        # Get the report creation date and ensure it is a datetime object.
-        report_creation_dt = report.get("report_date")
-        if isinstance(report_creation_dt, str):
-            try:
-                report_creation_dt = datetime.strptime(report_creation_dt, "%Y-%m-%d %H:%M:%S")
-            except Exception as e:
-                print(f"Error converting report creation date: {e}")
-                report_creation_dt = None
-
-        # Loop through each account in the report.
-        for account in accounts:
-            account_name = account.get("account_name", "Unnamed Account")
-            balance = account.get("balance", 0)
-            transactions = account.get("transactions", [])
-
-            # Use all transactions (removing the previous date prefix filter).
-            all_transactions = transactions
-            total_transactions = sum(transaction.get("amount", 0) for transaction in all_transactions)
-            computed_remaining = balance - total_transactions
+        # Loop through each account in the report. All transactions count towards the remaining amount.
+        for account in build_report_view_model(report):
+            balance = account["balance"]
+            computed_remaining = balance - account["total"]
 
             # Build header for the transactions sub-table with a Status column.
             transaction_header_row = ft.Row(
@@ -247,28 +221,20 @@ class Reports(ft.AlertDialog):
                 spacing=10
             )
 
-            # Build rows for each transaction.
+            # Build rows for each transaction; dates after the report's creation are tagged "Scheduled".
             transaction_rows = [
                 ft.Row(
                     controls=[
-                        ft.Text(transaction.get("description", ""), width=200,  color = self.colors.TEXT_COLOR, text_align="center", size=16),
-                        ft.Text(f"${transaction.get('amount', 0):.2f}", width=150,  color = self.colors.TEXT_COLOR, text_align="center", size=16),
-                        ft.Text(transaction.get("date", "").split()[0], width=150,  color = self.colors.TEXT_COLOR, text_align="center", size=16),
-                        (
-                            lambda t_date: ft.Text(
-                                "Scheduled",
-                                width=100,
-                                text_align="center",
-                                size=16,
-                                color=self.colors.BLUE_BACKGROUND
-                            ) if t_date and report_creation_dt and t_date.date() > report_creation_dt.date()
-                            else ft.Text("", width=100)
-                        )(datetime.strptime(transaction["date"].split()[0], "%Y-%m-%d"))
+                        ft.Text(desc, width=200,  color = self.colors.TEXT_COLOR, text_align="center", size=16),
+                        ft.Text(f"${amount:.2f}", width=150,  color = self.colors.TEXT_COLOR, text_align="center", size=16),
+                        ft.Text(date, width=150,  color = self.colors.TEXT_COLOR, text_align="center", size=16),
+                        ft.Text("Scheduled", width=100, text_align="center", size=16, color=self.colors.BLUE_BACKGROUND)
+                        if scheduled else ft.Text("", width=100),
                     ],
                     alignment=ft.MainAxisAlignment.CENTER,
                     spacing=10
                 )
-                for transaction in all_transactions
+                for desc, amount, date, scheduled in account["rows"]
             ]
 
             transactions_container = ft.Column(
@@ -284,7 +250,7 @@ class Reports(ft.AlertDialog):
                     controls=[
                         ft.Row(
                             [
-                                ft.Text(f"Account Name: {account_name}", width=200, text_align="center", size=16, color=self.colors.TEXT_COLOR),
+                                ft.Text(f"Account Name: {account['account_name']}", width=200, text_align="center", size=16, color=self.colors.TEXT_COLOR),
                                 ft.Text(f"Balance: ${balance:.2f}", width=150, text_align="center", size=16, color=self.colors.TEXT_COLOR),
                                 ft.Text(f"Remaining: ${computed_remaining:.2f}", width=150, text_align="center", size=16, color=self.colors.TEXT_COLOR)
                             ],
@@ -302,58 +268,19 @@ class Reports(ft.AlertDialog):
                 padding=10,
                 border=ft.border.all(1, self.colors.GREY_BACKGROUND)
             )
-            self.table.controls.append(account_container)
-
-        # Finally, update the table display.
-        self.table.update()
-
-
-
+            table.controls.append(account_container)
 
+        return table
 
     def fetch_json_data(self, e, selected_month_year, selected_report_id=None):
         """
-        Filter the list self.reports for reports from the specified month and year,
-        parse their JSON 'report_data', and return a list of dictionaries formatted for display.
-        If selected_report_id is provided, only include the report with that ID.
+        Return the reports in self.reports from the specified month and year, with 'report_data' decoded
+        for display. If selected_report_id is provided, only that report is decoded.
         """
         # Unpack the tuple; expect selected_month_year to be like (3, 2025)
         month, year = selected_month_year
-        parsed_reports = []
-
-        for report in self.reports:
-            try:
-                # Assumes the format is 'YYYY-MM-DD HH:MM:SS'
-                report_date_obj = datetime.strptime(report["report_date"], "%Y-%m-%d %H:%M:%S")
-
-            except Exception as ex:
-                print(f"Error parsing date for report_id {report['report_id']}: {ex}")
-                continue
-
-            # Only include reports with matching month and year
-            if report_date_obj.month == month and report_date_obj.year == year:
-                # If a specific report ID was provided, filter out non-matching reports
-                if selected_report_id is not None and report["report_id"] != selected_report_id:
-                    continue
+        return self.report_store.get_month_reports(self.reports, month, year, selected_report_id)
 
-                try:
-                    parsed_data = json.loads(report["report_data"])
-                except Exception as ex:
-                    print(f"Error parsing JSON for report_id {report['report_id']}: {ex}")
-                    parsed_data = None
-
-                parsed_reports.append({
-                    "report_id": report["report_id"],
-                    "report_type": report["report_type"],
-                    "report_date": report_date_obj,
-                    "report_data": parsed_data  # This contains your account data
-                })
-        return parsed_reports
-
-
-
-
-        
     def parse_month_year(self, month_year):
         """Parse the combined month-year string and return month and year."""
         parts = month_year.split()
@@ -366,93 +293,89 @@ class Reports(ft.AlertDialog):
 
     def generate_pdf_report(self, month, year, selected_report_id):
         """
-        Generates a PDF report from the parsed JSON data for a specific report 
-        (identified by selected_report_id). It brings up a "Save As" dialog so
-        the user can choose where to save the PDF.
+        Exports a specific report (identified by selected_report_id) to PDF. It brings up a
+        "Save As" dialog so the user can choose where to save the PDF; the PDF is then rendered
+        in a worker thread by save_path_picked.
         
         :param month: Numeric month (e.g., 3 for March)
         :param year: Numeric year (e.g., 2025)
         :param selected_report_id: The unique report ID that uniquely identifies the report selected.
         """
-        # Fetch the specific report using fetch_json_data. (This function is assumed 
-        # to accept an optional last parameter, filtering by report_id.)
-        parsed_json_data = self.fetch_json_data(None, (int(month), int(year)), selected_report_id)
-        if not parsed_json_data:
+        if not selected_report_id:
             return
+        self.request_pdf_export([selected_report_id], "Monthly Report", f"Report_{year}_{int(month):02d}.pdf")
 
-        # Since we filtered by report_id, we expect exactly one report.
-        report = parsed_json_data[0]
-
-        # Bring up a "Save As" dialog.
-        root = tk.Tk()
-        root.withdraw()  # Hide the root window.
-        # Prefix the default filename.
-        default_filename = f"Report_{year}_{int(month):02d}.pdf"
-        file_path = filedialog.asksaveasfilename(
-            title="Save Report As",
-            initialfile=default_filename,
-            defaultextension=".pdf",
-            filetypes=[("PDF files", "*.pdf")]
-        )
-        # If the user cancelled the dialog, file_path will be an empty string.
-        if not file_path:
+    def generate_year_pdf_report(self, year, selected_report_id):
+        """
+        Exports every report of the selected report's type stored in the given year into one PDF,
+        oldest first, one report per page range.
+        """
+        if not selected_report_id:
             return
+        selected = next((entry for entry in self.reports if entry["report_id"] == selected_report_id), None)
+        if selected is None:
+            return
+        report_ids = [
+            entry["report_id"] for entry in self.reports
+            if entry["report_type"] == selected["report_type"] and str(entry["report_date"]).startswith(f"{int(year):04d}")
+        ]
+        self.request_pdf_export(report_ids, "Report", f"Reports_{year}.pdf")
+
+    def request_pdf_export(self, report_ids, title, default_filename):
+        """Remember what to export and bring up the "Save As" dialog. Ignored while an export is running."""
+        if self.cancel_export is not None or not report_ids:
+            return
+        self.pending_export = (report_ids, title)
+        self.file_picker.save_file(
+            dialog_title="Save Report As",
+            file_name=default_filename,
+            allowed_extensions=["pdf"],
+        )
 
-        # Create the PDF document using ReportLab.
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        elements = []
+    def save_path_picked(self, e: ft.FilePickerResultEvent):
+        """Start rendering the pending export once the user chose where to save it."""
+        pending, self.pending_export = self.pending_export, None
+        # If the user cancelled the dialog, there is no path.
+        if not e.path or pending is None:
+            return
+        file_path = e.path if e.path.lower().endswith(".pdf") else f"{e.path}.pdf"
+        report_ids, title = pending
 
-        # Get default styles.
-        styles = getSampleStyleSheet()
-        title = Paragraph("Monthly Report", styles["Title"])
-        elements.append(title)
-        elements.append(Spacer(1, 12))
+        self.set_exporting(True, "Rendering PDF...")
+        self.cancel_export = self.pdf_exporter.start(
+            file_path, report_ids, title, on_progress=self.export_progressed, on_done=self.export_finished
+        )
 
-        # Iterate over the accounts in the report.
-        accounts = report.get("report_data", [])
-        if not isinstance(accounts, list):
-            accounts = [accounts]
-        
-        for account in accounts:
-            account_name = account.get("account_name", "Unnamed Account")
-            balance = account.get("balance", 0)
-            transactions = account.get("transactions", [])
-            total_txn = sum(txn.get("amount", 0) for txn in transactions)
-            remaining = balance - total_txn
-
-            # Build account header as a Paragraph.
-            account_header = Paragraph(
-                f"<b>Account:</b> {account_name}&nbsp;&nbsp;&nbsp; "
-                f"<b>Balance:</b> ${balance:.2f}&nbsp;&nbsp;&nbsp; "
-                f"<b>Remaining:</b> ${remaining:.2f}",
-                styles["Heading3"]
-            )
-            elements.append(account_header)
-            elements.append(Spacer(1, 6))
-            
-            # Build the transaction table with headers.
-            table_data = [["Description", "Amount", "Date"]]
-            for txn in transactions:
-                desc = txn.get("description", "")
-                amount = txn.get("amount", 0)
-                date = txn.get("date", "").split()[0]  # Removing time if present.
-                table_data.append([desc, f"${amount:.2f}", date])
-            
-            # Create the table with fixed column widths.
-            t = Table(table_data, colWidths=[200, 100, 100])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
-            elements.append(t)
-            elements.append(Spacer(1, 12))
-
-        # Build the PDF file.
-        doc.build(elements)
-        print(f"PDF report generated and saved as {file_path}")
+    def export_progressed(self, fraction, message):
+        """Progress callback from the export worker thread."""
+        self.export_progress.value = fraction
+        self.export_status.value = message
+        self.update()
 
+    def export_finished(self, result):
+        """Completion callback from the export worker thread."""
+        if result["status"] == "done":
+            message = f"Saved {result['pages']} pages in {result['seconds']:.1f}s"
+        elif result["status"] == "cancelled":
+            message = "Export cancelled"
+        else:
+            message = "Export failed"
+        self.cancel_export = None
+        self.set_exporting(False, message)
+
+    def cancel_pdf_export(self, e=None):
+        """Stop the running export; the worker removes the unfinished file."""
+        if self.cancel_export is not None:
+            self.cancel_export.set()
+            self.export_status.value = "Cancelling..."
+            self.update()
+
+    def set_exporting(self, exporting, message):
+        """Toggle the print buttons and the progress bar around an export."""
+        self.print_button.disabled = exporting
+        self.print_year_button.disabled = exporting
+        self.cancel_export_button.visible = exporting
+        self.export_progress.visible = exporting
+        self.export_progress.value = 0
+        self.export_status.value = message
+        self.update()
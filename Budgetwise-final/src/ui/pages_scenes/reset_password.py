@@ -1,11 +1,12 @@
 import flet as ft
 
 class ResetPassword(ft.View):
-    def __init__(self, page: ft.Page, user_data, colors):
+    def __init__(self, page: ft.Page, user_data, colors, async_db):
         super().__init__(route="/reset_password", bgcolor= colors.BLUE_BACKGROUND)
 
         self.page = page
         self.user_data = user_data
+        self.async_user = async_db.wrap(user_data)  # Argon2 hashing runs off the event loop
         self.colors = colors
 
         # Input fields
@@ -117,7 +118,7 @@ class ResetPassword(ft.View):
         
         self.page.update()
 
-    def reset_password(self, e):
+    async def reset_password(self, e):
         """Handles resetting the password."""
         new_password = self.password.value.strip()
         confirm_password = self.confirm_password.value.strip()
@@ -136,7 +137,13 @@ class ResetPassword(ft.View):
             return
 
         # Attempt password update
-        if self.user_data.update_user_password(username, new_password):
+        self.continue_button.disabled = True
+        self.page.update()
+        try:
+            updated = await self.async_user.update_user_password(username, new_password)
+        finally:
+            self.continue_button.disabled = False
+        if updated:
             print(f"Password reset successful for user: {username}")
             self.confirm_password.value = ""
             self.page.go("/reset_password_success")
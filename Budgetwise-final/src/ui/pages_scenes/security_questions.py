@@ -1,11 +1,12 @@
 import flet as ft
 
 class SecurityQuestions(ft.View):
-    def __init__(self, page: ft.Page, user_data, colors):
+    def __init__(self, page: ft.Page, user_data, colors, async_db):
         super().__init__(route="/security_questions", bgcolor= colors.BLUE_BACKGROUND)
         
         self.page = page
         self.user_data = user_data  # Store user repository for temp_info storag
+        self.async_user = async_db.wrap(user_data)  # Argon2 hashing and the insert run off the event loop
         self.colors = colors
 
         # Security questions dictionary
@@ -107,22 +108,28 @@ class SecurityQuestions(ft.View):
             focused_border_color=self.colors.BORDERBOX_COLOR, 
             )
 
-        def validate_and_continue(e):
+        async def validate_and_continue(e):
             """Validates security questions, updates temp_sign_in_data with the questions and answers, and initiates user creation."""
             
             # Get selected security questions and answers
             q1, q2, q3 = self.dd1.value, self.dd2.value, self.dd3.value
-            a1 = self.user_data.hash_password(self.answer1.value.strip()) if self.answer1.value else None
-            a2 = self.user_data.hash_password(self.answer2.value.strip()) if self.answer2.value else None
-            a3 = self.user_data.hash_password(self.answer3.value.strip()) if self.answer3.value else None
+            answers = [answer.value.strip() if answer.value else None for answer in (self.answer1, self.answer2, self.answer3)]
 
             # Validate that all questions and answers are provided
-            if not all([q1, q2, q3, a1, a2, a3]):
+            if not all([q1, q2, q3, *answers]):
                 self.error_text.value = "All questions and answers must be filled!"
                 self.error_text.visible = True
                 self.page.update()
                 return
 
+            # Hashing the answers takes a moment; ignore repeat clicks meanwhile
+            e.control.disabled = True
+            self.page.update()
+            try:
+                a1, a2, a3 = await self.async_user.hash_secrets(answers)  # Hashed side by side
+            finally:
+                e.control.disabled = False
+
             # Update temp_sign_in_data with security questions and answers without overwriting existing keys
             self.user_data.temp_sign_up_data.update({
                 "security_question1": self.security_questions.get(q1, ""),
@@ -134,7 +141,7 @@ class SecurityQuestions(ft.View):
             })
 
             # Start user creation process using the updated temp_sign_in_data
-            success = self.user_data.create_user()
+            success = await self.async_user.create_user()
 
             if success:
                 print("User account created successfully!")
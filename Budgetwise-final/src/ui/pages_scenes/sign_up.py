@@ -2,11 +2,12 @@ import flet as ft
 import re
 
 class SignUp(ft.View):
-    def __init__(self, page: ft.Page, user_data, colors):
+    def __init__(self, page: ft.Page, user_data, colors, async_db):
         super().__init__(route="/sign_up", bgcolor= colors.BLUE_BACKGROUND)
 
         self.page = page
         self.user_data = user_data
+        self.async_user = async_db.wrap(user_data)  # Argon2 hashing runs off the event loop
         self.colors = colors
 
         # Input fields
@@ -126,7 +127,7 @@ class SignUp(ft.View):
             self.error_text.value = ""
             self.page.update()
 
-    def validate_and_continue(self, e):
+    async def validate_and_continue(self, e):
         """Validates inputs and moves to the next step if successful."""
         username = self.username.value.strip()
         password = self.password.value.strip()
@@ -170,9 +171,15 @@ class SignUp(ft.View):
             return
 
         # Store user info and proceed
+        self.continue_button.disabled = True
+        self.page.update()
+        try:
+            password_hash = await self.async_user.hash_password(password)
+        finally:
+            self.continue_button.disabled = False
         self.user_data.temp_sign_up_data = {
             "username": username,
-            "password_hash": self.user_data.hash_password(password),
+            "password_hash": password_hash,
         }
 
         print("Sign-up step completed successfully")
@@ -1,9 +1,16 @@
 import flet as ft
+from datetime import datetime
 from src.ui.components.add_vendor import AddVendor
 from src.ui.components.add_transaction import AddTransaction
+from src.ui.components.import_transactions import ImportTransactions
+from src.backend.database_interation.money import Money
+from src.ui.components.skeleton import skeleton_data_rows
 
 class Transactions(ft.View):
-    def __init__(self, page: ft.Page, user_data, NavRail, colors, trans_funcs, vend_funcs):
+    # Number of transactions materialised as table rows at a time
+    PAGE_SIZE = 50
+
+    def __init__(self, page: ft.Page, user_data, NavRail, colors, trans_funcs, vend_funcs, async_db):
         super().__init__(route="/transactions", bgcolor=colors.GREY_BACKGROUND)
         print("Transactions page constructor started")
 
@@ -14,19 +21,32 @@ class Transactions(ft.View):
         self.colors = colors
         self.vend_funcs = vend_funcs
         self.trans_funcs = trans_funcs
+        self.async_trans = async_db.wrap(trans_funcs)  # TransClass methods as awaitables
         self.amount_descending = False
 
-        self.returned_trans = []
+        # Sorting and filtering are applied by the database query
+        self.sort_by = "transaction_date"
+        self.sort_descending = True
+        self.filters = {}
+
+        # Keyset pagination state: the (transaction_date, transaction_id) each visited window starts after
+        self.page_cursors = [None]
+        self.has_next_page = False
+        self.load_generation = 0  # Bumped by every refresh_data, so a slower earlier load cannot overwrite a newer one
 
         # Dialogs
         self.add_vendor_dialog = AddVendor(user_data, colors, vend_funcs)
         self.add_vendor_dialog.refresh = self.refresh_after_vendor_add
         self.page.overlay.append(self.add_vendor_dialog)
 
-        self.add_transaction_dialog = AddTransaction(page, user_data, colors, trans_funcs, vend_funcs)
+        self.add_transaction_dialog = AddTransaction(page, user_data, colors, trans_funcs, vend_funcs, async_db)
         self.add_transaction_dialog.refresh = self.refresh_after_transaction_add
         self.page.overlay.append(self.add_transaction_dialog)
 
+        self.import_dialog = ImportTransactions(page, user_data, colors)
+        self.import_dialog.refresh = self.refresh_after_import
+        self.page.overlay.append(self.import_dialog)
+
         # UI Components
         title_row = ft.Row(
             [ft.Text("Transactions", size=30, weight="bold")],
@@ -36,10 +56,39 @@ class Transactions(ft.View):
 
         self.add_vendor_button = ft.ElevatedButton("Add Vendor", on_click=self.show_add_vendor_dialog)
         self.add_transaction_button = ft.ElevatedButton("Add Transaction", on_click=self.show_add_transaction_dialog)
+        self.import_button = ft.ElevatedButton("Import Transactions", on_click=self.show_import_dialog)
+
+        # Filter controls
+        self.account_filter = ft.Dropdown(label="Account", options=[], width=180, filled=True)
+        self.vendor_filter = ft.Dropdown(label="Vendor", options=[], width=180, filled=True)
+        self.recurring_filter = ft.Dropdown(
+            label="Recurring",
+            options=[ft.dropdown.Option(key="all", text="All"), ft.dropdown.Option(key="1", text="Yes"), ft.dropdown.Option(key="0", text="No")],
+            value="all",
+            width=130,
+            filled=True,
+        )
+        self.start_date_filter = ft.TextField(label="From", hint_text="YYYY-MM-DD", width=140)
+        self.end_date_filter = ft.TextField(label="To", hint_text="YYYY-MM-DD", width=140)
+        self.min_amount_filter = ft.TextField(label="Min $", width=100, keyboard_type=ft.KeyboardType.NUMBER)
+        self.max_amount_filter = ft.TextField(label="Max $", width=100, keyboard_type=ft.KeyboardType.NUMBER)
+        self.filter_row = ft.Row(
+            [
+                self.account_filter,
+                self.vendor_filter,
+                self.recurring_filter,
+                self.start_date_filter,
+                self.end_date_filter,
+                self.min_amount_filter,
+                self.max_amount_filter,
+                ft.ElevatedButton("Apply", on_click=self.apply_filters),
+                ft.TextButton("Clear", on_click=self.clear_filters),
+            ],
+            wrap=True,
+            alignment=ft.MainAxisAlignment.CENTER,
+        )
 
-        self.transDetails = []
-        self.returned_trans = self.trans_funcs.getTransactionList(self.user_id)
-        self.prepare_transaction_details()
+        self.transDetails = []  # Loaded by refresh_data when the page is shown
 
         # Define each column as an individual variable.
         description_column = ft.DataColumn(
@@ -114,7 +163,7 @@ class Transactions(ft.View):
             delete_column,
         ]
 
-        data_rows = self.create_transaction_rows()
+        data_rows = skeleton_data_rows(len(data_columns), self.colors)
 
 
 
@@ -123,12 +172,35 @@ class Transactions(ft.View):
         self.TableElements = ft.ListView(controls=[self.table], expand=True, spacing=10)
         self.scrollable_table = ft.Container(content=self.TableElements, expand=True, padding=10)
 
+        # Pagination controls
+        self.previous_page_button = ft.IconButton(
+            icon=ft.Icons.CHEVRON_LEFT,
+            tooltip="Previous page",
+            icon_color=self.colors.TEXT_COLOR,
+            on_click=self.show_previous_page,
+        )
+        self.next_page_button = ft.IconButton(
+            icon=ft.Icons.CHEVRON_RIGHT,
+            tooltip="Next page",
+            icon_color=self.colors.TEXT_COLOR,
+            on_click=self.show_next_page,
+        )
+        self.page_label = ft.Text("", color=self.colors.TEXT_COLOR)
+        self.pagination_row = ft.Row(
+            [self.previous_page_button, self.page_label, self.next_page_button],
+            alignment=ft.MainAxisAlignment.CENTER,
+        )
+        self.update_pagination_controls()
+
         content = ft.Column(
             [
                 title_row,
+                self.filter_row,
                 self.scrollable_table,
+                self.pagination_row,
                 self.add_vendor_button,
                 self.add_transaction_button,
+                self.import_button,
             ],
             expand=True,
         )
@@ -151,13 +223,30 @@ class Transactions(ft.View):
     def did_mount(self):
         super().did_mount()
         self.user_id = self.user_data.user_id
+        self.page_cursors = [None]
+        self.populate_filter_options()
         self.refresh_data()
 
     def refresh_data(self):
+        """Show placeholder rows, then fill the table in once the current window has loaded (see load_data)."""
         print("Refreshing transaction data...")
-        self.returned_trans = self.trans_funcs.getTransactionList(self.user_id)
-        self.transDetails = []
-        self.prepare_transaction_details()
+        self.load_generation += 1
+        self.table.rows = skeleton_data_rows(len(self.table.columns), self.colors)
+        self.previous_page_button.disabled = self.next_page_button.disabled = True
+        self.page.update()
+        self.page.run_task(self.load_data, self.load_generation)
+
+    async def load_data(self, generation):
+        """Query the current window off the event loop and draw it, unless a newer refresh_data has started since."""
+        rows = await self.async_trans.get_transaction_page(*self.transaction_page_arguments())
+        if generation != self.load_generation:
+            return  # A newer load replaces this one
+        self.prepare_transaction_details(rows)
+
+        # Step back if the last row of the final page was removed
+        if not self.transDetails and len(self.page_cursors) > 1:
+            self.show_previous_page(None)
+            return
 
         new_data_rows = self.create_transaction_rows()
 
@@ -168,43 +257,46 @@ class Transactions(ft.View):
             ]
 
         self.table.rows = new_data_rows
+        self.update_pagination_controls()
         self.page.update()
         print("Transaction table updated.")
 
-    def prepare_transaction_details(self):
-        for TID in self.returned_trans:
-            details = self.trans_funcs.getTransactionDetails(TID)
-            transaction_id = TID[0]
-            
-            # Expect details[0] to have 6 columns:
-            # (budget_accounts_id, vendor_id, amount, description, recurring, transaction_date)
-            if details and len(details) == 1 and len(details[0]) == 6:
-                tuple_data = details[0]
-                budget_account_id = tuple_data[0]
-                vendor_id = tuple_data[1]  # Now we capture the vendor_id
-                amount = tuple_data[2]
-                description = tuple_data[3]
-                recurring = tuple_data[4]
-                transaction_date = tuple_data[5]
-                budget_account_name = self.trans_funcs.getBudgetAccountName(budget_account_id)
-                
-                # Build final list with the desired order:
-                # [ transaction_id, budget_account_name, budget_account_id, amount, description, transaction_date, recurring, vendor_id ]
-                final_details = [
-                    transaction_id,
-                    budget_account_name,
-                    budget_account_id,
-                    amount,
-                    description,
-                    transaction_date,
-                    recurring,
-                    vendor_id
-                ]
-                
-                print(final_details)
-                self.transDetails.append(final_details)
-            else:
-                print(f"Skipping invalid details for TID: {TID}, Details: {details}")
+    def transaction_page_arguments(self):
+        """Arguments of TransClass.get_transaction_page for the current window, one row longer than a page."""
+        return (self.user_id, self.PAGE_SIZE + 1, self.page_cursors[-1], self.sort_by, self.sort_descending, self.filters)
+
+    def prepare_transaction_details(self, rows=None):
+        """
+        Keep the current window of transactions, as returned by one joined keyset query (run here if rows is None).
+
+        One extra row is requested to find out whether an older page exists; only PAGE_SIZE rows are kept.
+        Each entry of self.transDetails is laid out as:
+        [ transaction_id, budget_account_name, budget_account_id, amount, description, transaction_date, recurring, vendor_id, vendor_name ]
+        """
+        if rows is None:
+            rows = self.trans_funcs.get_transaction_page(*self.transaction_page_arguments())
+        self.has_next_page = len(rows) > self.PAGE_SIZE
+        self.transDetails = rows[:self.PAGE_SIZE]
+
+    def update_pagination_controls(self):
+        """Enable or disable the page buttons to match the current window."""
+        self.previous_page_button.disabled = len(self.page_cursors) == 1
+        self.next_page_button.disabled = not self.has_next_page
+        self.page_label.value = f"Page {len(self.page_cursors)}"
+
+    def show_next_page(self, e):
+        """Move to the next window, keyed on the last row currently shown."""
+        if not self.has_next_page or not self.transDetails:
+            return
+        self.page_cursors.append(self.trans_funcs.get_page_key(self.transDetails[-1], self.sort_by))
+        self.refresh_data()
+
+    def show_previous_page(self, e):
+        """Move back to the previous window."""
+        if len(self.page_cursors) == 1:
+            return
+        self.page_cursors.pop()
+        self.refresh_data()
 
 
 
@@ -242,8 +334,7 @@ class Transactions(ft.View):
             def delete_row(e, tid=transaction_id):
                 print(f"Deleting transaction with ID: {tid}")
                 self.trans_funcs.delete_transaction(tid)
-                self.refresh_data()
-                self.page.update()
+                self.refresh_data()  # Steps back a page if this was the last row of the final page
 
             def edit_transaction(e, tid, transaction_row):
                 # Instead of re-querying, use the provided transaction_row.
@@ -282,30 +373,88 @@ class Transactions(ft.View):
 
     def sort_transactions(self, sort_by):
         """
-        Sorts the transactions stored in self.transDetails and then refreshes the table.
+        Re-query the transactions in the requested order and show the first page.
         
         Parameters:
             sort_by (str): The column to sort by. Accepts "budget_account_id", "transaction_amount", or "transaction_date".
         """
         if sort_by == "budget_account_id":
-            # Budget Account ID is stored at index 2
-            self.transDetails.sort(key=lambda x: x[2])
+            self.sort_descending = False
         elif sort_by == "transaction_amount":
-            # Transaction amount is stored at index 3 (a numeric value)
-            self.transDetails.sort(key=lambda x: x[3], reverse=self.amount_descending)
+            self.sort_descending = self.amount_descending
             # Toggle the sort order for next time.
             self.amount_descending = not self.amount_descending
         elif sort_by == "transaction_date":
-            # Transaction date is stored at index 5
-            self.transDetails.sort(key=lambda x: str(x[5])[:10], reverse=True)
+            self.sort_descending = True
         else:
             print("Unsupported sort key:", sort_by)
             return
 
-        # Refresh the table rows after sorting.
-        new_data_rows = self.create_transaction_rows()
-        self.table.rows = new_data_rows
-        self.page.update()
+        self.sort_by = sort_by
+        self.page_cursors = [None]
+        self.refresh_data()
+
+    def populate_filter_options(self):
+        """Fill the account and vendor filter dropdowns for the current user."""
+        accounts = self.user_data.get_all_budget_accounts() or []
+        vendors = self.vend_funcs.get_all_vendors(self.user_id) or []
+        self.account_filter.options = [ft.dropdown.Option(key="all", text="All")] + [
+            ft.dropdown.Option(key=str(account[0]), text=account[1]) for account in accounts
+        ]
+        self.vendor_filter.options = [ft.dropdown.Option(key="all", text="All")] + [
+            ft.dropdown.Option(key=str(vendor[0]), text=vendor[1]) for vendor in vendors
+        ]
+
+    def apply_filters(self, e):
+        """Read the filter controls into self.filters and reload from the first page."""
+        filters = {}
+        for field in (self.start_date_filter, self.end_date_filter, self.min_amount_filter, self.max_amount_filter):
+            field.error_text = None
+
+        if self.account_filter.value not in (None, "all"):
+            filters["account_id"] = int(self.account_filter.value)
+        if self.vendor_filter.value not in (None, "all"):
+            filters["vendor_id"] = int(self.vendor_filter.value)
+        if self.recurring_filter.value not in (None, "all"):
+            filters["recurring"] = int(self.recurring_filter.value)
+
+        for key, field in (("start_date", self.start_date_filter), ("end_date", self.end_date_filter)):
+            value = (field.value or "").strip()
+            if not value:
+                continue
+            try:
+                filters[key] = datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                field.error_text = "Use YYYY-MM-DD"
+                self.page.update()
+                return
+
+        for key, field in (("min_amount", self.min_amount_filter), ("max_amount", self.max_amount_filter)):
+            value = (field.value or "").strip()
+            if not value:
+                continue
+            try:
+                filters[key] = Money.from_dollars(value)
+            except ValueError:
+                field.error_text = "Not a number"
+                self.page.update()
+                return
+
+        self.filters = filters
+        self.page_cursors = [None]
+        self.refresh_data()
+
+    def clear_filters(self, e):
+        """Reset every filter control and reload from the first page."""
+        self.account_filter.value = "all"
+        self.vendor_filter.value = "all"
+        self.recurring_filter.value = "all"
+        for field in (self.start_date_filter, self.end_date_filter, self.min_amount_filter, self.max_amount_filter):
+            field.value = ""
+            field.error_text = None
+        self.filters = {}
+        self.page_cursors = [None]
+        self.refresh_data()
 
 
 
@@ -313,6 +462,7 @@ class Transactions(ft.View):
     def refresh_after_vendor_add(self):
         print("Vendor added, refreshing vendor-related data...")
         self.add_transaction_dialog.open_and_refresh()
+        self.populate_filter_options()
         self.refresh_data()
 
     def show_add_vendor_dialog(self, e):
@@ -325,5 +475,15 @@ class Transactions(ft.View):
         print("Opening AddTransaction dialog")
         self.page.dialog = self.add_transaction_dialog
         self.add_transaction_dialog.open_and_refresh()
+
+    def show_import_dialog(self, e):
+        print("Opening ImportTransactions dialog")
+        self.import_dialog.open_and_refresh()
+
+    def refresh_after_import(self):
+        print("Transactions imported, refreshing transaction-related data...")
+        self.page_cursors = [None]
+        self.populate_filter_options()
+        self.refresh_data()
     
     
\ No newline at end of file
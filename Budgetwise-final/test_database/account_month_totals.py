@@ -0,0 +1,68 @@
+import os
+import sys
+import argparse
+from pathlib import Path
+import keyring
+import sqlcipher3
+
+# Allow this script to import the application packages when run from this folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.backend.database_creation.installation import Installation  # noqa: E402
+from src.backend.database_creation.performance_profiles import apply_cipher_settings  # noqa: E402
+from tamper_with_db import app_name, db_filename, get_app_folder  # noqa: E402
+
+
+def open_app_db(db_path=None):
+    """Open the application's encrypted database using the password stored in the keyring."""
+    db_path = db_path or os.path.join(get_app_folder(), db_filename)
+    if not os.path.exists(db_path):
+        print(f"Error: No database found at {db_path}.")
+        return None
+
+    password = keyring.get_password(app_name, "db_password")
+    if password is None:
+        print("Error: No password found for the database. Cannot proceed.")
+        return None
+
+    conn = sqlcipher3.connect(db_path)
+    conn.execute(f"PRAGMA key='{password}'")
+    apply_cipher_settings(conn, Installation().load_settings()["cipher"])
+    conn.execute("PRAGMA foreign_keys = 1")
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify the account_month_totals summary table.")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    parser.add_argument("--db", help="Path to the database (defaults to the application folder)")
+    args = parser.parse_args()
+
+    conn = open_app_db(args.db)
+    if conn is None:
+        return 1
+
+    installer = Installation()
+    try:
+        if args.command == "rebuild":
+            installer.rebuild_account_month_totals(conn)
+            return 0
+
+        mismatches = installer.verify_account_month_totals(conn)
+        if not mismatches:
+            print("account_month_totals matches the transactions table.")
+            return 0
+        print(f"{len(mismatches)} mismatching account months (account, month, stored, actual):")
+        for row in mismatches:
+            print(row)
+        print("Run with 'rebuild' to recompute the totals.")
+        return 1
+    except Exception as e:
+        print(f"Error checking account month totals: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
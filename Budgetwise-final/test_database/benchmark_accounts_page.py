@@ -0,0 +1,97 @@
+import sys
+import argparse
+import shutil
+from datetime import datetime, date, timedelta
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, seed_transactions, add_transactions, time_call
+
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.trans_class import TransClass
+
+
+def get_accounts(cursor, user_id):
+    cursor.execute(
+        "SELECT budget_accounts_id, account_name, total_allocated_amount FROM budget_accounts WHERE user_id = ?",
+        (user_id,),
+    )
+    return cursor.fetchall()
+
+
+def load_per_account(cursor, user_id):
+    """The original Accounts.refresh_table path: one strftime-filtered query per account."""
+    now = datetime.now()
+    result = {}
+    for account_id, _, _ in get_accounts(cursor, user_id):
+        cursor.execute("""
+            SELECT description, amount, transaction_date
+            FROM transactions
+            WHERE budget_accounts_id = ? AND user_id = ?
+            AND strftime('%m', transaction_date) = ?
+            AND strftime('%Y', transaction_date) = ?
+        """, (account_id, user_id, f"{now.month:02d}", f"{now.year}"))
+        result[account_id] = cursor.fetchall()
+    return result
+
+
+def load_grouped(cursor, trans_funcs, user_id):
+    """The range-predicate path: one grouped query for the month."""
+    now = datetime.now()
+    get_accounts(cursor, user_id)
+    return trans_funcs.get_month_transactions_by_account(user_id, now.year, now.month)
+
+
+def load_summary(cursor, trans_funcs, user_id):
+    """The current path: month totals from account_month_totals plus this month's scheduled spend."""
+    now = datetime.now()
+    get_accounts(cursor, user_id)
+    totals = trans_funcs.get_account_month_totals(user_id, now.year, now.month)
+    scheduled = trans_funcs.get_scheduled_totals(user_id, now.year, now.month, now.strftime("%Y-%m-%d"))
+    return totals, scheduled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the Accounts page data load as transaction history grows.")
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--history", type=int, nargs="+", default=[25_000, 50_000, 100_000, 200_000])
+    parser.add_argument("--month-rows", type=int, default=2_000, help="transactions in the current month")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    month_start = date.today().replace(day=1)
+    print(f"{args.accounts} accounts, {args.month_rows} transactions in the current month")
+    print(f"{'history':>8} {'per-account (s)':>16} {'grouped (s)':>12} {'summary (s)':>12}")
+    for history in args.history:
+        db_path, conn = create_benchmark_database()
+        try:
+            account_ids, vendor_ids = seed_transactions(conn, 0, account_count=args.accounts)
+            # Older history stops before the current month; the current month has a fixed size
+            add_transactions(conn, history - args.month_rows, account_ids, vendor_ids,
+                             start_date=month_start - timedelta(days=730), days=730)
+            add_transactions(conn, args.month_rows, account_ids, vendor_ids, start_date=month_start, days=28)
+            conn.execute("ANALYZE")
+
+            user_data = UserData(BenchmarkDatabase(db_path))
+            user_data.user_id = 1
+            trans_funcs = TransClass(user_data)
+            cursor = conn.cursor()
+
+            old_rows = sum(len(v) for v in load_per_account(cursor, 1).values())
+            new_rows = sum(len(v) for v in load_grouped(cursor, trans_funcs, 1).values())
+            assert old_rows == new_rows
+            totals, _ = load_summary(cursor, trans_funcs, 1)
+            grouped_totals = {k: sum(t[2] for t in v) for k, v in load_grouped(cursor, trans_funcs, 1).items()}
+            assert all(abs(totals[k] - grouped_totals[k]) < 0.005 for k in grouped_totals)
+
+            old = time_call(lambda: load_per_account(cursor, 1), args.repeat)
+            new = time_call(lambda: load_grouped(cursor, trans_funcs, 1), args.repeat)
+            summary = time_call(lambda: load_summary(cursor, trans_funcs, 1), args.repeat)
+            print(f"{history:>8} {old:>16.4f} {new:>12.4f} {summary:>12.4f}")
+            user_data.db.close_db()
+        finally:
+            conn.close()
+            shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
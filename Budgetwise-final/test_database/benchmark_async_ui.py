@@ -0,0 +1,97 @@
+import io
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import contextlib
+from pathlib import Path
+from datetime import date
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, heartbeat
+from generate_data import generate_dataset
+
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.trans_class import TransClass
+from src.backend.database_interation.async_db import AsyncDatabase
+from src.backend.database_interation.dates import iso_today
+
+PAGE_SIZE = 50
+
+
+def page_loads(db, trans_funcs):
+    """The queries the dashboard, accounts and transactions pages run when they are opened."""
+    today = date.today()
+
+    def reader_query(query, params):
+        with db.reader() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    return [
+        (reader_query, ("SELECT total_budgeted_amount FROM budgets WHERE user_id = ?", (1,))),
+        (reader_query, ("SELECT budget_accounts_id, account_name, total_allocated_amount, current_amount FROM budget_accounts WHERE user_id = ?", (1,))),
+        (reader_query, ("""SELECT ba.account_name, v.vendor_name, t.transaction_date, t.amount
+                           FROM transactions t
+                           JOIN vendors v ON t.vendor_id = v.vendor_id
+                           JOIN budget_accounts ba ON t.budget_accounts_id = ba.budget_accounts_id
+                           WHERE t.user_id = ? AND t.transaction_date > ?
+                           ORDER BY t.transaction_date ASC""", (1, iso_today()))),
+        (trans_funcs.get_transaction_page, (1, PAGE_SIZE + 1)),
+        (trans_funcs.get_transaction_page, (1, PAGE_SIZE + 1, None, "budget_account_id", True, {"min_amount": 100})),
+        (trans_funcs.get_account_month_totals, (1, today.year, today.month)),
+        (trans_funcs.get_scheduled_totals, (1, today.year, today.month, iso_today())),
+    ]
+
+
+async def measure(loads, async_db):
+    """Run every page load on the event loop (async_db None) or through the executor; return (elapsed, longest stall)."""
+    stop, gaps = asyncio.Event(), []
+    ticker = asyncio.create_task(heartbeat(stop, gaps))
+    await asyncio.sleep(0.02)
+    began = time.perf_counter()
+    if async_db is None:
+        for func, args in loads:
+            func(*args)
+    else:
+        await asyncio.gather(*(async_db.run(func, *args) for func, args in loads))
+    elapsed = time.perf_counter() - began
+    await asyncio.sleep(0.02)
+    stop.set()
+    await ticker
+    return elapsed, max(gaps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long page loads freeze the Flet event loop.")
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_dataset(conn, transactions=args.transactions, reports=0, days=365)
+            conn.close()
+            db = BenchmarkDatabase(db_path)
+        user_data = UserData(db)
+        user_data.user_id = 1
+        loads = page_loads(db, TransClass(user_data))
+        async_db = AsyncDatabase(db)
+
+        print(f"{args.transactions} transactions, {len(loads)} page queries per run (best of {args.repeat})")
+        print(f"{'queries run':>14} {'total ms':>9} {'longest stall ms':>17}")
+        for name, runner in (("on event loop", None), ("on executor", async_db)):
+            results = [asyncio.run(measure(loads, runner)) for _ in range(args.repeat)]
+            elapsed, stall = min(results)
+            print(f"{name:>14} {elapsed * 1000:>9.1f} {stall * 1000:>17.1f}")
+
+        async_db.shutdown()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.close_db()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+from benchmark_utils import open_encrypted, seed_transactions, time_call
+
+from src.backend.database_creation.installation import Installation
+from src.backend.database_creation.migrations import run_migrations
+from src.backend.database_interation.dates import iso_today
+
+RANGE_TOTALS = """SELECT budget_accounts_id, SUM(amount) FROM transactions
+                  WHERE user_id = 1 AND transaction_date >= ? AND transaction_date < ?
+                  GROUP BY budget_accounts_id"""
+
+
+def create_mixed_date_database(db_path, transaction_count):
+    """A database at schema version 5 where every other transaction_date carries a time part."""
+    conn = open_encrypted(db_path)
+    run_migrations(conn, progress=None, target=5)
+    seed_transactions(conn, transaction_count)
+    conn.execute("UPDATE transactions SET transaction_date = transaction_date || ' 13:22:32' WHERE transaction_id % 2 = 0")
+    conn.commit()
+    return conn
+
+
+def status_by_parsing(dates):
+    """What the Accounts page did for every row: parse the date and compare datetimes."""
+    now = datetime.now()
+    return ["" if datetime.strptime(d.split()[0], "%Y-%m-%d") <= now else "Scheduled" for d in dates]
+
+
+def status_by_comparing(dates):
+    today = iso_today()
+    return ["" if d <= today else "Scheduled" for d in dates]
+
+
+def measure(conn, name, status, repeat):
+    dates = [d for (d,) in conn.execute("SELECT transaction_date FROM transactions")]
+    bounds = ((date.today() - timedelta(days=90)).isoformat(), date.today().isoformat())
+    plan = "; ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + RANGE_TOTALS, bounds))
+    return (name,
+            time_call(lambda: status(dates), repeat),
+            time_call(lambda: conn.execute(RANGE_TOTALS, bounds).fetchall(), repeat),
+            plan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare mixed-format transaction dates with canonical YYYY-MM-DD dates.")
+    parser.add_argument("--transactions", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="budgetwise_dates_")
+    try:
+        conn = create_mixed_date_database(str(Path(directory) / "BudgetWise.db"), args.transactions)
+        rows = [measure(conn, "mixed formats", status_by_parsing, args.repeat)]
+
+        began = time.perf_counter()
+        run_migrations(conn, progress=None)
+        migration_s = time.perf_counter() - began
+        rows.append(measure(conn, "YYYY-MM-DD", status_by_comparing, args.repeat))
+
+        print(f"{args.transactions} transactions, half with a time part before migrating")
+        print(f"{'dates':>14} {'row status ms':>14} {'90-day totals ms':>17}  plan")
+        for name, status_s, totals_s, plan in rows:
+            print(f"{name:>14} {status_s * 1000:>14.1f} {totals_s * 1000:>17.1f}  {plan}")
+        print(f"migration: {migration_s:.2f} s")
+
+        mismatches = Installation().verify_account_month_totals(conn)
+        print(f"account month totals {'match' if not mismatches else f'differ in {len(mismatches)} rows'}")
+        try:
+            conn.execute("UPDATE transactions SET transaction_date = '04/14/2025' WHERE transaction_id = 1")
+            print("non-canonical date accepted")
+        except Exception as e:
+            print(f"non-canonical date rejected: {e}")
+        conn.rollback()
+        conn.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import os
+import sys
+import csv
+import random
+import argparse
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, seed_transactions
+
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.transaction_import import TransactionImporter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB, or None where it cannot be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def records(count, seed=11):
+    """Synthetic bank rows: ~5% deposits, the rest withdrawals across 500 payees and 6 categories."""
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=730)
+    categories = ["Account 1", "Account 2", "Account 3", "Account 4", "Account 5", "Account 6"]
+    for n in range(count):
+        amount = round(rng.uniform(1, 250), 2)
+        yield (
+            start + timedelta(days=rng.randrange(730)),
+            amount if rng.random() < 0.05 else -amount,
+            f"Payee {rng.randrange(500)}",
+            f"Card purchase {n}",
+            rng.choice(categories),
+        )
+
+
+def write_csv(path, count):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Amount", "Payee", "Memo", "Category"])
+        for day, amount, payee, memo, category in records(count):
+            writer.writerow([day.strftime("%m/%d/%Y"), f"{amount:.2f}", payee, memo, category])
+
+
+def write_ofx(path, count):
+    with open(path, "w") as f:
+        f.write("OFXHEADER:100\nDATA:OFXSGML\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n")
+        for day, amount, payee, memo, _ in records(count):
+            f.write(f"<STMTTRN><TRNTYPE>{'CREDIT' if amount > 0 else 'DEBIT'}<DTPOSTED>{day.strftime('%Y%m%d')}120000"
+                    f"<TRNAMT>{amount:.2f}<NAME>{payee}<MEMO>{memo}</STMTTRN>\n")
+        f.write("</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n")
+
+
+def write_qif(path, count):
+    with open(path, "w") as f:
+        f.write("!Type:Bank\n")
+        for day, amount, payee, memo, category in records(count):
+            f.write(f"D{day.strftime('%m/%d/%Y')}\nT{amount:.2f}\nP{payee}\nM{memo}\nL{category}\n^\n")
+
+
+WRITERS = {"csv": write_csv, "ofx": write_ofx, "qif": write_qif}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the bulk transaction importer on synthetic bank exports.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--formats", nargs="+", default=["csv"], choices=list(WRITERS))
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'format':>6} {'rows':>9} {'file MB':>8} {'imported':>9} {'seconds':>8} {'rows/s':>9} {'peak MB':>8}")
+    for file_format in args.formats:
+        for count in args.rows:
+            db_path, conn = create_benchmark_database()
+            directory = Path(db_path).parent
+            try:
+                account_ids, _ = seed_transactions(conn, 0, vendor_count=0)
+                conn.close()
+                source = directory / f"export.{file_format}"
+                WRITERS[file_format](source, count)
+
+                db = BenchmarkDatabase(db_path)
+                user_data = UserData(db)
+                user_data.user_id = 1
+                result = TransactionImporter(user_data, batch_size=args.batch_size).import_file(str(source), account_ids[0])
+                peak = peak_memory_mb()
+                print(f"{file_format:>6} {count:>9} {os.path.getsize(source) / 1e6:>8.1f} {result['imported']:>9} "
+                      f"{result['seconds']:>8.1f} {result['rows_per_second']:>9.0f} {peak if peak is not None else float('nan'):>8.0f}")
+                db.close_db()
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import io
+import sys
+import time
+import shutil
+import argparse
+import contextlib
+import threading
+from pathlib import Path
+
+import sqlcipher3
+
+from benchmark_utils import BENCHMARK_PASSWORD, BenchmarkDatabase, create_benchmark_database
+
+from src.backend.database_creation.cipher_keys import apply_key, derive_raw_key, read_salt
+from src.backend.database_creation.performance_profiles import apply_cipher_settings, get_profile
+
+
+def open_connection(db_path, cipher_settings, raw_key=None):
+    """Connect, unlock and read the schema, the way every pooled connection starts."""
+    conn = sqlcipher3.connect(str(db_path))
+    apply_key(conn, BENCHMARK_PASSWORD, raw_key)
+    apply_cipher_settings(conn, cipher_settings)
+    conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+    conn.close()
+
+
+def best_of(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - began)
+    return min(samples)
+
+
+def open_pool(db_path, profile, key_cache, readers):
+    """Open a Database pool and one reader connection on each of readers threads, then close it."""
+    def read(db):
+        with db.reader() as cursor:
+            cursor.execute("SELECT count(*) FROM users").fetchone()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = BenchmarkDatabase(db_path, profile=profile, key_cache=key_cache)
+        threads = [threading.Thread(target=read, args=(db,)) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        db.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare connection open latency with the passphrase and with a cached raw key.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--readers", type=int, default=3, help="reader threads opened with each pool (AsyncDatabase uses 3)")
+    args = parser.parse_args()
+
+    print(f"{'profile':>9} {'kdf_iter':>9} {'derive once ms':>15} {'passphrase open ms':>19} {'raw key open ms':>16}")
+    directories = []
+    try:
+        for profile in ("balanced", "fast"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                db_path, conn = create_benchmark_database(profile=profile)
+            conn.close()
+            directories.append(Path(db_path).parent)
+            cipher = get_profile(profile)["cipher"]
+            salt = read_salt(db_path)
+            raw_key = derive_raw_key(BENCHMARK_PASSWORD, salt, cipher)
+
+            derive_s = best_of(lambda: derive_raw_key(BENCHMARK_PASSWORD, salt, cipher), args.repeat)
+            passphrase_s = best_of(lambda: open_connection(db_path, cipher), args.repeat)
+            raw_s = best_of(lambda: open_connection(db_path, cipher, raw_key), args.repeat)
+            print(f"{profile:>9} {cipher.get('kdf_iter', 256000):>9} {derive_s * 1000:>15.1f} "
+                  f"{passphrase_s * 1000:>19.1f} {raw_s * 1000:>16.2f}")
+
+        db_path = directories[0] / "BudgetWise.db"
+        print()
+        print(f"Database pool open (writer + {args.readers} reader threads, balanced profile)")
+        print(f"{'key_cache':>10} {'open ms':>9}")
+        for key_cache in ("off", "memory", "keyring"):
+            BenchmarkDatabase.cached_keys.clear()
+            if key_cache == "keyring":
+                open_pool(db_path, "balanced", key_cache, 0)  # The first open derives and caches the key
+            elapsed = best_of(lambda: open_pool(db_path, "balanced", key_cache, args.readers), args.repeat)
+            print(f"{key_cache:>10} {elapsed * 1000:>9.1f}")
+    finally:
+        for directory in directories:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
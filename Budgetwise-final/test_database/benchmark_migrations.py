@@ -0,0 +1,63 @@
+import sys
+import time
+import shutil
+import argparse
+from pathlib import Path
+
+from benchmark_utils import create_benchmark_database, open_encrypted
+from generate_data import generate_dataset
+
+from src.backend.database_creation.installation import Installation
+from src.backend.database_creation.migrations import SCHEMA_VERSION, get_schema_version, run_migrations
+
+
+def make_unversioned(conn):
+    """
+    Turn a freshly generated database back into one written before schema versions existed:
+    version 0, no account month totals and no report summaries.
+    """
+    conn.executescript("""
+        DROP TABLE account_month_totals;
+        DROP TABLE report_account_totals;
+        UPDATE reports SET summary_version = NULL;
+        PRAGMA user_version = 0;
+    """)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time upgrading an unversioned database and the startup version check.")
+    parser.add_argument("--transactions", type=int, default=100_000, help="transactions in the generated data")
+    parser.add_argument("--reports", type=int, default=24)
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database()
+    try:
+        generate_dataset(conn, transactions=args.transactions, reports=args.reports, days=730)
+        make_unversioned(conn)
+        conn.close()
+
+        conn = open_encrypted(db_path)
+        print(f"upgrading from version {get_schema_version(conn)} to {SCHEMA_VERSION}")
+        began = time.perf_counter()
+        steps = run_migrations(conn)
+        print(f"{steps} migrations: {time.perf_counter() - began:.2f} s")
+
+        mismatches = Installation().verify_account_month_totals(conn)
+        print(f"account month totals {'match' if not mismatches else f'differ in {len(mismatches)} rows'}")
+        conn.close()
+
+        # Every later launch only reads the version
+        conn = open_encrypted(db_path)
+        timings = []
+        for _ in range(100):
+            began = time.perf_counter()
+            run_migrations(conn)
+            timings.append(time.perf_counter() - began)
+        print(f"startup check when up to date: {min(timings) * 1e6:.0f} us")
+        conn.close()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
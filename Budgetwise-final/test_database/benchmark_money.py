@@ -0,0 +1,104 @@
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import date, timedelta
+
+from benchmark_utils import open_encrypted, time_call
+
+from src.backend.database_creation.installation import Installation
+from src.backend.database_creation.migrations import run_migrations
+from src.backend.database_interation.money import Money
+
+ACCOUNTS = 12
+
+
+def create_dollar_database(db_path, transaction_count, seed=11):
+    """A database at schema version 4, the last to store amounts as REAL dollars, filled with transactions."""
+    conn = open_encrypted(db_path)
+    run_migrations(conn, progress=None, target=4)
+    rng = random.Random(seed)
+    conn.execute("""INSERT INTO users (user_id, username, password_hash, security_question1, security_question2,
+                    security_question3, security_question1_answer, security_question2_answer, security_question3_answer)
+                    VALUES (1, 'bench', 'x', 'q1', 'q2', 'q3', 'a1', 'a2', 'a3')""")
+    conn.execute("""INSERT INTO budgets (user_id, budget_name, total_budgeted_amount, leftover_amount, start_date, end_date)
+                    VALUES (1, 'Bench', 50000.0, 0.0, DATE('now'), DATE('now', '+1 month'))""")
+    for n in range(ACCOUNTS):
+        conn.execute("""INSERT INTO budget_accounts (user_id, budget_id, account_name, total_allocated_amount, current_amount)
+                        VALUES (1, 1, ?, 1234.56, 1234.56)""", (f"Account {n + 1}",))
+    conn.execute("INSERT INTO vendors (user_id, vendor_name) VALUES (1, 'Vendor')")
+    start = date.today() - timedelta(days=730)
+    conn.executemany(
+        """INSERT INTO transactions (user_id, budget_accounts_id, vendor_id, amount, transaction_date, description)
+           VALUES (1, ?, 1, ?, ?, 'Purchase')""",
+        ((rng.randint(1, ACCOUNTS), round(rng.uniform(0.01, 250), 2),
+          (start + timedelta(days=rng.randrange(730))).strftime("%Y-%m-%d")) for _ in range(transaction_count)),
+    )
+    conn.commit()
+    return conn
+
+
+def python_total(conn):
+    """What the pages did: fetch every amount and add them up in Python."""
+    return sum(amount for (amount,) in conn.execute("SELECT amount FROM transactions WHERE user_id = 1"))
+
+
+def sql_total(conn):
+    return conn.execute("SELECT SUM(amount) FROM transactions WHERE user_id = 1").fetchone()[0]
+
+
+def sql_month_totals(conn):
+    return conn.execute("""SELECT budget_accounts_id, substr(transaction_date, 1, 7), SUM(amount)
+                           FROM transactions WHERE user_id = 1 GROUP BY 1, 2""").fetchall()
+
+
+def drift(total, exact):
+    """How far a total is from the exact cents total, in dollars (cents totals are exact)."""
+    if isinstance(total, int):
+        return abs(int(total) - int(exact)) / 100
+    return abs(total - exact.dollars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare money aggregates on REAL dollars and INTEGER cents.")
+    parser.add_argument("--transactions", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="budgetwise_money_")
+    try:
+        conn = create_dollar_database(str(Path(directory) / "BudgetWise.db"), args.transactions)
+        # Reference total from the dollar strings, free of any float arithmetic
+        exact = sum(Money.from_dollars(repr(amount)) for (amount,) in conn.execute("SELECT amount FROM transactions"))
+
+        rows = []
+        rows.append(("REAL dollars", time_call(lambda: python_total(conn), args.repeat), time_call(lambda: sql_total(conn), args.repeat),
+                     time_call(lambda: sql_month_totals(conn), args.repeat), python_total(conn), sql_total(conn)))
+
+        began = time.perf_counter()
+        run_migrations(conn, progress=None)
+        migration_s = time.perf_counter() - began
+
+        rows.append(("INTEGER cents", time_call(lambda: python_total(conn), args.repeat), time_call(lambda: sql_total(conn), args.repeat),
+                     time_call(lambda: sql_month_totals(conn), args.repeat),
+                     Money(python_total(conn)), Money(sql_total(conn))))
+
+        print(f"{args.transactions} transactions, exact total ${exact:,.2f}")
+        print(f"{'storage':>14} {'Python sum ms':>14} {'SQL SUM ms':>11} {'by month ms':>12} {'Python sum off by':>18} {'SQL SUM off by':>15}")
+        for name, python_s, sql_s, month_s, python_value, sql_value in rows:
+            print(f"{name:>14} {python_s * 1000:>14.1f} {sql_s * 1000:>11.1f} {month_s * 1000:>12.1f} "
+                  f"{drift(python_value, exact):>18.2e} {drift(sql_value, exact):>15.2e}")
+        print(f"migration to cents: {migration_s:.2f} s")
+
+        mismatches = Installation().verify_account_month_totals(conn)
+        print(f"account month totals {'match' if not mismatches else f'differ in {len(mismatches)} rows'}")
+        conn.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import io
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import contextlib
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, heartbeat
+from generate_data import generate_dataset
+
+from src.backend.database_creation.hashing_profiles import (
+    HASHING_PROFILES,
+    calibrate_time_cost,
+    make_password_hasher,
+)
+from src.backend.database_interation.async_db import AsyncDatabase
+from src.backend.database_interation.user_data import UserData
+
+
+def best_of(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - began)
+    return min(samples)
+
+
+async def login_stall(user_data, async_db):
+    """Verify a login on the event loop (async_db None) or through the executor; return the longest loop stall."""
+    stop, gaps = asyncio.Event(), []
+    ticker = asyncio.create_task(heartbeat(stop, gaps))
+    await asyncio.sleep(0.02)
+    if async_db is None:
+        user_data.verify_password("user1", "password")
+    else:
+        await async_db.wrap(user_data).verify_password("user1", "password")
+    await asyncio.sleep(0.02)
+    stop.set()
+    await ticker
+    return max(gaps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time Argon2 hashing profiles, login responsiveness and rehashing on login.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--target-ms", type=float, default=250, help="time budget per hash to calibrate time_cost for")
+    args = parser.parse_args()
+
+    print(f"{'profile':>9} {'time_cost':>10} {'memory MiB':>11} {'lanes':>6} {'hash ms':>8} {'verify ms':>10}")
+    for name, parameters in HASHING_PROFILES.items():
+        hasher = make_password_hasher(name)
+        stored = hasher.hash("password")
+        hash_s = best_of(lambda: hasher.hash("password"), args.repeat)
+        verify_s = best_of(lambda: hasher.verify(stored, "password"), args.repeat)
+        print(f"{name:>9} {parameters['time_cost']:>10} {parameters['memory_cost'] / 1024:>11.0f} "
+              f"{parameters['parallelism']:>6} {hash_s * 1000:>8.1f} {verify_s * 1000:>10.1f}")
+
+    print()
+    print(f"Calibrated for {args.target_ms:.0f} ms per hash on this machine")
+    for memory_cost, parallelism in ((19456, 1), (65536, 4), (131072, 4)):
+        time_cost, elapsed = calibrate_time_cost(memory_cost, parallelism, args.target_ms / 1000)
+        print(f"  memory {memory_cost / 1024:.0f} MiB, {parallelism} lanes: time_cost {time_cost} ({elapsed * 1000:.0f} ms)")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db_path, conn = create_benchmark_database()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_dataset(conn, users=1, transactions=0, reports=0)  # user1's hashes use the standard profile
+            conn.close()
+            db = BenchmarkDatabase(db_path)
+        async_db = AsyncDatabase(db)
+        user_data = UserData(db)
+
+        print()
+        print(f"{'login verified':>15} {'longest loop stall ms':>22}")
+        for label, runner in (("on event loop", None), ("on executor", async_db)):
+            stall = min(asyncio.run(login_stall(user_data, runner)) for _ in range(args.repeat))
+            print(f"{label:>15} {stall * 1000:>22.1f}")
+
+        print()
+        db.settings["hashing_profile"] = "light"
+        light_user = UserData(db)
+        with contextlib.redirect_stdout(io.StringIO()):
+            began = time.perf_counter()
+            light_user.verify_password("user1", "password")
+            first_s = time.perf_counter() - began
+            second_s = best_of(lambda: light_user.verify_password("user1", "password"), args.repeat)
+        rehashed = not light_user.ph.check_needs_rehash(light_user.get_user_password_hash("user1"))
+        print("Switching the profile from standard to light:")
+        print(f"  first login (verify + rehash) {first_s * 1000:.1f} ms, later logins {second_s * 1000:.1f} ms, "
+              f"hash {'rehashed' if rehashed else 'NOT rehashed'}")
+
+        async_db.shutdown()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.close_db()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import threading
+import tracemalloc
+from pathlib import Path
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database
+from generate_data import generate_dataset
+
+from src.backend.database_interation.report_store import ReportStore
+from src.backend.database_interation.report_export import TRANSACTION_TABLE_STYLE, ReportPdfExporter
+
+
+def render_in_memory(report_store, file_path, report_ids):
+    """The previous Reports.generate_pdf_report: the whole story in one list, one table per account."""
+    styles = getSampleStyleSheet()
+    elements = []
+    for index, report_id in enumerate(report_ids):
+        if index:
+            elements.append(PageBreak())
+        elements.append(Paragraph("Monthly Report", styles["Title"]))
+        elements.append(Spacer(1, 12))
+        for account in report_store.get_report(report_id)["report_data"]:
+            transactions = account["transactions"]
+            remaining = account["balance"] - sum(txn["amount"] for txn in transactions)
+            elements.append(Paragraph(f"<b>Account:</b> {account['account_name']} <b>Balance:</b> ${account['balance']:.2f} "
+                                      f"<b>Remaining:</b> ${remaining:.2f}", styles["Heading3"]))
+            elements.append(Spacer(1, 6))
+            table_data = [["Description", "Amount", "Date"]]
+            table_data += [[txn["description"], f"${txn['amount']:.2f}", txn["date"].split()[0]] for txn in transactions]
+            table = Table(table_data, colWidths=[200, 100, 100])
+            table.setStyle(TRANSACTION_TABLE_STYLE)
+            elements.append(table)
+            elements.append(Spacer(1, 12))
+    SimpleDocTemplate(file_path, pagesize=letter).build(elements)
+
+
+def measure(render, report_store):
+    """Render from a cold report cache. Returns (seconds, peak traced MiB, file KiB)."""
+    report_store.invalidate()
+    file_path = os.path.join(tempfile.mkdtemp(prefix="budgetwise_pdf_"), "report.pdf")
+    try:
+        tracemalloc.start()
+        began = time.perf_counter()
+        render(file_path)
+        seconds = time.perf_counter() - began
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return seconds, peak / 2**20, os.path.getsize(file_path) / 1024
+    finally:
+        shutil.rmtree(Path(file_path).parent, ignore_errors=True)
+
+
+def cancel_latency(exporter, report_ids, after_s):
+    """Start a threaded export, cancel it after after_s seconds and time how long the worker takes to stop."""
+    file_path = os.path.join(tempfile.mkdtemp(prefix="budgetwise_pdf_"), "report.pdf")
+    finished = threading.Event()
+    result = {}
+
+    def done(outcome):
+        result.update(outcome)
+        finished.set()
+
+    try:
+        cancel = exporter.start(file_path, report_ids, on_done=done)
+        time.sleep(after_s)
+        began = time.perf_counter()
+        cancel.set()
+        finished.wait()
+        leftovers = os.listdir(Path(file_path).parent)
+        return result["status"], (time.perf_counter() - began) * 1000, leftovers
+    finally:
+        shutil.rmtree(Path(file_path).parent, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the in-memory PDF export with the streamed export.")
+    parser.add_argument("--transactions", type=int, default=50_000, help="transactions in the generated year")
+    parser.add_argument("--months", type=int, default=12)
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database()
+    try:
+        generate_dataset(conn, transactions=args.transactions, reports=args.months, days=365)
+        conn.close()
+        db = BenchmarkDatabase(db_path)
+        report_store = ReportStore(db)
+        exporter = ReportPdfExporter(report_store)
+        report_ids = [entry["report_id"] for entry in report_store.get_catalogue(1)]
+        month_rows = sum(len(a["transactions"]) for a in report_store.get_report(report_ids[-1])["report_data"])
+
+        print(f"{'export':>22} {'seconds':>8} {'peak MiB':>9} {'PDF KiB':>8}")
+        for label, ids in ((f"1 month ({month_rows} rows)", report_ids[-1:]), (f"{len(report_ids)} months", report_ids)):
+            for name, render in (("in memory", lambda path: render_in_memory(report_store, path, ids)),
+                                 ("streamed", lambda path: exporter.render(path, ids))):
+                seconds, peak, size = measure(render, report_store)
+                print(f"{label + ' ' + name:>22} {seconds:>8.2f} {peak:>9.1f} {size:>8.0f}")
+
+        status, latency_ms, leftovers = cancel_latency(exporter, report_ids, 0.5)
+        print(f"cancel: {status} {latency_ms:.0f} ms after the request, files left behind: {leftovers or 'none'}")
+        db.close_db()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
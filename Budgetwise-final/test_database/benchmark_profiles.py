@@ -0,0 +1,67 @@
+import sys
+import argparse
+import shutil
+import time
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, seed_transactions, time_call
+
+from src.backend.database_creation.performance_profiles import PERFORMANCE_PROFILES
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.trans_class import TransClass
+
+
+def insert_one_by_one(trans_funcs, account_id, vendor_id, count):
+    """The Add Transaction path: one INSERT and one commit per transaction."""
+    for n in range(count):
+        trans_funcs.create_transaction(account_id, vendor_id, 12.5, f"Insert {n}", False, "2024-06-15")
+
+
+def read_pages(trans_funcs, pages, page_size=50):
+    """Walk the Transactions page forward with keyset pagination."""
+    after = None
+    for _ in range(pages):
+        rows = trans_funcs.get_transaction_page(1, page_size, after)
+        if not rows:
+            break
+        after = trans_funcs.get_page_key(rows[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure insert and read throughput for each database performance profile.")
+    parser.add_argument("--profiles", nargs="+", default=list(PERFORMANCE_PROFILES), choices=list(PERFORMANCE_PROFILES))
+    parser.add_argument("--rows", type=int, default=50_000, help="transactions seeded before reading")
+    parser.add_argument("--inserts", type=int, default=500, help="single-row committed inserts to time")
+    parser.add_argument("--pages", type=int, default=200, help="50-row pages read per pass")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'profile':>10} {'open (ms)':>10} {'inserts/s':>10} {'rows read/s':>12} {'month load (ms)':>16}")
+    for profile in args.profiles:
+        db_path, conn = create_benchmark_database(profile=profile)
+        try:
+            account_ids, vendor_ids = seed_transactions(conn, args.rows)
+            conn.close()
+
+            start = time.perf_counter()
+            db = BenchmarkDatabase(db_path, profile=profile)
+            with db.transaction() as cursor:
+                cursor.execute("SELECT count(*) FROM sqlite_master").fetchone()  # The writer derives its key on first use
+            open_ms = (time.perf_counter() - start) * 1000
+
+            user_data = UserData(db)
+            user_data.user_id = 1
+            trans_funcs = TransClass(user_data)
+
+            insert_s = time_call(lambda: insert_one_by_one(trans_funcs, account_ids[0], vendor_ids[0], args.inserts), 1)
+            read_s = time_call(lambda: read_pages(trans_funcs, args.pages), args.repeat)
+            month_s = time_call(lambda: trans_funcs.get_month_transactions_by_account(1, 2024, 6), args.repeat)
+            print(f"{profile:>10} {open_ms:>10.1f} {args.inserts / insert_s:>10.0f} "
+                  f"{args.pages * 50 / read_s:>12.0f} {month_s * 1000:>16.2f}")
+            db.close_db()
+        finally:
+            shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import io
+import sys
+import time
+import random
+import shutil
+import argparse
+import contextlib
+from datetime import date
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, time_call
+from benchmark_suite import page_state
+from generate_data import generate_dataset
+
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.trans_class import TransClass
+from src.backend.database_interation.report_store import ReportStore
+from src.ui.pages_scenes.accounts import Accounts
+
+
+def edit_month(trans_funcs, rng, month_ids, account_id, vendor_id, changes):
+    """Make changes edits to this month's transactions: new purchases, amount corrections and deletions."""
+    today = date.today().strftime("%Y-%m-%d")
+    for _ in range(changes):
+        action = rng.random()
+        if action < 0.5 or len(month_ids) < 2:
+            trans_funcs.create_transaction(account_id, vendor_id, round(rng.uniform(5, 80), 2), "New purchase", False, today, 1)
+        elif action < 0.9:
+            trans_funcs.setAmount(rng.choice(month_ids), round(rng.uniform(5, 80), 2))
+        else:
+            trans_funcs.delete_transaction(month_ids.pop(rng.randrange(len(month_ids))))
+
+
+def run(args, checkpoint_interval):
+    """Store args.reports reports with args.changes edits between each. Returns the measurements."""
+    db_path, conn = create_benchmark_database()
+    try:
+        generate_dataset(conn, transactions=args.transactions, reports=0, seed=args.seed)
+        conn.close()
+        db = BenchmarkDatabase(db_path)
+        user_data = UserData(db)
+        user_data.user_id = 1
+        trans_funcs = TransClass(user_data)
+        report_store = ReportStore(db, checkpoint_interval=checkpoint_interval)
+        state = page_state(db, user_data, trans_funcs, report_store=report_store)
+        state.get_accounts = lambda: Accounts.get_accounts(state)
+
+        start = date.today().replace(day=1).strftime("%Y-%m-%d")
+        with db.reader() as cursor:
+            month_ids = [row[0] for row in cursor.execute(
+                "SELECT transaction_id FROM transactions WHERE user_id = 1 AND transaction_date >= ?", (start,))]
+            account_id, vendor_id = cursor.execute("SELECT budget_accounts_id, vendor_id FROM transactions LIMIT 1").fetchone()
+
+        rng = random.Random(args.seed)
+        store_seconds = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.reports):
+                edit_month(trans_funcs, rng, month_ids, account_id, vendor_id, args.changes)
+                began = time.perf_counter()
+                Accounts.store_report(state)
+                store_seconds.append(time.perf_counter() - began)
+
+            with db.reader() as cursor:
+                sizes = [size for (size,) in cursor.execute("SELECT length(report_data) FROM reports ORDER BY report_id")]
+                latest = cursor.execute("SELECT max(report_id) FROM reports").fetchone()[0]
+            stored = report_store.get_report(latest)["report_data"]
+
+            def read_uncached():
+                report_store.invalidate()
+                report_store.get_report(latest)
+
+            read_s = time_call(read_uncached, args.repeat)
+
+        transactions = sum(len(account["transactions"]) for account in stored)
+        db.close_db()
+        return {
+            "transactions": transactions,
+            "total_kb": sum(sizes) / 1024,
+            "report_kb": sum(sizes[1:]) / max(len(sizes) - 1, 1) / 1024,
+            "store_ms": sum(store_seconds[1:]) / max(len(store_seconds) - 1, 1) * 1000,
+            "read_ms": read_s * 1000,
+            "report": stored,
+        }
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare storing every report in full with delta report chains.")
+    parser.add_argument("--transactions", type=int, default=100_000, help="transactions generated before the first report")
+    parser.add_argument("--reports", type=int, default=30, help="reports stored per run")
+    parser.add_argument("--changes", type=int, default=20, help="transaction edits between two reports")
+    parser.add_argument("--checkpoint-interval", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.reports} reports, {args.changes} edits between reports")
+    print(f"{'storage':>12} {'month rows':>10} {'KB/report':>10} {'total KB':>9} {'store ms':>9} {'uncached read ms':>17}")
+    reports = []
+    for name, interval in (("full", 1), (f"delta/{args.checkpoint_interval}", args.checkpoint_interval)):
+        result = run(args, interval)
+        reports.append(result["report"])
+        print(f"{name:>12} {result['transactions']:>10} {result['report_kb']:>10.1f} {result['total_kb']:>9.1f} "
+              f"{result['store_ms']:>9.1f} {result['read_ms']:>17.1f}")
+    # Both runs make the same edits, so the rebuilt delta report must equal the full snapshot
+    assert reports[0] == reports[1], "delta chain reconstructed a different report"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+from pathlib import Path
+
+from benchmark_utils import create_benchmark_database, time_call
+from generate_data import generate_dataset
+
+from src.backend.database_interation.report_codec import encode_report, decode_report
+
+
+def store_and_read(reports, encode, repeat):
+    """
+    Store every report in a fresh encrypted database, then time reading and decoding all of them back.
+
+    Returns:
+        tuple: (bytes the database file grew by, fastest read + decode seconds)
+    """
+    db_path, conn = create_benchmark_database()
+    try:
+        conn.execute("INSERT INTO users (user_id, username, password_hash, security_question1, security_question2, security_question3,"
+                     " security_question1_answer, security_question2_answer, security_question3_answer)"
+                     " VALUES (1, 'bench', 'x', 'q1', 'q2', 'q3', 'a1', 'a2', 'a3')")
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        before = os.path.getsize(db_path)
+        for report in reports:
+            conn.execute("INSERT INTO reports (user_id, report_type, report_data) VALUES (1, 1, ?)", (encode(report),))
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        growth = os.path.getsize(db_path) - before
+        read_s = time_call(lambda: [decode_report(blob) for (blob,) in conn.execute("SELECT report_data FROM reports")], repeat)
+        return growth, read_s
+    finally:
+        conn.close()
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy JSON report rows with compressed report snapshots.")
+    parser.add_argument("--transactions", type=int, default=50_000, help="transactions in the generated year")
+    parser.add_argument("--months", type=int, default=12, help="monthly reports to compare")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database()
+    try:
+        generate_dataset(conn, transactions=args.transactions, reports=args.months, days=365)
+        reports = [decode_report(blob) for (blob,) in conn.execute("SELECT report_data FROM reports ORDER BY report_date")]
+        conn.close()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+    as_json = [json.dumps(report) for report in reports]
+    as_snapshot = [encode_report(report) for report in reports]
+    assert all(decode_report(blob) == report for blob, report in zip(as_snapshot, reports))
+    transactions = sum(len(account["transactions"]) for report in reports for account in report)
+
+    rows = [
+        ("json", as_json, json.dumps, lambda: [json.loads(b) for b in as_json]),
+        ("snapshot", as_snapshot, encode_report, lambda: [decode_report(b) for b in as_snapshot]),
+    ]
+
+    print(f"{len(reports)} monthly reports, {transactions} transactions")
+    print(f"{'format':>9} {'blob KB':>9} {'db growth KB':>13} {'encode ms':>10} {'decode ms':>10} {'read+decode ms':>15}")
+    results = {}
+    for name, blobs, encode, decode_all in rows:
+        size = sum(len(blob) for blob in blobs)
+        growth, read_s = store_and_read(reports, encode, args.repeat)
+        encode_s = time_call(lambda: [encode(r) for r in reports], args.repeat)
+        decode_s = time_call(decode_all, args.repeat)
+        results[name] = (size, read_s)
+        print(f"{name:>9} {size / 1024:>9.1f} {growth / 1024:>13.1f} {encode_s * 1000:>10.1f} "
+              f"{decode_s * 1000:>10.1f} {read_s * 1000:>15.1f}")
+
+    print(f"snapshot blobs are {results['json'][0] / results['snapshot'][0]:.1f}x smaller; "
+          f"reading and decoding them from the database is {results['json'][1] / results['snapshot'][1]:.2f}x faster")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
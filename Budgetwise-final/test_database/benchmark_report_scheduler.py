@@ -0,0 +1,79 @@
+import io
+import sys
+import time
+import shutil
+import argparse
+import statistics
+import contextlib
+from datetime import date
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database
+from generate_data import generate_dataset
+
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.trans_class import TransClass
+from src.backend.database_interation.report_scheduler import ReportScheduler
+
+
+def ui_latencies(trans_funcs, until, limit):
+    """Time the Accounts page's month query back to back until until() is true or limit samples were taken."""
+    today = date.today()
+    samples = []
+    while not until() and len(samples) < limit:
+        began = time.perf_counter()
+        trans_funcs.get_month_transactions_by_account(1, today.year, today.month)
+        samples.append((time.perf_counter() - began) * 1000)
+    return samples
+
+
+def describe(samples):
+    ordered = sorted(samples)
+    return f"median {statistics.median(ordered):6.2f} ms, p95 {ordered[int(len(ordered) * 0.95) - 1]:6.2f} ms, max {ordered[-1]:6.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catch up on missed scheduled reports and measure the UI thread meanwhile.")
+    parser.add_argument("--transactions", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=730, help="history the generated transactions cover")
+    parser.add_argument("--samples", type=int, default=200, help="UI queries timed while idle")
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database()
+    try:
+        generate_dataset(conn, transactions=args.transactions, reports=0, days=args.days)
+        conn.execute("UPDATE users SET weekly_reports = 1, monthly_reports = 1, yearly_reports = 1 WHERE user_id = 1")
+        conn.commit()
+        conn.close()
+
+        db = BenchmarkDatabase(db_path)
+        trans_funcs = TransClass(UserData(db))
+        idle = ui_latencies(trans_funcs, lambda: False, args.samples)
+
+        scheduler = ReportScheduler(db, startup_delay=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            began = time.perf_counter()
+            scheduler.start()
+            # Wait for the worker to queue its catch-up jobs, then keep querying until the queue is drained
+            while scheduler.get_stats()["max_queue_depth"] == 0 and time.perf_counter() - began < 5:
+                time.sleep(0.001)
+            busy = ui_latencies(trans_funcs, lambda: scheduler.jobs.unfinished_tasks == 0, 1_000_000)
+            catch_up_s = time.perf_counter() - began
+            scheduler.stop()
+        stats = scheduler.get_stats()
+        with db.reader() as cursor:
+            reports = cursor.execute("SELECT report_type, count(*) FROM reports GROUP BY report_type").fetchall()
+        db.close_db()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+    print(f"catch-up: {stats['jobs_run']} reports ({dict(reports)} by type) in {catch_up_s * 1000:.0f} ms, "
+          f"{stats['jobs_failed']} failed, peak queue depth {stats['max_queue_depth']}")
+    print(f"job duration: average {stats['average_job_ms']:.1f} ms, max {stats['max_job_ms']:.1f} ms")
+    print(f"UI query idle:            {describe(idle)}")
+    if busy:
+        print(f"UI query during catch-up: {describe(busy)} ({len(busy)} samples)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import sys
+import time
+import shutil
+import argparse
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, open_encrypted, time_call
+from generate_data import generate_dataset
+
+from src.backend.database_interation.report_store import ReportStore
+from src.backend.database_interation.report_summary import migrate_report_summaries, summarize_report
+
+
+def totals_by_decoding(report_store, user_id):
+    """The previous way to get headline figures: decode every report and add up its transactions."""
+    totals = []
+    for entry in report_store.get_catalogue(user_id):
+        report = report_store.get_report(entry["report_id"])
+        summary, _ = summarize_report(report["report_data"], report["report_date"])
+        totals.append((entry["report_id"], summary["total_allocated"], summary["total_spent"]))
+    return totals
+
+
+def totals_from_catalogue(report_store, user_id):
+    """Headline figures read from the summary columns, answered by the catalogue index."""
+    return [(entry["report_id"], entry["total_allocated"], entry["total_spent"])
+            for entry in report_store.get_catalogue(user_id)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare headline report totals decoded from blobs with the stored summary columns.")
+    parser.add_argument("--transactions", type=int, default=20_000, help="transactions in the generated year")
+    parser.add_argument("--reports", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database()
+    try:
+        generate_dataset(conn, transactions=args.transactions, reports=args.reports, days=365)
+        conn.close()
+        db = BenchmarkDatabase(db_path)
+        report_store = ReportStore(db)
+
+        def cold_decode():
+            report_store.invalidate()
+            return totals_by_decoding(report_store, 1)
+
+        decoded = cold_decode()
+        stored = totals_from_catalogue(report_store, 1)
+        assert decoded == stored, "stored summaries differ from the decoded reports"
+
+        print(f"{len(stored)} reports, {args.transactions} transactions")
+        print(f"{'headline totals':>24} {'ms':>8}")
+        print(f"{'decoding every report':>24} {time_call(cold_decode, args.repeat) * 1000:>8.1f}")
+        print(f"{'summary columns':>24} {time_call(lambda: totals_from_catalogue(report_store, 1), args.repeat) * 1000:>8.1f}")
+
+        with db.reader() as cursor:
+            plan = cursor.execute(
+                "EXPLAIN QUERY PLAN SELECT report_id, total_allocated, total_spent FROM reports WHERE user_id = ? ORDER BY report_date",
+                (1,)).fetchall()
+        print("catalogue plan:", "; ".join(row[-1] for row in plan))
+
+        db.close_db()
+
+        # Backfill: forget every summary, as in a database written before the columns existed
+        conn = open_encrypted(db_path)
+        conn.execute("UPDATE reports SET summary_version = NULL")
+        conn.execute("DELETE FROM report_account_totals")
+        conn.commit()
+        began = time.perf_counter()
+        summarised = migrate_report_summaries(conn)
+        print(f"backfill of {summarised} reports: {(time.perf_counter() - began) * 1000:.1f} ms")
+        began = time.perf_counter()
+        migrate_report_summaries(conn)
+        print(f"check on an up-to-date database: {(time.perf_counter() - began) * 1000:.2f} ms")
+        conn.close()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
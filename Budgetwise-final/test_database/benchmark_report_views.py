@@ -0,0 +1,82 @@
+import io
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import contextlib
+from pathlib import Path
+
+import flet as ft
+
+from benchmark_utils import BenchmarkDatabase, RecordingConnection, create_benchmark_database
+from generate_data import generate_dataset
+
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.report_store import ReportStore
+from src.ui.components.colors import Colors
+from src.ui.components.navigation_rail import NavRail
+from src.ui.pages_scenes.history import History
+
+
+def switch(history, conn, option):
+    """Select a report on the History page like the dropdown does. Returns (milliseconds, bytes sent)."""
+    history.report_dropdown.value = option
+    sent = conn.bytes_sent
+    began = time.perf_counter()
+    history.handle_dropdown_selection(option)
+    return (time.perf_counter() - began) * 1000, conn.bytes_sent - sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time switching between reports on the History page.")
+    parser.add_argument("--transactions", type=int, default=20_000, help="transactions in the generated year")
+    parser.add_argument("--reports", type=int, default=3, help="reports to switch between")
+    parser.add_argument("--rounds", type=int, default=3, help="times each report is selected")
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database()
+    try:
+        generate_dataset(conn, transactions=args.transactions, reports=args.reports, days=365)
+        conn.close()
+        db = BenchmarkDatabase(db_path)
+        user_data = UserData(db)
+        user_data.user_id = 1
+
+        connection = RecordingConnection()
+        page = ft.Page(connection, "benchmark", asyncio.new_event_loop())
+        history = History(page, user_data, NavRail(page, user_data), Colors(), ReportStore(db))
+        with contextlib.redirect_stdout(io.StringIO()):
+            page.views.append(history)
+            page.update()
+        options = history.get_combined_report_options()[-args.reports:]
+        rows = sum(len(a["transactions"]) for entry in history.reports[-args.reports:]
+                   for a in history.report_store.get_report(entry["report_id"])["report_data"])
+
+        print(f"{len(options)} reports, {rows} transactions, each selected {args.rounds} times")
+        print(f"{'selection':>28} {'ms':>8} {'KiB sent':>9}")
+        for name, rebuild in (("rebuilt every time", True), ("cached views", False)):
+            first, again = [], []
+            for round_number in range(args.rounds):
+                for option in options:
+                    if rebuild:
+                        history.view_cache.clear()
+                        history.reports_page.view_cache.clear()
+                    (again if round_number else first).append(switch(history, connection, option))
+            for label, samples in (("first view", first), ("viewed again", again)):
+                ms = sum(s[0] for s in samples) / len(samples)
+                kib = sum(s[1] for s in samples) / len(samples) / 1024
+                print(f"{name + ', ' + label:>28} {ms:>8.1f} {kib:>9.1f}")
+
+        # Opening an account's transactions only sends that sub-table
+        sub_table = history.table.controls[-1].content.controls[-1].content.controls[1]
+        sent = connection.bytes_sent
+        history.toggle_sub_table(sub_table)
+        print(f"open one account's transactions: {(connection.bytes_sent - sent) / 1024:.1f} KiB sent")
+        db.close_db()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
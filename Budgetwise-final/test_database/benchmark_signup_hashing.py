@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+import argparse
+from types import SimpleNamespace
+
+import benchmark_utils  # noqa: F401  (puts the application packages on sys.path)
+
+from src.backend.database_creation.hashing_profiles import (
+    HASHING_MEMORY_BUDGET,
+    HASHING_PROFILES,
+    concurrent_hash_limit,
+)
+from src.backend.database_interation.user_data import UserData
+
+ANSWERS = ["Rex", "Civic 2004", "The Hobbit"]
+
+
+def best_of(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - began)
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the security questions submit (three Argon2 hashes) at different parallelism levels.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, memory budget {HASHING_MEMORY_BUDGET // 1024} MiB")
+    print(f"{'profile':>9} {'workers':>8} {'memory MiB':>11} {'3 answers ms':>13} {'speedup':>8}")
+    for name, parameters in HASHING_PROFILES.items():
+        # UserData only reads the hashing profile from the database settings for hashing
+        user_data = UserData(SimpleNamespace(settings={"hashing_profile": name}))
+        serial_s = None
+        for workers in range(1, args.max_workers + 1):
+            elapsed = best_of(lambda: user_data.hash_secrets(ANSWERS, max_workers=workers), args.repeat)
+            serial_s = serial_s or elapsed
+            memory_mib = min(workers, len(ANSWERS)) * parameters["memory_cost"] // 1024
+            print(f"{name:>9} {workers:>8} {memory_mib:>11} {elapsed * 1000:>13.1f} {serial_s / elapsed:>7.2f}x")
+        print(f"{'':>9} the budget allows {concurrent_hash_limit(user_data.ph)} at once on this machine")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import io
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import contextlib
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def first_frame(db_path, eager):
+    """
+    Runs in a fresh interpreter: import routing, build the views the way main.py does and draw the
+    login screen into a stand-in Flet client. With eager, every view is built and ReportLab imported
+    first, as the application did before routes were lazy.
+    """
+    from benchmark_utils import BenchmarkDatabase, RecordingConnection
+    import flet as ft
+    from routing import ROUTES, view_handler
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = BenchmarkDatabase(db_path)
+        page = ft.Page(RecordingConnection(), "benchmark", asyncio.new_event_loop())
+        views = view_handler(page, db)
+        if eager:
+            import src.backend.database_interation.report_export  # noqa: F401
+            for route in ROUTES:
+                views.get(route)
+        page.views.append(views.get("/login"))
+        page.update()
+    drawn = time.time()
+    db.close_db()
+    return {"drawn": drawn, "modules": len(sys.modules), "reportlab": "reportlab" in sys.modules}
+
+
+def import_times():
+    """Cumulative microseconds of every module imported by `import routing`, from python -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import routing"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time BudgetWise's cold start: imports and time to the first frame.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters started per mode")
+    parser.add_argument("--child", choices=["lazy", "eager"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(first_frame(args.db, args.child == "eager")))
+        return
+
+    from benchmark_utils import create_benchmark_database
+
+    times = import_times()
+    print(f"import routing: {times['routing'] / 1000:.1f} ms (python -X importtime)")
+    heaviest = sorted(((t, name) for name, t in times.items() if "." not in name and name != "routing"), reverse=True)[:8]
+    print("  heaviest packages: " + ", ".join(f"{name} {t / 1000:.1f} ms" for t, name in heaviest))
+    print(f"  reportlab imported: {'yes' if 'reportlab' in times else 'no'}")
+
+    db_path, conn = create_benchmark_database()
+    conn.close()
+    try:
+        print(f"{'views built':>18} {'first frame ms':>15} {'modules':>8} {'reportlab':>10}")
+        for mode in ("eager", "lazy"):
+            samples = []
+            for _ in range(args.runs):
+                began = time.time()
+                output = subprocess.run([sys.executable, __file__, "--child", mode, "--db", db_path],
+                                        cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+                                        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"))
+                result = json.loads(output.stdout.strip().splitlines()[-1])
+                samples.append((result["drawn"] - began) * 1000)
+            label = "all (before)" if mode == "eager" else "login only"
+            print(f"{label:>18} {min(samples):>15.0f} {result['modules']:>8} {'yes' if result['reportlab'] else 'no':>10}")
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
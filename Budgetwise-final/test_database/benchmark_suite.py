@@ -0,0 +1,301 @@
+import io
+import sys
+import json
+import shutil
+import argparse
+import platform
+import statistics
+import time
+import contextlib
+from datetime import date, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database
+from generate_data import generate_dataset, CATEGORIES
+
+from src.backend.database_creation.performance_profiles import PERFORMANCE_PROFILES, DEFAULT_PROFILE
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.trans_class import TransClass
+from src.backend.database_interation.vendor_funcs import Vendor
+from src.backend.database_interation.report_store import ReportStore
+from src.ui.pages_scenes.dashboard import Dashboard
+from src.ui.pages_scenes.accounts import Accounts
+from src.ui.pages_scenes.accounts_popup import MakeEdits
+from src.ui.pages_scenes.history import History
+from src.ui.pages_scenes.reports import Reports
+from src.ui.pages_scenes.transactions import Transactions
+from src.ui.components.edit_budget import EditBudget
+
+# Backend methods the suite leaves out, and why. Everything else in UserData, TransClass and Vendor is timed.
+NOT_TIMED = {
+    "TransClass.createTransaction": "inserts into a table named 'transaction', which does not exist",
+    "TransClass.getTransactionDetails": "passes a bare ID where sqlcipher3 expects a parameter sequence",
+    "TransClass.checkTransactionDate": "filters on a 'date' column, which does not exist",
+    "TransClass.create_transaction(transaction_data)": "shadowed by the later create_transaction definition",
+    "UserData.is_valid_username / is_valid_password": "pure regex checks that never touch the database",
+}
+
+
+class Rollback(Exception):
+    """Raised to undo a timed write, so every repetition runs against the same data."""
+
+
+def rolled_back(db, func):
+    """
+    Wrap a writing call so its changes are rolled back afterwards. The call runs inside
+    Database.transaction(), so its own commit_db() is skipped and the timing excludes the fsync.
+    """
+    def run():
+        try:
+            with db.transaction():
+                func()
+                raise Rollback
+        except Rollback:
+            pass
+    return run
+
+
+def measure(func, repeat):
+    """Time func repeat times with its console output silenced. Returns (best, median) in seconds."""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def page_state(db, user_data, trans_funcs, **attributes):
+    """
+    Stand-in for a page instance. Page data loaders only read the attributes set here, so they can
+    be called unbound (Dashboard.get_accounts(state)) without building a Flet page.
+    """
+    user_id = user_data.user_id
+    return SimpleNamespace(db=db, user_data=user_data, user_repo=user_data, trans_funcs=trans_funcs,
+                           userID=user_id, userid=user_id, user_id=user_id, **attributes)
+
+
+def build_cases(db, user_data, trans_funcs, vendors, report_store, sample):
+    """
+    Return (group, name, callable, repeat factor) for every timed operation. sample holds IDs picked
+    from the generated data; the repeat factor shortens loops around deliberately slow Argon2 calls.
+    """
+    user_id = user_data.user_id
+    today = date.today()
+    year, month = today.year, today.month
+    account_id, vendor_id, transaction_id = sample["account_id"], sample["vendor_id"], sample["transaction_id"]
+
+    def create_user():
+        # A separate UserData, because create_user() switches the instance to the new user
+        signup = UserData(db)
+        signup.temp_sign_up_data = {
+            "username": "benchsignup", "password_hash": sample["password_hash"],
+            "security_question1": "q1", "security_question2": "q2", "security_question3": "q3",
+            "security_question1_answer": "a1", "security_question2_answer": "a2", "security_question3_answer": "a3",
+        }
+        signup.create_user()
+
+    def answer_security_question():
+        user_data.get_security_questions()
+        user_data.verify_security_answer(1, "answer")
+
+    cases = [
+        ("UserData", "hash_password", lambda: user_data.hash_password("password"), 0.2),
+        ("UserData", "verify_password", lambda: user_data.verify_password(user_data.username, "password"), 0.2),
+        ("UserData", "create_user", rolled_back(db, create_user), 1),
+        ("UserData", "update_user_password", rolled_back(db, lambda: user_data.update_user_password(user_data.username, "password2")), 0.2),
+        ("UserData", "get_user_password_hash", lambda: user_data.get_user_password_hash(user_data.username), 1),
+        ("UserData", "get_security_questions + verify_security_answer", answer_security_question, 0.2),
+        ("UserData", "username_exists", lambda: user_data.username_exists(user_data.username), 1),
+        ("UserData", "get_user_by_username", lambda: user_data.get_user_by_username(user_data.username), 1),
+        ("UserData", "get_user_id", lambda: user_data.get_user_id(user_data.username), 1),
+        ("UserData", "create_budget", rolled_back(db, lambda: user_data.create_budget("Bench budget", 100.0)), 1),
+        ("UserData", "get_budget_id", user_data.get_budget_id, 1),
+        ("UserData", "get_budget_details", user_data.get_budget_details, 1),
+        ("UserData", "get_all_budget_details", user_data.get_all_budget_details, 1),
+        ("UserData", "get_budget_accounts", user_data.get_budget_accounts, 1),
+        ("UserData", "get_all_budget_accounts", user_data.get_all_budget_accounts, 1),
+        ("UserData", "add_budget_account", rolled_back(db, lambda: user_data.add_budget_account(user_data.budget_id, "Bench account", 50.0)), 1),
+        ("UserData", "add_budget_accounts", rolled_back(db, lambda: user_data.add_budget_accounts(
+            user_data.budget_id, [{"name": f"Bench {n}", "total_allocated": 10.0} for n in range(10)])), 1),
+        ("UserData", "update_budget_account_balance", rolled_back(db, lambda: user_data.update_budget_account_balance(CATEGORIES[0][0], 10.0)), 1),
+        ("UserData", "delete_budget_account", rolled_back(db, lambda: user_data.delete_budget_account(CATEGORIES[0][0])), 1),
+        ("UserData", "update_budget", rolled_back(db, lambda: user_data.update_budget(user_data.budget_name, user_data.budget_amount)), 1),
+
+        ("TransClass", "getBudgetAccountName", lambda: trans_funcs.getBudgetAccountName(account_id), 1),
+        ("TransClass", "get_transaction_rows", lambda: trans_funcs.get_transaction_rows(user_id), 1),
+        ("TransClass", "get_transaction_page", lambda: trans_funcs.get_transaction_page(user_id, 51), 1),
+        ("TransClass", "get_transaction_page (amount, filtered)", lambda: trans_funcs.get_transaction_page(
+            user_id, 51, sort_by="transaction_amount", filters={"account_id": account_id, "min_amount": 20}), 1),
+        ("TransClass", "get_month_transactions_by_account", lambda: trans_funcs.get_month_transactions_by_account(user_id, year, month), 1),
+        ("TransClass", "get_account_month_totals", lambda: trans_funcs.get_account_month_totals(user_id, year, month), 1),
+        ("TransClass", "get_scheduled_totals", lambda: trans_funcs.get_scheduled_totals(user_id, year, month, today.strftime("%Y-%m-%d")), 1),
+        ("TransClass", "get_account_month_transactions", lambda: trans_funcs.get_account_month_transactions(account_id, year, month), 1),
+        ("TransClass", "getTransactionList", lambda: trans_funcs.getTransactionList(user_id), 1),
+        ("TransClass", "getRecurring", lambda: trans_funcs.getRecurring(transaction_id), 1),
+        ("TransClass", "getAmount", lambda: trans_funcs.getAmount(transaction_id), 1),
+        ("TransClass", "getDescription", lambda: trans_funcs.getDescription(transaction_id), 1),
+        ("TransClass", "getDate", lambda: trans_funcs.getDate(transaction_id), 1),
+        ("TransClass", "setRecurring", rolled_back(db, lambda: trans_funcs.setRecurring(transaction_id, 1)), 1),
+        ("TransClass", "setAmount", rolled_back(db, lambda: trans_funcs.setAmount(transaction_id, 12.34)), 1),
+        ("TransClass", "setDescription", rolled_back(db, lambda: trans_funcs.setDescription(transaction_id, "Benchmark")), 1),
+        ("TransClass", "create_transaction", rolled_back(db, lambda: trans_funcs.create_transaction(
+            account_id, vendor_id, 9.99, "Benchmark", False, today.strftime("%Y-%m-%d"))), 1),
+        ("TransClass", "update_transaction", rolled_back(db, lambda: trans_funcs.update_transaction(
+            transaction_id, account_id, vendor_id, 19.99, "Benchmark", False, today.strftime("%Y-%m-%d"))), 1),
+        ("TransClass", "delete_transaction", rolled_back(db, lambda: trans_funcs.delete_transaction(transaction_id)), 1),
+        ("TransClass", "get_account_id", lambda: trans_funcs.get_account_id(CATEGORIES[0][0]), 1),
+        ("TransClass", "get_vendor_id", lambda: trans_funcs.get_vendor_id(sample["vendor_name"]), 1),
+
+        ("Vendor", "create_vendor", rolled_back(db, lambda: vendors.create_vendor(user_id, "Bench vendor")), 1),
+        ("Vendor", "get_vendors_by_user_id", lambda: vendors.get_vendors_by_user_id(user_id), 1),
+        ("Vendor", "update_vendor", rolled_back(db, lambda: vendors.update_vendor(vendor_id, "Renamed vendor")), 1),
+        ("Vendor", "delete_vendor", rolled_back(db, lambda: vendors.delete_vendor(vendor_id)), 1),
+        ("Vendor", "get_vendor_name", lambda: vendors.get_vendor_name(vendor_id), 1),
+        ("Vendor", "get_vendor_details", lambda: vendors.get_vendor_details(vendor_id), 1),
+        ("Vendor", "get_all_vendors", lambda: vendors.get_all_vendors(user_id), 1),
+    ]
+
+    # Page data loaders: what each page reads from the database when it is opened or refreshed.
+    state = page_state(db, user_data, trans_funcs, report_store=report_store)
+    history = page_state(db, user_data, trans_funcs, reports=[], report_store=report_store)
+    reports = page_state(db, user_data, trans_funcs, reports=[], report_store=report_store)
+    transactions = page_state(db, user_data, trans_funcs, PAGE_SIZE=Transactions.PAGE_SIZE, page_cursors=[None],
+                              sort_by="transaction_date", sort_descending=True, filters={})
+    History.fetch_reports(history)
+    Reports.fetch_reports(reports)
+    state.get_accounts = lambda: Accounts.get_accounts(state)  # store_report calls its own page's get_accounts
+    transactions.transaction_page_arguments = lambda: Transactions.transaction_page_arguments(transactions)
+    latest = max(history.reports, key=lambda r: r["report_date"], default=None)
+    latest_key = None
+    if latest:
+        latest_date = datetime.strptime(latest["report_date"], "%Y-%m-%d %H:%M:%S")
+        latest_key = ((latest_date.month, latest_date.year), latest["report_id"])
+
+    def accounts_refresh_table():
+        Accounts.get_accounts(state)
+        trans_funcs.get_account_month_totals(user_id, year, month)
+        trans_funcs.get_scheduled_totals(user_id, year, month, today.strftime("%Y-%m-%d"))
+
+    def open_report_uncached(report_id):
+        report_store.invalidate()
+        report_store.get_report(report_id)
+
+    def history_open_page():
+        History.fetch_reports(history)
+        History.get_combined_report_options(history)
+
+    cases += [
+        ("Dashboard", "get_total_budget", lambda: Dashboard.get_total_budget(state), 1),
+        ("Dashboard", "get_accounts", lambda: Dashboard.get_accounts(state), 1),
+        ("Dashboard", "get_transactions", lambda: Dashboard.get_transactions(state), 1),
+        ("Accounts", "refresh_table data", accounts_refresh_table, 1),
+        ("Accounts", "store_report", rolled_back(db, lambda: Accounts.store_report(state)), 1),
+        ("MakeEdits", "get_budget", lambda: MakeEdits.get_budget(state), 1),
+        ("MakeEdits", "get_accounts", lambda: MakeEdits.get_accounts(state), 1),
+        ("EditBudget", "get_budget", lambda: EditBudget.get_budget(state), 1),
+        ("Transactions", "prepare_transaction_details", lambda: Transactions.prepare_transaction_details(transactions), 1),
+        ("History", "fetch_reports + dropdown options", history_open_page, 1),
+        ("Reports", "fetch_reports", lambda: Reports.fetch_reports(reports), 1),
+    ]
+    if latest_key:
+        cases += [
+            ("ReportStore", "get_catalogue", lambda: report_store.get_catalogue(user_id), 1),
+            ("ReportStore", "get_report (not cached)", lambda: open_report_uncached(latest_key[1]), 1),
+            ("ReportStore", "get_report (cached)", lambda: report_store.get_report(latest_key[1]), 1),
+            ("History", "fetch_json_data (latest report)", lambda: History.fetch_json_data(history, None, *latest_key), 1),
+            ("Reports", "fetch_json_data (latest report)", lambda: Reports.fetch_json_data(reports, None, *latest_key), 1),
+        ]
+    return cases
+
+
+def sample_ids(db, user_id):
+    """Pick an account, a popular vendor and a recent transaction of the user to run single-row methods on."""
+    with db.reader() as cursor:
+        transaction_id, account_id, vendor_id = cursor.execute(
+            """SELECT transaction_id, budget_accounts_id, vendor_id FROM transactions
+               WHERE user_id = ? ORDER BY transaction_date DESC LIMIT 1""", (user_id,)).fetchone()
+        vendor_name = cursor.execute("SELECT vendor_name FROM vendors WHERE vendor_id = ?", (vendor_id,)).fetchone()[0]
+        password_hash = cursor.execute("SELECT password_hash FROM users WHERE user_id = ?", (user_id,)).fetchone()[0]
+    return {"transaction_id": transaction_id, "account_id": account_id, "vendor_id": vendor_id,
+            "vendor_name": vendor_name, "password_hash": password_hash}
+
+
+def compare(results, baseline_path, threshold, min_delta_ms):
+    """
+    Print operations whose median got slower than threshold times the baseline median and by more
+    than min_delta_ms, so jitter on microsecond-scale lookups is not reported. Returns the count.
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["group"], r["name"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    for result in results:
+        before = baseline.get((result["group"], result["name"]))
+        if (before and before["median_ms"] > 0 and result["median_ms"] / before["median_ms"] > threshold
+                and result["median_ms"] - before["median_ms"] > min_delta_ms):
+            regressions += 1
+            print(f"REGRESSION {result['group']}.{result['name']}: {before['median_ms']:.3f} ms -> {result['median_ms']:.3f} ms")
+    print(f"{regressions} regression(s) against {baseline_path} (threshold {threshold:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every backend method and page data loader on a generated dataset.")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--transactions", type=int, default=50_000, help="transactions per user")
+    parser.add_argument("--reports", type=int, default=12, help="monthly reports per user")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PERFORMANCE_PROFILES))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database(profile=args.profile)
+    try:
+        dataset = generate_dataset(conn, users=args.users, transactions=args.transactions, reports=args.reports)
+        conn.close()
+        print(f"Generated {dataset['transactions']} transactions for {dataset['users']} users in {dataset['seconds']:.1f}s")
+
+        db = BenchmarkDatabase(db_path, profile=args.profile)
+        user_data = UserData(db)
+        with contextlib.redirect_stdout(io.StringIO()):
+            user_data.username = "user1"
+            user_data.get_user_id(user_data.username)
+            user_data.get_budget_details()
+        trans_funcs = TransClass(user_data)
+        cases = build_cases(db, user_data, trans_funcs, Vendor(db), ReportStore(db), sample_ids(db, user_data.user_id))
+
+        results = []
+        print(f"{'operation':<62} {'best ms':>9} {'median ms':>10}")
+        for group, name, func, factor in cases:
+            repeat = max(1, round(args.repeat * factor))
+            best, median = measure(func, repeat)
+            results.append({"group": group, "name": name, "repeat": repeat, "best_ms": best * 1000, "median_ms": median * 1000})
+            print(f"{group + '.' + name:<62} {best * 1000:>9.3f} {median * 1000:>10.3f}")
+        db.close_db()
+
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "profile": args.profile,
+            "dataset": {key: dataset[key] for key in ("users", "budget_accounts", "vendors", "transactions", "reports")},
+            "not_timed": NOT_TIMED,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+        if args.baseline:
+            return 1 if compare(results, args.baseline, args.threshold, args.min_delta_ms) else 0
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
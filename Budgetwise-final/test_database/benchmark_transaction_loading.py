@@ -0,0 +1,54 @@
+import sys
+import argparse
+import shutil
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, seed_transactions, time_call
+
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.trans_class import TransClass
+
+
+def load_per_row(trans_funcs, user_id):
+    """The original Transactions page path: one list query, then two lookups per transaction."""
+    details = []
+    for TID in trans_funcs.getTransactionList(user_id):
+        row = trans_funcs.getTransactionDetails(TID)[0]
+        account_name = trans_funcs.getBudgetAccountName(row[0])
+        details.append([TID[0], account_name, row[0], row[2], row[3], row[5], row[4], row[1]])
+    return details
+
+
+def load_joined(trans_funcs, user_id):
+    """The batched path: a single joined statement."""
+    return trans_funcs.get_transaction_rows(user_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-row and joined loading of the Transactions page.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'per-row (s)':>12} {'joined (s)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        db_path, conn = create_benchmark_database()
+        try:
+            seed_transactions(conn, size)
+            user_data = UserData(BenchmarkDatabase(db_path))
+            user_data.user_id = 1
+            trans_funcs = TransClass(user_data)
+
+            assert len(load_per_row(trans_funcs, 1)) == len(load_joined(trans_funcs, 1)) == size
+
+            old = time_call(lambda: load_per_row(trans_funcs, 1), args.repeat)
+            new = time_call(lambda: load_joined(trans_funcs, 1), args.repeat)
+            print(f"{size:>8} {old:>12.4f} {new:>12.4f} {old / new:>7.1f}x")
+            user_data.db.close_db()
+        finally:
+            conn.close()
+            shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
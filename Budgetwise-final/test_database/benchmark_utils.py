@@ -0,0 +1,202 @@
+import os
+import sys
+import asyncio
+import json
+import random
+import time
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+import sqlcipher3
+
+# Allow the benchmark scripts to import the application packages when run from this folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.backend.database_creation.installation import Installation  # noqa: E402
+from src.backend.database_interation.database import Database  # noqa: E402
+from src.backend.database_interation.money import Money  # noqa: E402
+from src.backend.database_creation.cipher_keys import DEFAULT_KEY_CACHE  # noqa: E402
+from src.backend.database_creation.performance_profiles import (  # noqa: E402
+    DEFAULT_PROFILE,
+    apply_cipher_settings,
+    apply_profile,
+    get_profile,
+)
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+class BenchmarkDatabase(Database):
+    """
+    Database pool pointed at a throwaway benchmark database instead of the application folder.
+
+    Only the path and password lookup differ from Database, so UserData, TransClass and Vendor
+    run against the same writer/reader connections the application uses, without touching
+    the keyring. The "keyring" key cache policy keeps raw keys in cached_keys instead, for the
+    rest of the process.
+    """
+    cached_keys = {}  # db_path -> raw key, standing in for the keyring entry
+
+    def __init__(self, db_path, password=BENCHMARK_PASSWORD, profile=DEFAULT_PROFILE, key_cache=DEFAULT_KEY_CACHE):
+        self._benchmark_credentials = (Path(db_path), password)
+        self._benchmark_settings = {"performance_profile": profile, "cipher": dict(get_profile(profile)["cipher"]),
+                                    "key_cache": key_cache}
+        super().__init__(installer=None)
+
+    def _resolve_credentials(self):
+        return self._benchmark_credentials
+
+    def _resolve_settings(self):
+        return self._benchmark_settings
+
+    def _load_cached_key(self):
+        return self.cached_keys.get(self.db_path)
+
+    def _store_cached_key(self, raw_key):
+        self.cached_keys[self.db_path] = raw_key
+
+    def _forget_cached_key(self):
+        self.cached_keys.pop(self.db_path, None)
+
+
+def open_encrypted(db_path, password=BENCHMARK_PASSWORD, profile=DEFAULT_PROFILE):
+    """Open (or create) an encrypted database the same way the application does."""
+    conn = sqlcipher3.connect(str(db_path), check_same_thread=False)
+    conn.execute(f"PRAGMA key='{password}'")
+    apply_cipher_settings(conn, get_profile(profile)["cipher"])
+    conn.execute("PRAGMA foreign_keys = 1")
+    apply_profile(conn, profile)
+    return conn
+
+
+def create_benchmark_database(directory=None, password=BENCHMARK_PASSWORD, profile=DEFAULT_PROFILE):
+    """
+    Create a fresh encrypted database with the application schema in a temporary folder,
+    encrypted and tuned with the given performance profile.
+
+    Returns:
+        tuple: (db_path, connection)
+    """
+    directory = directory or tempfile.mkdtemp(prefix="budgetwise_bench_")
+    db_path = os.path.join(directory, "BudgetWise.db")
+    conn = open_encrypted(db_path, password, profile)
+    Installation().create_tables(conn)
+    return db_path, conn
+
+
+def seed_transactions(conn, transaction_count, user_id=1, account_count=6, vendor_count=20, seed=42):
+    """
+    Insert one user with a budget, a set of accounts and vendors, and transaction_count transactions
+    spread over roughly the last two years.
+
+    Returns:
+        tuple: (list of account ids, list of vendor ids)
+    """
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+    cursor.execute(
+        """INSERT INTO users (user_id, username, password_hash, security_question1, security_question2,
+           security_question3, security_question1_answer, security_question2_answer, security_question3_answer)
+           VALUES (?, ?, 'x', 'q1', 'q2', 'q3', 'a1', 'a2', 'a3')""",
+        (user_id, f"bench{user_id}"),
+    )
+    cursor.execute(
+        """INSERT INTO budgets (user_id, budget_name, total_budgeted_amount, leftover_amount, start_date, end_date)
+           VALUES (?, 'Bench', 10000000, 0, DATE('now'), DATE('now', '+1 month'))""",  # amounts in cents
+        (user_id,),
+    )
+    budget_id = cursor.lastrowid
+
+    account_ids = []
+    for i in range(account_count):
+        cursor.execute(
+            """INSERT INTO budget_accounts (user_id, budget_id, account_name, total_allocated_amount, current_amount)
+               VALUES (?, ?, ?, ?, ?)""",
+            (user_id, budget_id, f"Account {i + 1}", 100000, 100000),
+        )
+        account_ids.append(cursor.lastrowid)
+
+    vendor_ids = []
+    for i in range(vendor_count):
+        cursor.execute("INSERT INTO vendors (user_id, vendor_name) VALUES (?, ?)", (user_id, f"Vendor {i + 1}"))
+        vendor_ids.append(cursor.lastrowid)
+
+    conn.commit()
+    add_transactions(conn, transaction_count, account_ids, vendor_ids, user_id=user_id, rng=rng)
+    return account_ids, vendor_ids
+
+
+def add_transactions(conn, transaction_count, account_ids, vendor_ids, user_id=1, start_date=None, days=760, rng=None):
+    """
+    Insert transaction_count random transactions dated uniformly in [start_date, start_date + days).
+    start_date defaults to two years ago.
+    """
+    rng = rng or random.Random(7)
+    start = start_date or date.today() - timedelta(days=730)
+    rows = (
+        (
+            user_id,
+            rng.choice(account_ids),
+            rng.choice(vendor_ids),
+            Money.from_dollars(round(rng.uniform(1, 250), 2)),
+            (start + timedelta(days=rng.randrange(days))).strftime("%Y-%m-%d"),
+            f"Purchase {n}",
+            int(rng.random() < 0.1),
+            2,
+        )
+        for n in range(transaction_count)
+    )
+    conn.cursor().executemany(
+        """INSERT INTO transactions (user_id, budget_accounts_id, vendor_id, amount, transaction_date, description, recurring, status)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        rows,
+    )
+    conn.commit()
+
+
+class RecordingConnection:
+    """
+    Stands in for the Flet client, so pages can be built and updated without a window: hands out
+    control IDs and counts the bytes every update would send. Use it as ft.Page(RecordingConnection(), ...).
+    """
+
+    def __init__(self):
+        from flet.core.pubsub.pubsub_hub import PubSubHub
+
+        self.next_id = 1
+        self.bytes_sent = 0
+        self.pubsubhub = PubSubHub()
+
+    def send_commands(self, session_id, commands):
+        from flet.core.protocol import CommandEncoder
+
+        self.bytes_sent += len(json.dumps(commands, cls=CommandEncoder))
+        results = []
+        for command in commands:
+            if command.name == "add":
+                ids = [f"_{self.next_id + i}" for i in range(len(command.commands))]
+                self.next_id += len(ids)
+                results.append(" ".join(ids))
+        return SimpleNamespace(results=results)
+
+
+def time_call(func, repeat=3):
+    """Run func repeat times and return the fastest wall-clock duration in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+async def heartbeat(stop, gaps, interval=0.005):
+    """Ticks every interval seconds and records how late each tick was; a late tick is a frozen window."""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        gaps.append(now - last - interval)
+        last = now
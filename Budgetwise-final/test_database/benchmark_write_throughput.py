@@ -0,0 +1,81 @@
+import sys
+import argparse
+import shutil
+from pathlib import Path
+
+from benchmark_utils import BenchmarkDatabase, create_benchmark_database, seed_transactions, time_call
+
+from src.backend.database_creation.performance_profiles import PERFORMANCE_PROFILES, DEFAULT_PROFILE
+from src.backend.database_interation.user_data import UserData
+from src.backend.database_interation.trans_class import TransClass
+
+
+def insert_commit_each(trans_funcs, account_id, vendor_id, count):
+    """Each create_transaction call commits on its own."""
+    for n in range(count):
+        trans_funcs.create_transaction(account_id, vendor_id, 9.99, f"Write {n}", False, "2024-03-10")
+
+
+def insert_one_transaction(db, trans_funcs, account_id, vendor_id, count):
+    """The same calls grouped under Database.transaction(), so they commit once."""
+    with db.transaction():
+        insert_commit_each(trans_funcs, account_id, vendor_id, count)
+
+
+def update_commit_each(db, account_ids):
+    """The old Dashboard.save_budget loop: one UPDATE and one commit per account."""
+    for n, account_id in enumerate(account_ids):
+        with db.transaction() as cursor:
+            cursor.execute(
+                "UPDATE budget_accounts SET total_allocated_amount = ? WHERE budget_accounts_id = ?", (10000 + n, account_id)
+            )
+
+
+def update_one_transaction(db, account_ids):
+    """The current Dashboard.save_budget: one executemany under a single commit."""
+    with db.transaction() as cursor:
+        cursor.executemany(
+            "UPDATE budget_accounts SET total_allocated_amount = ? WHERE budget_accounts_id = ?",
+            [(10000 + n, account_id) for n, account_id in enumerate(account_ids)],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare committing every statement with one commit per unit of work.")
+    parser.add_argument("--inserts", type=int, default=1_000)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PERFORMANCE_PROFILES))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db_path, conn = create_benchmark_database(profile=args.profile)
+    try:
+        account_ids, vendor_ids = seed_transactions(conn, 0, account_count=args.accounts)
+        conn.close()
+        db = BenchmarkDatabase(db_path, profile=args.profile)
+        user_data = UserData(db)
+        user_data.user_id = 1
+        trans_funcs = TransClass(user_data)
+
+        rows = [
+            ("transactions", args.inserts,
+             lambda: insert_commit_each(trans_funcs, account_ids[0], vendor_ids[0], args.inserts),
+             lambda: insert_one_transaction(db, trans_funcs, account_ids[0], vendor_ids[0], args.inserts)),
+            ("save_budget", args.accounts,
+             lambda: update_commit_each(db, account_ids),
+             lambda: update_one_transaction(db, account_ids)),
+        ]
+
+        print(f"profile: {args.profile}")
+        print(f"{'operation':>14} {'statements':>10} {'commit each/s':>14} {'one commit/s':>13} {'speedup':>8}")
+        for name, count, old_path, new_path in rows:
+            old = time_call(old_path, args.repeat)
+            new = time_call(new_path, args.repeat)
+            print(f"{name:>14} {count:>10} {count / old:>14.0f} {count / new:>13.0f} {old / new:>7.1f}x")
+        db.close_db()
+    finally:
+        shutil.rmtree(Path(db_path).parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
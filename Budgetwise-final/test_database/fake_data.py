@@ -5,6 +5,13 @@ import sys
 import platform
 import sqlcipher3
 
+# Allow the script to import the application packages when run from this folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.backend.database_creation.cipher_keys import RAW_KEY_USERNAME, apply_key  # noqa: E402
+from src.backend.database_creation.installation import Installation  # noqa: E402
+from src.backend.database_creation.performance_profiles import apply_cipher_settings  # noqa: E402
+
 
 app_name = "BudgetWise"
 db_filename = "BudgetWise.db"
@@ -27,6 +34,28 @@ def get_app_folder():
     os.makedirs(app_folder, exist_ok=True) 
     return app_folder
 
+def open_database(db_path, password):
+    """
+    Open and unlock the database the way Database._connect does: with the raw key cached in the keyring
+    when it still opens the file, otherwise with the password, followed by the cipher settings the
+    database was created with (settings.json).
+    """
+    cipher_settings = Installation(db_filename, app_name).load_settings()["cipher"]
+    raw_key = keyring.get_password(app_name, RAW_KEY_USERNAME)
+    conn = sqlcipher3.connect(db_path)
+    apply_key(conn, password, raw_key)
+    apply_cipher_settings(conn, cipher_settings)  # Must follow the key, before any other statement
+    if raw_key is not None:
+        try:
+            conn.execute("SELECT count(*) FROM sqlite_master").fetchone()  # Fails if the key is wrong
+        except sqlcipher3.DatabaseError:
+            conn.close()
+            print("Cached database key rejected, unlocking with the password.")
+            conn = sqlcipher3.connect(db_path)
+            apply_key(conn, password)
+            apply_cipher_settings(conn, cipher_settings)
+    return conn
+
 def fake_data():
     """Allows developers to interact with the encrypted database until they choose to exit."""
     app_folder = get_app_folder()
@@ -40,10 +69,7 @@ def fake_data():
         return
 
     try:
-        conn = sqlcipher3.connect(db_path)
-        # Be cautious: if the password contains special characters like a single quote,
-        # you might need additional handling or escaping.
-        conn.execute(f"PRAGMA key='{password}'")
+        conn = open_database(db_path, password)
         conn.execute("PRAGMA foreign_keys = 1")
         cursor = conn.cursor()
 
@@ -134,13 +160,13 @@ def fake_data():
             (29, 5, 'Chase Bank'),
             (30, 5, 'Fidelity Investments');
 
-            -- Budget data
+            -- Budget data (amounts in cents)
             INSERT OR IGNORE INTO budgets (user_id, budget_name, total_budgeted_amount, leftover_amount, start_date, end_date) VALUES
-            (1, 'Budget-Test', 900.0, 900.0, '2025-04-14', '2025-04-30'),
-            (2, 'Budget-Test', 900.0, 900.0, '2025-04-14', '2025-04-30'),
-            (3, 'Budget-Test', 900.0, 900.0, '2025-04-14', '2025-04-30'),
-            (4, 'Budget-Test', 900.0, 900.0, '2025-04-14', '2025-04-30'),
-            (5, 'Budget-Test', 900.0, 900.0, '2025-04-14', '2025-04-30');
+            (1, 'Budget-Test', 90000, 90000, '2025-04-14', '2025-04-30'),
+            (2, 'Budget-Test', 90000, 90000, '2025-04-14', '2025-04-30'),
+            (3, 'Budget-Test', 90000, 90000, '2025-04-14', '2025-04-30'),
+            (4, 'Budget-Test', 90000, 90000, '2025-04-14', '2025-04-30'),
+            (5, 'Budget-Test', 90000, 90000, '2025-04-14', '2025-04-30');
 
 
             -- Budget Accounts data
@@ -150,40 +176,40 @@ def fake_data():
             created_at, updated_at, notes
             )
             VALUES
-            (1, 1, 1, 'Rent', 100.0, 100.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
-            (2, 1, 1, 'Food', 100.0, 100.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
-            (3, 1, 1, 'Entertainment', 20.0, 20.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
-            (4, 1, 1, 'Pets', 200.0, 200.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
-            (5, 1, 1, 'Savings', 380.0, 380.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
-            (6, 1, 1, 'Stocks', 100.0, 100.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.'),
-
-            (7, 2, 1, 'Rent', 120.0, 120.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
-            (8, 2, 1, 'Food', 150.0, 150.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
-            (9, 2, 1, 'Entertainment', 30.0, 30.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
-            (10, 2, 1, 'Pets', 180.0, 180.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
-            (11, 2, 1, 'Savings', 400.0, 400.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
-            (12, 2, 1, 'Stocks', 90.0, 90.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.'),
-
-            (13, 3, 1, 'Rent', 130.0, 130.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
-            (14, 3, 1, 'Food', 110.0, 110.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
-            (15, 3, 1, 'Entertainment', 25.0, 25.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
-            (16, 3, 1, 'Pets', 160.0, 160.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
-            (17, 3, 1, 'Savings', 350.0, 350.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
-            (18, 3, 1, 'Stocks', 110.0, 110.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.'),
-
-            (19, 4, 1, 'Rent', 140.0, 140.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
-            (20, 4, 1, 'Food', 130.0, 130.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
-            (21, 4, 1, 'Entertainment', 22.0, 22.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
-            (22, 4, 1, 'Pets', 210.0, 210.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
-            (23, 4, 1, 'Savings', 370.0, 370.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
-            (24, 4, 1, 'Stocks', 95.0, 95.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.'),
-
-            (25, 5, 1, 'Rent', 110.0, 110.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
-            (26, 5, 1, 'Food', 140.0, 140.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
-            (27, 5, 1, 'Entertainment', 28.0, 28.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
-            (28, 5, 1, 'Pets', 190.0, 190.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
-            (29, 5, 1, 'Savings', 360.0, 360.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
-            (30, 5, 1, 'Stocks', 105.0, 105.0, 0.0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.');
+            (1, 1, 1, 'Rent', 10000, 10000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
+            (2, 1, 1, 'Food', 10000, 10000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
+            (3, 1, 1, 'Entertainment', 2000, 2000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
+            (4, 1, 1, 'Pets', 20000, 20000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
+            (5, 1, 1, 'Savings', 38000, 38000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
+            (6, 1, 1, 'Stocks', 10000, 10000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.'),
+
+            (7, 2, 1, 'Rent', 12000, 12000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
+            (8, 2, 1, 'Food', 15000, 15000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
+            (9, 2, 1, 'Entertainment', 3000, 3000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
+            (10, 2, 1, 'Pets', 18000, 18000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
+            (11, 2, 1, 'Savings', 40000, 40000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
+            (12, 2, 1, 'Stocks', 9000, 9000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.'),
+
+            (13, 3, 1, 'Rent', 13000, 13000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
+            (14, 3, 1, 'Food', 11000, 11000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
+            (15, 3, 1, 'Entertainment', 2500, 2500, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
+            (16, 3, 1, 'Pets', 16000, 16000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
+            (17, 3, 1, 'Savings', 35000, 35000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
+            (18, 3, 1, 'Stocks', 11000, 11000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.'),
+
+            (19, 4, 1, 'Rent', 14000, 14000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
+            (20, 4, 1, 'Food', 13000, 13000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
+            (21, 4, 1, 'Entertainment', 2200, 2200, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
+            (22, 4, 1, 'Pets', 21000, 21000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
+            (23, 4, 1, 'Savings', 37000, 37000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
+            (24, 4, 1, 'Stocks', 9500, 9500, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.'),
+
+            (25, 5, 1, 'Rent', 11000, 11000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Rent'),
+            (26, 5, 1, 'Food', 14000, 14000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Food'),
+            (27, 5, 1, 'Entertainment', 2800, 2800, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Entertainment'),
+            (28, 5, 1, 'Pets', 19000, 19000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Pets'),
+            (29, 5, 1, 'Savings', 36000, 36000, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Savings'),
+            (30, 5, 1, 'Stocks', 10500, 10500, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Stocks.');
 
 
             -- transaction data
@@ -192,40 +218,40 @@ def fake_data():
                 amount, transaction_date, description, recurring, status
             )
             VALUES
-            (1, 1, 1, 1, 50.67, '2025-04-14 13:22:32', 'Rent', 0,0),
-            (2, 1, 2, 1, 79.0, '2025-04-14 13:22:32', 'Food', 0,0),
-            (3, 1, 3, 1, 10.0, '2025-04-14 13:22:32', 'Netflix', 0,0),
-            (4, 1, 4, 1, 140.0, '2025-04-14 13:22:32', 'Pets', 0,0),
-            (5, 1, 5, 1, 320.0, '2025-04-14 13:22:32', 'Savings', 1,0),
-            (6, 1, 6, 1, 80.0, '2025-04-14 13:22:32', 'Investment', 1,0),
-
-            (7, 2, 7, 1, 50.67, '2025-04-14 13:22:32', 'Rent', 0,0),
-            (8, 2, 8, 1, 79.0, '2025-04-14 13:22:32', 'Food', 0,0),
-            (9, 2, 9, 1, 10.0, '2025-04-14 13:22:32', 'Netflix', 0,0),
-            (10, 2, 10, 1, 140.0, '2025-04-14 13:22:32', 'Pets', 0,0),
-            (11, 2, 11, 1, 320.0, '2025-04-14 13:22:32', 'Savings', 1,0),
-            (12, 2, 12, 1, 80.0, '2025-04-14 13:22:32', 'Investment', 1,0),
-
-            (13, 3, 13, 1, 50.67, '2025-04-14 13:22:32', 'Rent', 0,0),
-            (14, 3, 14, 1, 79.0, '2025-04-14 13:22:32', 'Food', 0,0),
-            (15, 3, 15, 1, 10.0, '2025-04-14 13:22:32', 'Netflix', 0,0),
-            (16, 3, 16, 1, 140.0, '2025-04-14 13:22:32', 'Pets', 0,0),
-            (17, 3, 17, 1, 320.0, '2025-04-14 13:22:32', 'Savings', 1,0),
-            (18, 3, 18, 1, 80.0, '2025-04-14 13:22:32', 'Investment', 1,0),
-
-            (19, 4, 19, 1, 50.67, '2025-04-14 13:22:32', 'Rent', 0,0),
-            (20, 4, 20, 1, 79.0, '2025-04-14 13:22:32', 'Food', 0,0),
-            (21, 4, 21, 1, 10.0, '2025-04-14 13:22:32', 'Netflix', 0,0),
-            (22, 4, 22, 1, 140.0, '2025-04-14 13:22:32', 'Pets', 0,0),
-            (23, 4, 23, 1, 320.0, '2025-04-14 13:22:32', 'Savings', 1,0),
-            (24, 4, 24, 1, 80.0, '2025-04-14 13:22:32', 'Investment', 1,0),
-
-            (25, 5, 25, 1, 50.67, '2025-04-14 13:22:32', 'Rent', 0,0),
-            (26, 5, 26, 1, 79.0, '2025-04-14 13:22:32', 'Food', 0,0),
-            (27, 5, 27, 1, 10.0, '2025-04-14 13:22:32', 'Netflix', 0,0),
-            (28, 5, 28, 1, 140.0, '2025-04-14 13:22:32', 'Pets', 0,0),
-            (29, 5, 29, 1, 320.0, '2025-04-14 13:22:32', 'Savings', 1,0),
-            (30, 5, 30, 1, 80.0, '2025-04-14 13:22:32', 'Investment', 1,0);
+            (1, 1, 1, 1, 5067, '2025-04-14', 'Rent', 0,0),
+            (2, 1, 2, 1, 7900, '2025-04-14', 'Food', 0,0),
+            (3, 1, 3, 1, 1000, '2025-04-14', 'Netflix', 0,0),
+            (4, 1, 4, 1, 14000, '2025-04-14', 'Pets', 0,0),
+            (5, 1, 5, 1, 32000, '2025-04-14', 'Savings', 1,0),
+            (6, 1, 6, 1, 8000, '2025-04-14', 'Investment', 1,0),
+
+            (7, 2, 7, 1, 5067, '2025-04-14', 'Rent', 0,0),
+            (8, 2, 8, 1, 7900, '2025-04-14', 'Food', 0,0),
+            (9, 2, 9, 1, 1000, '2025-04-14', 'Netflix', 0,0),
+            (10, 2, 10, 1, 14000, '2025-04-14', 'Pets', 0,0),
+            (11, 2, 11, 1, 32000, '2025-04-14', 'Savings', 1,0),
+            (12, 2, 12, 1, 8000, '2025-04-14', 'Investment', 1,0),
+
+            (13, 3, 13, 1, 5067, '2025-04-14', 'Rent', 0,0),
+            (14, 3, 14, 1, 7900, '2025-04-14', 'Food', 0,0),
+            (15, 3, 15, 1, 1000, '2025-04-14', 'Netflix', 0,0),
+            (16, 3, 16, 1, 14000, '2025-04-14', 'Pets', 0,0),
+            (17, 3, 17, 1, 32000, '2025-04-14', 'Savings', 1,0),
+            (18, 3, 18, 1, 8000, '2025-04-14', 'Investment', 1,0),
+
+            (19, 4, 19, 1, 5067, '2025-04-14', 'Rent', 0,0),
+            (20, 4, 20, 1, 7900, '2025-04-14', 'Food', 0,0),
+            (21, 4, 21, 1, 1000, '2025-04-14', 'Netflix', 0,0),
+            (22, 4, 22, 1, 14000, '2025-04-14', 'Pets', 0,0),
+            (23, 4, 23, 1, 32000, '2025-04-14', 'Savings', 1,0),
+            (24, 4, 24, 1, 8000, '2025-04-14', 'Investment', 1,0),
+
+            (25, 5, 25, 1, 5067, '2025-04-14', 'Rent', 0,0),
+            (26, 5, 26, 1, 7900, '2025-04-14', 'Food', 0,0),
+            (27, 5, 27, 1, 1000, '2025-04-14', 'Netflix', 0,0),
+            (28, 5, 28, 1, 14000, '2025-04-14', 'Pets', 0,0),
+            (29, 5, 29, 1, 32000, '2025-04-14', 'Savings', 1,0),
+            (30, 5, 30, 1, 8000, '2025-04-14', 'Investment', 1,0);
 
         """
         try:
@@ -0,0 +1,262 @@
+import os
+import sys
+import math
+import time
+import random
+import argparse
+import tempfile
+import calendar
+from datetime import date, timedelta
+
+from benchmark_utils import create_benchmark_database, BENCHMARK_PASSWORD
+
+from argon2 import PasswordHasher
+from src.backend.database_interation.money import Money, from_cents
+from src.backend.database_interation.report_codec import encode_report
+from src.backend.database_interation.report_summary import write_summary
+from src.backend.database_creation.performance_profiles import PERFORMANCE_PROFILES, DEFAULT_PROFILE
+
+# Spending categories used as budget accounts: (account name, share of purchases, median amount, spread).
+# Amounts are log-normal around the median, so most purchases are small with a long tail of large ones.
+CATEGORIES = [
+    ("Groceries", 0.30, 48.0, 0.55),
+    ("Dining", 0.22, 22.0, 0.60),
+    ("Transport", 0.14, 35.0, 0.45),
+    ("Shopping", 0.12, 40.0, 0.90),
+    ("Entertainment", 0.08, 18.0, 0.70),
+    ("Health", 0.05, 55.0, 0.80),
+    ("Travel", 0.03, 180.0, 0.90),
+    ("Gifts", 0.03, 45.0, 0.75),
+    ("Education", 0.02, 60.0, 0.70),
+    ("Pets", 0.01, 30.0, 0.60),
+]
+
+# Bills paid once a month: (account name, vendor, day of month, amount, monthly jitter)
+RECURRING_BILLS = [
+    ("Housing", "Landlord", 1, 1450.00, 0.0),
+    ("Utilities", "City Power", 12, 95.00, 0.25),
+    ("Utilities", "Water Works", 18, 42.00, 0.15),
+    ("Subscriptions", "Streamflix", 5, 15.99, 0.0),
+    ("Subscriptions", "Mobile Carrier", 22, 55.00, 0.0),
+]
+
+# Relative chance of a purchase on each weekday, Monday first. Weekends see more spending.
+WEEKDAY_WEIGHTS = [0.85, 0.85, 0.9, 0.95, 1.2, 1.45, 1.1]
+
+VENDORS_PER_CATEGORY = 40
+
+
+def zipf_weights(count, exponent=1.1):
+    """Popularity weights for count vendors: a few favourites take most of the purchases."""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def purchase_dates(rng, days, end):
+    """Yield purchase dates in the days before end, weighted towards weekends."""
+    peak = max(WEEKDAY_WEIGHTS)
+    while True:
+        day = end - timedelta(days=rng.randrange(days))
+        if rng.random() * peak < WEEKDAY_WEIGHTS[day.weekday()]:
+            yield day
+
+
+def month_starts(first, last):
+    """Every first-of-month date from first's month to last's month."""
+    month = first.replace(day=1)
+    while month <= last:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def add_user(cursor, user_id, username, password_hash, answer_hash, account_names, budget_total):
+    """Insert a user, their budget and budget accounts. Returns {account name: budget_accounts_id}."""
+    cursor.execute(
+        """INSERT INTO users (user_id, username, password_hash, security_question1, security_question2,
+           security_question3, security_question1_answer, security_question2_answer, security_question3_answer)
+           VALUES (?, ?, ?, 'What city were you born in?', 'What was your first pet''s name?',
+           'What was the make of your first car?', ?, ?, ?)""",
+        (user_id, username, password_hash, answer_hash, answer_hash, answer_hash),
+    )
+    cursor.execute(
+        """INSERT INTO budgets (user_id, budget_name, total_budgeted_amount, leftover_amount, start_date, end_date)
+           VALUES (?, ?, ?, 0.0, DATE('now', 'start of month'), DATE('now', 'start of month', '+1 month'))""",
+        (user_id, f"{username} budget", Money.from_dollars(budget_total)),
+    )
+    budget_id = cursor.lastrowid
+    share = Money.from_dollars(round(budget_total / len(account_names), 2))
+    accounts = {}
+    for name in account_names:
+        cursor.execute(
+            """INSERT INTO budget_accounts (user_id, budget_id, account_name, total_allocated_amount, current_amount)
+               VALUES (?, ?, ?, ?, ?)""",
+            (user_id, budget_id, name, share, share),
+        )
+        accounts[name] = cursor.lastrowid
+    return accounts
+
+
+def add_vendors(cursor, user_id, names):
+    """Insert vendors for a user. Returns {vendor name: vendor_id}."""
+    vendors = {}
+    for name in names:
+        cursor.execute("INSERT INTO vendors (user_id, vendor_name) VALUES (?, ?)", (user_id, name))
+        vendors[name] = cursor.lastrowid
+    return vendors
+
+
+def transaction_rows(rng, user_id, accounts, vendors, count, days, today):
+    """
+    Yield count transaction rows for one user: monthly bills for every month in the period, then
+    everyday purchases. About 2% of purchases are scheduled in the coming month (status 2).
+    """
+    start = today - timedelta(days=days)
+    bill_count = 0
+    for month in month_starts(start, today + timedelta(days=30)):
+        for account, vendor, day, amount, jitter in RECURRING_BILLS:
+            if account not in accounts or bill_count >= count:
+                continue
+            due = month.replace(day=min(day, calendar.monthrange(month.year, month.month)[1]))
+            if due < start or due > today + timedelta(days=30):
+                continue
+            bill_count += 1
+            yield (user_id, accounts[account], vendors[vendor], Money.from_dollars(round(amount * (1 + rng.uniform(-jitter, jitter)), 2)),
+                   due.strftime("%Y-%m-%d"), vendor, 1, 1 if due <= today else 2)
+
+    categories = [c for c in CATEGORIES if c[0] in accounts]
+    category_weights = [c[1] for c in categories]
+    category_vendors = {name: [v for v in vendors if v.startswith(f"{name} ")] for name, *_ in categories}
+    popularity = zipf_weights(VENDORS_PER_CATEGORY)
+    dates = purchase_dates(rng, days, today)
+    for n in range(count - bill_count):
+        name, _, median, spread = rng.choices(categories, category_weights)[0]
+        vendor = rng.choices(category_vendors[name], popularity[:len(category_vendors[name])])[0]
+        amount = round(min(rng.lognormvariate(math.log(median), spread), median * 25), 2)
+        if rng.random() < 0.02:
+            day, status = today + timedelta(days=rng.randint(1, 30)), 2
+        else:
+            day, status = next(dates), 1
+        yield (user_id, accounts[name], vendors[vendor], Money.from_dollars(max(amount, 0.5)), day.strftime("%Y-%m-%d"),
+               f"{name} purchase #{n + 1}", 0, status)
+
+
+def add_reports(cursor, user_id, months, today):
+    """
+    Store one monthly report per month for the last months months, with the accounts layout and
+    snapshot encoding that Accounts.store_report uses (one entry per account with that month's transactions).
+    """
+    cursor.execute("SELECT budget_accounts_id, account_name, total_allocated_amount FROM budget_accounts WHERE user_id = ?", (user_id,))
+    accounts = cursor.fetchall()
+    first = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+    for _ in range(months - 1):
+        first = (first - timedelta(days=1)).replace(day=1)
+
+    stored = 0
+    for month in month_starts(first, today.replace(day=1) - timedelta(days=1)):
+        last_day = month.replace(day=calendar.monthrange(month.year, month.month)[1])
+        cursor.execute(
+            """SELECT budget_accounts_id, transaction_id, description, amount, transaction_date FROM transactions
+               WHERE user_id = ? AND transaction_date >= ? AND transaction_date <= ?
+               ORDER BY budget_accounts_id, transaction_date, transaction_id""",
+            (user_id, month.strftime("%Y-%m-%d"), last_day.strftime("%Y-%m-%d")),
+        )
+        by_account = {}
+        for account_id, transaction_id, description, amount, transaction_date in cursor.fetchall():
+            by_account.setdefault(account_id, []).append(
+                {"transaction_id": transaction_id, "description": description, "amount": from_cents(amount), "date": transaction_date})
+        report = [
+            {"account_name": name, "balance": from_cents(balance), "transactions": by_account.get(account_id, [])}
+            for account_id, name, balance in accounts
+        ]
+        report_date = f"{last_day.strftime('%Y-%m-%d')} 23:00:00"
+        cursor.execute(
+            "INSERT INTO reports (user_id, report_type, report_date, report_data) VALUES (?, 1, ?, ?)",
+            (user_id, report_date, encode_report(report)),
+        )
+        write_summary(cursor, cursor.lastrowid, 1, report_date, report)
+        stored += 1
+    return stored
+
+
+def generate_dataset(conn, users=1, accounts=len(CATEGORIES) + 3, transactions=10_000, reports=12,
+                     days=730, password="password", answer="answer", seed=2024):
+    """
+    Fill an empty database with users, budget accounts, vendors, transactions and monthly reports.
+
+    Arguments:
+        conn: An open, keyed connection with the application schema.
+        users (int): Number of users; they are named user1, user2, ...
+        accounts (int): Budget accounts per user, taken from the bill accounts and then CATEGORIES.
+        transactions (int): Transactions per user, bills included.
+        reports (int): Monthly reports stored per user.
+        days (int): How far back transaction dates go.
+        password (str): Login password for every user.
+        answer (str): Answer to every security question.
+        seed (int): Random seed; the same arguments always produce the same data.
+
+    Returns:
+        dict: Counts of inserted rows and the elapsed seconds.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    start = time.perf_counter()
+
+    # Hashing with Argon2 is deliberately slow, so every user shares one hash of each secret
+    hasher = PasswordHasher()
+    password_hash, answer_hash = hasher.hash(password), hasher.hash(answer)
+
+    bill_accounts = list(dict.fromkeys(bill[0] for bill in RECURRING_BILLS))
+    account_names = (bill_accounts + [c[0] for c in CATEGORIES])[:accounts]
+    account_names += [f"Account {n}" for n in range(len(account_names) + 1, accounts + 1)]
+    vendor_names = [bill[1] for bill in RECURRING_BILLS]
+    vendor_names += [f"{name} Vendor {n}" for name, *_ in CATEGORIES for n in range(1, VENDORS_PER_CATEGORY + 1)]
+
+    counts = {"users": 0, "budget_accounts": 0, "vendors": 0, "transactions": 0, "reports": 0}
+    cursor = conn.cursor()
+    for user_id in range(1, users + 1):
+        cursor.execute("BEGIN")
+        user_accounts = add_user(cursor, user_id, f"user{user_id}", password_hash, answer_hash,
+                                 account_names, budget_total=4000.0 + rng.randrange(0, 8000, 250))
+        user_vendors = add_vendors(cursor, user_id, vendor_names)
+        cursor.executemany(
+            """INSERT INTO transactions (user_id, budget_accounts_id, vendor_id, amount, transaction_date, description, recurring, status)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            transaction_rows(rng, user_id, user_accounts, user_vendors, transactions, days, today),
+        )
+        counts["transactions"] += cursor.execute("SELECT count(*) FROM transactions WHERE user_id = ?", (user_id,)).fetchone()[0]
+        counts["reports"] += add_reports(cursor, user_id, reports, today) if reports else 0
+        conn.commit()
+        counts["users"] += 1
+        counts["budget_accounts"] += len(user_accounts)
+        counts["vendors"] += len(user_vendors)
+
+    counts["seconds"] = time.perf_counter() - start
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large, realistic BudgetWise database for benchmarking.")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--accounts", type=int, default=len(CATEGORIES) + 3, help="budget accounts per user")
+    parser.add_argument("--transactions", type=int, default=100_000, help="transactions per user")
+    parser.add_argument("--reports", type=int, default=12, help="monthly reports per user")
+    parser.add_argument("--days", type=int, default=730, help="history length in days")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PERFORMANCE_PROFILES))
+    parser.add_argument("--output", help="folder for the new BudgetWise.db (default: a new temporary folder)")
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    directory = args.output or tempfile.mkdtemp(prefix="budgetwise_data_")
+    os.makedirs(directory, exist_ok=True)
+    db_path, conn = create_benchmark_database(directory, profile=args.profile)
+    counts = generate_dataset(conn, args.users, args.accounts, args.transactions, args.reports, args.days, seed=args.seed)
+    conn.close()
+
+    print(f"Created {db_path} (profile '{args.profile}', key '{BENCHMARK_PASSWORD}')")
+    print(f"  {counts['users']} users, {counts['budget_accounts']} accounts, {counts['vendors']} vendors, "
+          f"{counts['transactions']} transactions, {counts['reports']} reports")
+    print(f"  {counts['seconds']:.1f}s, {counts['transactions'] / counts['seconds']:.0f} transactions/s")
+    print("  Log in as user1 with password 'password'; every security answer is 'answer'.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,13 @@ import sys
 import platform
 import sqlcipher3
 
+# Allow the script to import the application packages when run from this folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.backend.database_creation.cipher_keys import RAW_KEY_USERNAME, apply_key  # noqa: E402
+from src.backend.database_creation.installation import Installation  # noqa: E402
+from src.backend.database_creation.performance_profiles import apply_cipher_settings  # noqa: E402
+
 
 app_name = "BudgetWise"
 db_filename = "BudgetWise.db"
@@ -27,6 +34,28 @@ def get_app_folder():
     os.makedirs(app_folder, exist_ok=True) 
     return app_folder
 
+def open_database(db_path, password):
+    """
+    Open and unlock the database the way Database._connect does: with the raw key cached in the keyring
+    when it still opens the file, otherwise with the password, followed by the cipher settings the
+    database was created with (settings.json).
+    """
+    cipher_settings = Installation(db_filename, app_name).load_settings()["cipher"]
+    raw_key = keyring.get_password(app_name, RAW_KEY_USERNAME)
+    conn = sqlcipher3.connect(db_path)
+    apply_key(conn, password, raw_key)
+    apply_cipher_settings(conn, cipher_settings)  # Must follow the key, before any other statement
+    if raw_key is not None:
+        try:
+            conn.execute("SELECT count(*) FROM sqlite_master").fetchone()  # Fails if the key is wrong
+        except sqlcipher3.DatabaseError:
+            conn.close()
+            print("Cached database key rejected, unlocking with the password.")
+            conn = sqlcipher3.connect(db_path)
+            apply_key(conn, password)
+            apply_cipher_settings(conn, cipher_settings)
+    return conn
+
 def edit_db():
     """Allows developers to interact with the encrypted database until they choose to exit."""
     app_folder = get_app_folder()
@@ -40,10 +69,7 @@ def edit_db():
         return
 
     try:
-        conn = sqlcipher3.connect(db_path)
-        # Be cautious: if the password contains special characters like a single quote,
-        # you might need additional handling or escaping.
-        conn.execute(f"PRAGMA key='{password}'")
+        conn = open_database(db_path, password)
         conn.execute("PRAGMA foreign_keys = 1")
         cursor = conn.cursor()
 